@@ -0,0 +1,76 @@
+"""product catalog query indexes
+
+Revision ID: 254d00404c8a
+Revises: 6e97a20c3a67
+Create Date: 2026-10-18 13:20:47.915362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '254d00404c8a'
+down_revision: Union[str, Sequence[str], None] = '6e97a20c3a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Índices parciales para los filtros y ordenamientos de GET /products:
+# (nombre, columnas, condición)
+CATALOG_INDEXES = (
+    # Tienda: categoría + rango/orden de precio, solo productos con stock
+    ('ix_products_in_stock_category_price', ['category', 'price', 'id'], 'is_active AND stock_quantity > 0'),
+    # Navegación por categoría en orden de ID (paginación por cursor)
+    ('ix_products_active_category_id', ['category', 'id'], 'is_active'),
+    # Orden por precio en todo el catálogo
+    ('ix_products_active_price_id', ['price', 'id'], 'is_active'),
+    # Orden "newest"
+    ('ix_products_active_created_at_id', [sa.text('created_at DESC'), sa.text('id DESC')], 'is_active'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY no puede correr dentro de una transacción;
+    # así no se bloquean las escrituras en products mientras se construyen.
+    with op.get_context().autocommit_block():
+        for name, columns, condition in CATALOG_INDEXES:
+            op.create_index(
+                name,
+                'products',
+                columns,
+                unique=False,
+                postgresql_where=sa.text(condition),
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+        # Duplica el índice de la llave primaria
+        op.drop_index(
+            'ix_products_id',
+            table_name='products',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_products_id',
+            'products',
+            ['id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        for name, _, _ in reversed(CATALOG_INDEXES):
+            op.drop_index(
+                name,
+                table_name='products',
+                postgresql_concurrently=True,
+                if_exists=True
+            )
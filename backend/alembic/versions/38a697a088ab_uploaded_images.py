@@ -0,0 +1,65 @@
+"""uploaded images
+
+Revision ID: 38a697a088ab
+Revises: 254d00404c8a
+Create Date: 2026-10-18 13:52:10.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38a697a088ab'
+down_revision: Union[str, Sequence[str], None] = '254d00404c8a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('image_variants', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    op.create_table('uploaded_images',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('uploaded_by', sa.Integer(), nullable=True),
+    sa.Column('original_filename', sa.String(length=255), nullable=False),
+    sa.Column('storage_path', sa.String(length=500), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('variants', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('storage_path')
+    )
+    op.create_index(op.f('ix_uploaded_images_product_id'), 'uploaded_images', ['product_id'], unique=False)
+    op.create_index(op.f('ix_uploaded_images_uploaded_by'), 'uploaded_images', ['uploaded_by'], unique=False)
+    op.create_index(
+        'ix_uploaded_images_queue',
+        'uploaded_images',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_uploaded_images_queue', table_name='uploaded_images')
+    op.drop_index(op.f('ix_uploaded_images_uploaded_by'), table_name='uploaded_images')
+    op.drop_index(op.f('ix_uploaded_images_product_id'), table_name='uploaded_images')
+    op.drop_table('uploaded_images')
+    op.drop_column('products', 'image_variants')
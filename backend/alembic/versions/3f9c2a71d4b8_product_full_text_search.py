@@ -0,0 +1,58 @@
+"""product full text search
+
+Revision ID: 3f9c2a71d4b8
+Revises: ae5b400a29c7
+Create Date: 2026-10-18 09:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a71d4b8'
+down_revision: Union[str, Sequence[str], None] = 'ae5b400a29c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # unaccent() no es IMMUTABLE, así que no puede usarse directamente en una
+    # columna generada ni en un índice: se envuelve fijando el diccionario.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+
+    op.add_column('products', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('spanish', immutable_unaccent(coalesce(name, ''))), 'A') || "
+            "setweight(to_tsvector('spanish', immutable_unaccent(coalesce(description, ''))), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_products_search_vector',
+        'products',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_search_vector', table_name='products', postgresql_using='gin')
+    op.drop_column('products', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
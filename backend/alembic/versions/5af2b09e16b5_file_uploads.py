@@ -0,0 +1,57 @@
+"""file uploads
+
+Revision ID: 5af2b09e16b5
+Revises: 38a697a088ab
+Create Date: 2026-10-18 14:21:37.280419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5af2b09e16b5'
+down_revision: Union[str, Sequence[str], None] = '38a697a088ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_uploads',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('order_id', sa.UUID(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('expected_sha256', sa.String(length=64), nullable=True),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('storage_path', sa.String(length=500), nullable=True),
+    sa.Column('status', sa.String(length=20), server_default='uploading', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_file_uploads_order_id'), 'file_uploads', ['order_id'], unique=False)
+    op.create_index(op.f('ix_file_uploads_user_id'), 'file_uploads', ['user_id'], unique=False)
+    op.create_index(
+        'ix_file_uploads_expires_at_uploading',
+        'file_uploads',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'uploading'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_file_uploads_expires_at_uploading', table_name='file_uploads')
+    op.drop_index(op.f('ix_file_uploads_user_id'), table_name='file_uploads')
+    op.drop_index(op.f('ix_file_uploads_order_id'), table_name='file_uploads')
+    op.drop_table('file_uploads')
@@ -0,0 +1,53 @@
+"""stock reservations
+
+Revision ID: 6e97a20c3a67
+Revises: be1606fe08f8
+Create Date: 2026-10-18 12:48:33.207415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e97a20c3a67'
+down_revision: Union[str, Sequence[str], None] = 'be1606fe08f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('reserved_quantity', sa.Integer(), server_default='0', nullable=False))
+    op.create_check_constraint(
+        'ck_products_reserved_quantity_non_negative',
+        'products',
+        'reserved_quantity >= 0'
+    )
+
+    op.create_table('stock_reservations',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('quantity > 0', name='ck_stock_reservations_quantity_positive'),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_id', 'product_id', name='uq_stock_reservations_order_product')
+    )
+    op.create_index('ix_stock_reservations_expires_at', 'stock_reservations', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_stock_reservations_product_id'), 'stock_reservations', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stock_reservations_product_id'), table_name='stock_reservations')
+    op.drop_index('ix_stock_reservations_expires_at', table_name='stock_reservations')
+    op.drop_table('stock_reservations')
+    op.drop_constraint('ck_products_reserved_quantity_non_negative', 'products', type_='check')
+    op.drop_column('products', 'reserved_quantity')
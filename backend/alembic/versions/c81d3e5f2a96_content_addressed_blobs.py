@@ -0,0 +1,90 @@
+"""content addressed blobs
+
+Revision ID: c81d3e5f2a96
+Revises: 5af2b09e16b5
+Create Date: 2026-10-18 16:02:48.913274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d3e5f2a96'
+down_revision: Union[str, Sequence[str], None] = '5af2b09e16b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('released_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('ref_count >= 0', name='ck_blobs_ref_count_non_negative'),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_index(
+        'ix_blobs_released_at_unreferenced',
+        'blobs',
+        ['released_at'],
+        unique=False,
+        postgresql_where=sa.text('ref_count = 0')
+    )
+
+    # Las subidas completas existentes referencian su contenido; sus archivos
+    # siguen en files/ hasta que se eliminen (ver UploadService.delete_orphans)
+    op.execute("""
+        INSERT INTO blobs (sha256, size, ref_count)
+        SELECT sha256, max(size), count(*)
+        FROM file_uploads
+        WHERE sha256 IS NOT NULL
+        GROUP BY sha256
+    """)
+    op.create_index(op.f('ix_file_uploads_sha256'), 'file_uploads', ['sha256'], unique=False)
+    op.create_foreign_key(
+        'file_uploads_sha256_fkey', 'file_uploads', 'blobs', ['sha256'], ['sha256']
+    )
+    op.create_index(
+        'ix_file_uploads_completed_at_orphan',
+        'file_uploads',
+        ['completed_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'completed' AND order_id IS NULL")
+    )
+
+    # Varias imágenes pueden compartir el mismo original
+    op.drop_constraint('uploaded_images_storage_path_key', 'uploaded_images', type_='unique')
+    op.add_column('uploaded_images', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_uploaded_images_sha256'), 'uploaded_images', ['sha256'], unique=False)
+    op.create_foreign_key(
+        'uploaded_images_sha256_fkey', 'uploaded_images', 'blobs', ['sha256'], ['sha256']
+    )
+    op.create_index(
+        'ix_uploaded_images_created_at_orphan',
+        'uploaded_images',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('product_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_uploaded_images_created_at_orphan', table_name='uploaded_images')
+    op.drop_constraint('uploaded_images_sha256_fkey', 'uploaded_images', type_='foreignkey')
+    op.drop_index(op.f('ix_uploaded_images_sha256'), table_name='uploaded_images')
+    op.drop_column('uploaded_images', 'sha256')
+    op.create_unique_constraint('uploaded_images_storage_path_key', 'uploaded_images', ['storage_path'])
+
+    op.drop_index('ix_file_uploads_completed_at_orphan', table_name='file_uploads')
+    op.drop_constraint('file_uploads_sha256_fkey', 'file_uploads', type_='foreignkey')
+    op.drop_index(op.f('ix_file_uploads_sha256'), table_name='file_uploads')
+
+    op.drop_index('ix_blobs_released_at_unreferenced', table_name='blobs')
+    op.drop_table('blobs')
@@ -0,0 +1,35 @@
+"""restrict reservation order delete
+
+Revision ID: d4a7e19b3c52
+Revises: c81d3e5f2a96
+Create Date: 2026-10-18 18:20:11.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e19b3c52'
+down_revision: Union[str, Sequence[str], None] = 'c81d3e5f2a96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('stock_reservations_order_id_fkey', 'stock_reservations', type_='foreignkey')
+    op.create_foreign_key(
+        'stock_reservations_order_id_fkey', 'stock_reservations', 'orders',
+        ['order_id'], ['id'], ondelete='RESTRICT'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('stock_reservations_order_id_fkey', 'stock_reservations', type_='foreignkey')
+    op.create_foreign_key(
+        'stock_reservations_order_id_fkey', 'stock_reservations', 'orders',
+        ['order_id'], ['id'], ondelete='CASCADE'
+    )
@@ -0,0 +1,46 @@
+"""product trigram indexes
+
+Revision ID: f78f15da0c7f
+Revises: 3f9c2a71d4b8
+Create Date: 2026-10-18 12:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f78f15da0c7f'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a71d4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # El nombre se indexa sin acentos, igual que se normaliza la búsqueda
+    op.create_index(
+        'ix_products_name_trgm',
+        'products',
+        [sa.text('immutable_unaccent(name) gin_trgm_ops')],
+        unique=False,
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_products_sku_trgm',
+        'products',
+        ['sku'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'sku': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_sku_trgm', table_name='products', postgresql_using='gin')
+    op.drop_index('ix_products_name_trgm', table_name='products', postgresql_using='gin')
@@ -0,0 +1,139 @@
+"""
+Almacenamiento de archivos direccionado por contenido
+Cada archivo se guarda una sola vez bajo ``UPLOAD_DIR/blobs``, con su SHA-256
+como nombre y repartido en subdirectorios por los primeros caracteres del hash
+(``blobs/ab/cd/abcd...``) para no acumular miles de archivos por directorio.
+
+Este módulo solo maneja el disco; los conteos de referencias viven en la
+tabla ``blobs`` (ver ``BlobService``). Para que el recolector de basura no
+borre un archivo que se acaba de volver a subir, el orden es siempre:
+
+1. Escribir el contenido a un archivo temporal calculando su hash.
+2. Registrar la referencia en la base de datos (la fila del blob queda
+   bloqueada hasta el commit).
+3. Publicar el archivo con ``place_blob`` (si ya existe, se descarta el
+   temporal), antes o después del commit. Publicarlo antes evita que una
+   fila confirmada apunte a un archivo que no llegó a moverse.
+"""
+import contextlib
+import hashlib
+import os
+import shutil
+import uuid
+from typing import BinaryIO, Optional
+
+from app.core.config import settings
+
+BLOBS_DIR = "blobs"
+# Archivos derivados de un blob (variantes de imagen), publicados en MEDIA_URL
+DERIVED_DIR = os.path.join("media", "images")
+
+# Tamaño de los bloques leídos del archivo de origen
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobTooLargeError(ValueError):
+    """El contenido supera el tamaño máximo permitido"""
+
+
+def relative_blob_path(sha256: str) -> str:
+    """Ruta de un blob relativa a ``UPLOAD_DIR``."""
+    return os.path.join(BLOBS_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def blob_path(sha256: str) -> str:
+    """Ruta absoluta de un blob."""
+    return os.path.join(settings.UPLOAD_DIR, relative_blob_path(sha256))
+
+
+def exists(sha256: str) -> bool:
+    """Indica si el archivo de un blob está en disco."""
+    return os.path.exists(blob_path(sha256))
+
+
+def derived_dir(sha256: str) -> str:
+    """Directorio de los archivos derivados de un blob (ej. variantes de imagen)."""
+    return os.path.join(settings.UPLOAD_DIR, DERIVED_DIR, sha256[:2], sha256)
+
+
+def temp_path() -> str:
+    """Ruta de un archivo temporal nuevo en el mismo sistema de archivos que los blobs."""
+    directory = os.path.join(settings.UPLOAD_DIR, BLOBS_DIR, "tmp")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{uuid.uuid4().hex}.part")
+
+
+def place_blob(source_path: str, sha256: str) -> bool:
+    """
+    Publica un archivo temporal ya verificado como el blob ``sha256``.
+
+    Args:
+        source_path: Archivo temporal con el contenido (se mueve o se elimina).
+        sha256: Hash del contenido.
+
+    Returns:
+        True si se guardó, False si el blob ya existía (duplicado).
+    """
+    destination = blob_path(sha256)
+    if exists(sha256):
+        discard(source_path)
+        return False
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(source_path, destination)
+    return True
+
+
+def remove_blob(sha256: str) -> None:
+    """Elimina el archivo de un blob y sus derivados si existen."""
+    discard(blob_path(sha256))
+    shutil.rmtree(derived_dir(sha256), ignore_errors=True)
+
+
+def discard(path: Optional[str]) -> None:
+    """Elimina un archivo ignorando si ya no existe."""
+    if path is not None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+class BlobWriter:
+    """Copia un flujo de bytes a un archivo temporal calculando su SHA-256 y tamaño"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.path = temp_path()
+        self.size = 0
+        self._hasher = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        """Hash hexadecimal del contenido escrito."""
+        return self._hasher.hexdigest()
+
+    def copy_from(self, source: BinaryIO) -> None:
+        """
+        Copia ``source`` por bloques, cortando apenas supera el tamaño máximo.
+
+        Raises:
+            BlobTooLargeError si el contenido supera ``max_size`` (el
+            temporal se elimina).
+        """
+        try:
+            with open(self.path, "wb") as target:
+                while chunk := source.read(_CHUNK_SIZE):
+                    self.size += len(chunk)
+                    if self.size > self.max_size:
+                        raise BlobTooLargeError(f"El contenido supera {self.max_size} bytes")
+                    self._hasher.update(chunk)
+                    target.write(chunk)
+        except BaseException:
+            self.discard()
+            raise
+
+    def place(self) -> bool:
+        """Publica el contenido como blob (ver ``place_blob``)."""
+        return place_blob(self.path, self.sha256)
+
+    def discard(self) -> None:
+        """Elimina el archivo temporal."""
+        discard(self.path)
@@ -0,0 +1,151 @@
+"""
+Caché en memoria con política LRU y expiración por tiempo (TTL)
+
+Cada proceso (worker de uvicorn) mantiene sus propias cachés. Todas se
+registran por nombre para poder consultar sus métricas e invalidarlas.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# Centinela para distinguir "no está en caché" de un valor None almacenado
+MISSING = object()
+
+
+class TTLCache:
+    """Caché acotada (LRU) con expiración por entrada, segura entre hilos"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Se incrementa en cada invalidación; permite descartar valores que se
+        # calcularon antes de una escritura concurrente (ver ``set``).
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Obtiene un valor vigente; registra acierto o fallo."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Guarda un valor, desalojando el menos usado si se excede el tamaño
+
+        Si se indica ``generation`` (leída antes de calcular el valor) y hubo
+        una invalidación desde entonces, el valor se descarta por estar obsoleto.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Obtiene un valor o lo calcula con ``factory`` y lo guarda."""
+        generation = self.generation
+        value = self.get(key)
+        if value is MISSING:
+            value = factory()
+            self.set(key, value, generation=generation)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        """Invalida una entrada si existe."""
+        with self._lock:
+            self.generation += 1
+            if self._data.pop(key, MISSING) is not MISSING:
+                self.invalidations += 1
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Invalida todas las entradas cuya clave cumpla el predicado."""
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Invalida todas las entradas."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna las métricas de uso de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Registro global de cachés del proceso
+_caches: Dict[str, TTLCache] = {}
+
+
+def create_cache(name: str, maxsize: int, ttl: float) -> TTLCache:
+    """
+    Crea y registra una caché con nombre único
+
+    Args:
+        name: Nombre de la caché (usado en métricas e invalidación)
+        maxsize: Número máximo de entradas
+        ttl: Tiempo de vida de cada entrada en segundos
+
+    Returns:
+        La caché registrada
+
+    Raises:
+        ValueError si ya existe una caché con ese nombre
+    """
+    if name in _caches:
+        raise ValueError(f"Ya existe una caché registrada con el nombre: {name}")
+    cache = TTLCache(name, maxsize=maxsize, ttl=ttl)
+    _caches[name] = cache
+    return cache
+
+
+def get_cache(name: str) -> Optional[TTLCache]:
+    """Obtiene una caché registrada por su nombre."""
+    return _caches.get(name)
+
+
+def get_cache_stats() -> List[Dict[str, Any]]:
+    """Retorna las métricas de todas las cachés registradas."""
+    return [cache.stats() for cache in _caches.values()]
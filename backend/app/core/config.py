@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 
 class Settings:
     """
@@ -47,6 +47,13 @@ class Settings:
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     SMTP_FROM: str = os.getenv("SMTP_FROM", "noreply@fotovariedades.com")
 
+    # ============================================
+    # HASHING DE CONTRASEÑAS (bcrypt fuera del event loop)
+    # ============================================
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # Operaciones en curso o en cola por worker; por encima se responde 429
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
     # ============================================
     # STORAGE (Uploads)
     # ============================================
@@ -55,6 +62,127 @@ class Settings:
     ALLOWED_EXTENSIONS: List[str] = os.getenv(
         "ALLOWED_EXTENSIONS", "jpg,jpeg,png,gif,webp"
     ).split(",")
+    # URL pública de los archivos generados (variantes de imágenes)
+    MEDIA_URL: str = os.getenv("MEDIA_URL", "/media")
+
+    # ============================================
+    # SUBIDAS POR PARTES (archivos de impresión del checkout)
+    # ============================================
+    UPLOAD_FILE_EXTENSIONS: List[str] = os.getenv(
+        "UPLOAD_FILE_EXTENSIONS", "pdf,jpg,jpeg,png,gif,webp"
+    ).split(",")
+    # Tamaño máximo de cada parte (PATCH); acota la memoria usada por subida
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", "2097152"))  # 2MB
+    # Las subidas sin completar se eliminan después de este tiempo
+    UPLOAD_SESSION_TTL: int = int(os.getenv("UPLOAD_SESSION_TTL", "86400"))  # segundos
+    UPLOAD_SWEEP_INTERVAL: int = int(os.getenv("UPLOAD_SWEEP_INTERVAL", "3600"))  # segundos
+
+    # ============================================
+    # ALMACENAMIENTO POR CONTENIDO (blobs deduplicados por SHA-256)
+    # ============================================
+    # Subidas completas sin pedido e imágenes sin producto se eliminan después de este tiempo
+    BLOB_ORPHAN_TTL: int = int(os.getenv("BLOB_ORPHAN_TTL", "604800"))  # segundos (7 días)
+    # Un blob sin referencias se conserva este tiempo antes de borrar su archivo
+    BLOB_GC_GRACE_PERIOD: int = int(os.getenv("BLOB_GC_GRACE_PERIOD", "3600"))  # segundos
+
+    # ============================================
+    # DESCARGAS FIRMADAS (archivos de impresión)
+    # ============================================
+    DOWNLOAD_TOKEN_TTL: int = int(os.getenv("DOWNLOAD_TOKEN_TTL", "900"))  # segundos
+    # Ubicación interna del proxy (nginx) que sirve UPLOAD_DIR; si se define, las
+    # descargas se delegan con X-Accel-Redirect en lugar de leerse desde Python
+    DOWNLOAD_ACCEL_REDIRECT: str = os.getenv("DOWNLOAD_ACCEL_REDIRECT", "")
+
+    # ============================================
+    # PROCESAMIENTO DE IMÁGENES (Pillow)
+    # ============================================
+    # Variantes WebP generadas por imagen: nombre:ancho máximo en px
+    IMAGE_VARIANT_WIDTHS: Dict[str, int] = {
+        name: int(width) for name, width in (
+            variant.split(":") for variant in os.getenv(
+                "IMAGE_VARIANT_WIDTHS", "thumb:160,card:480,large:1200"
+            ).split(",")
+        )
+    }
+    IMAGE_WEBP_QUALITY: int = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+    IMAGE_PROCESSOR_ENABLED: bool = os.getenv("IMAGE_PROCESSOR_ENABLED", "True").lower() == "true"
+    # Procesos del pool que redimensionan imágenes (trabajo de CPU)
+    IMAGE_PROCESS_WORKERS: int = int(os.getenv("IMAGE_PROCESS_WORKERS", "2"))
+    IMAGE_PROCESS_BATCH: int = int(os.getenv("IMAGE_PROCESS_BATCH", "16"))
+    IMAGE_PROCESS_INTERVAL: int = int(os.getenv("IMAGE_PROCESS_INTERVAL", "30"))  # segundos
+    IMAGE_PROCESS_MAX_ATTEMPTS: int = int(os.getenv("IMAGE_PROCESS_MAX_ATTEMPTS", "3"))
+    # Imágenes "processing" más antiguas que esto (worker caído) se vuelven a procesar
+    IMAGE_PROCESS_STALE_AFTER: int = int(os.getenv("IMAGE_PROCESS_STALE_AFTER", "600"))  # segundos
+
+    # ============================================
+    # CACHÉ DEL CATÁLOGO (en memoria, por worker)
+    # ============================================
+    PRODUCT_CACHE_TTL: int = int(os.getenv("PRODUCT_CACHE_TTL", "300"))  # segundos
+    PRODUCT_CACHE_SIZE: int = int(os.getenv("PRODUCT_CACHE_SIZE", "2048"))
+    PRODUCT_LIST_CACHE_TTL: int = int(os.getenv("PRODUCT_LIST_CACHE_TTL", "60"))  # segundos
+    PRODUCT_LIST_CACHE_SIZE: int = int(os.getenv("PRODUCT_LIST_CACHE_SIZE", "512"))
+    PRODUCT_BATCH_MAX_IDS: int = int(os.getenv("PRODUCT_BATCH_MAX_IDS", "100"))
+    PRODUCT_COUNT_CACHE_TTL: int = int(os.getenv("PRODUCT_COUNT_CACHE_TTL", "30"))  # segundos
+    PRODUCT_COUNT_CACHE_SIZE: int = int(os.getenv("PRODUCT_COUNT_CACHE_SIZE", "1024"))
+    # Por debajo de este número de filas estimadas se usa el conteo exacto
+    PRODUCT_COUNT_ESTIMATE_THRESHOLD: int = int(
+        os.getenv("PRODUCT_COUNT_ESTIMATE_THRESHOLD", "1000")
+    )
+
+    PRODUCT_FACET_CACHE_TTL: int = int(os.getenv("PRODUCT_FACET_CACHE_TTL", "60"))  # segundos
+    PRODUCT_FACET_CACHE_SIZE: int = int(os.getenv("PRODUCT_FACET_CACHE_SIZE", "512"))
+    # Límites de los rangos de precio de la faceta "price" (ascendentes)
+    PRODUCT_PRICE_FACET_BOUNDS: List[int] = [
+        int(bound) for bound in os.getenv(
+            "PRODUCT_PRICE_FACET_BOUNDS", "5000,10000,20000,50000,100000"
+        ).split(",")
+    ]
+    # Autocompletado (GET /products/suggest)
+    PRODUCT_SUGGEST_CACHE_TTL: int = int(os.getenv("PRODUCT_SUGGEST_CACHE_TTL", "60"))  # segundos
+    PRODUCT_SUGGEST_CACHE_SIZE: int = int(os.getenv("PRODUCT_SUGGEST_CACHE_SIZE", "2048"))
+
+    # Snapshots de las primeras páginas de cada categoría (GET /products?category=...)
+    CATALOG_SNAPSHOTS_ENABLED: bool = os.getenv("CATALOG_SNAPSHOTS_ENABLED", "True").lower() == "true"
+    CATALOG_SNAPSHOT_PAGES: int = int(os.getenv("CATALOG_SNAPSHOT_PAGES", "3"))
+    CATALOG_SNAPSHOT_PAGE_SIZES: List[int] = [
+        int(size) for size in os.getenv("CATALOG_SNAPSHOT_PAGE_SIZES", "10").split(",")
+    ]
+    CATALOG_SNAPSHOT_MAX_CATEGORIES: int = int(os.getenv("CATALOG_SNAPSHOT_MAX_CATEGORIES", "50"))
+    # Espera tras una escritura antes de reconstruir (agrupa ráfagas de escrituras)
+    CATALOG_SNAPSHOT_DEBOUNCE: float = float(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE", "1.0"))  # segundos
+    # Reconstrucción periódica aunque no lleguen invalidaciones
+    CATALOG_SNAPSHOT_REFRESH_INTERVAL: int = int(
+        os.getenv("CATALOG_SNAPSHOT_REFRESH_INTERVAL", "300")
+    )  # segundos
+
+    # Invalidación entre workers vía PostgreSQL LISTEN/NOTIFY
+    CACHE_INVALIDATION_ENABLED: bool = os.getenv("CACHE_INVALIDATION_ENABLED", "True").lower() == "true"
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+
+    # ============================================
+    # CACHÉ DE AUTENTICACIÓN (en memoria, por worker)
+    # ============================================
+    # Usuario autenticado (id, email, rol, activo) por ID; evita consultar la BD en cada petición
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "30"))  # segundos
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+    # Tokens de acceso ya verificados (digest -> claims); cada entrada vence con el "exp" del token
+    ACCESS_TOKEN_CACHE_SIZE: int = int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", "4096"))
+    # Librería para verificar tokens de acceso: "jose" (python-jose) o "pyjwt"
+    JWT_BACKEND: str = os.getenv("JWT_BACKEND", "jose").lower()
+
+    # ============================================
+    # SERIALIZACIÓN
+    # ============================================
+    # orjson + TypeAdapters precompilados sin revalidar filas ORM (ver app/core/serialization.py)
+    FAST_JSON_ENABLED: bool = os.getenv("FAST_JSON_ENABLED", "False").lower() == "true"
+
+    # ============================================
+    # RESERVAS DE STOCK (checkout)
+    # ============================================
+    STOCK_RESERVATION_TTL_MINUTES: int = int(os.getenv("STOCK_RESERVATION_TTL_MINUTES", "15"))
+    STOCK_RESERVATION_SWEEPER_ENABLED: bool = os.getenv("STOCK_RESERVATION_SWEEPER_ENABLED", "True").lower() == "true"
+    STOCK_RESERVATION_SWEEP_INTERVAL: int = int(os.getenv("STOCK_RESERVATION_SWEEP_INTERVAL", "30"))  # segundos
+    STOCK_RESERVATION_SWEEP_BATCH: int = int(os.getenv("STOCK_RESERVATION_SWEEP_BATCH", "500"))
 
     # ============================================
     # CORS & TIMEZONE
@@ -4,14 +4,15 @@ Maneja OAuth2 con Bearer tokens JWT
 """
 from typing import Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models.users import User, UserRole
+from app.models.users import UserRole
 from app.core.config import settings
-from app.services.auth_service import AuthService
+from app.core.security import decode_access_token
+from app.services.auth_service import AuthService, Principal
 
 # OAuth2 scheme - indica a FastAPI que use Bearer tokens
 # tokenUrl es la ruta donde los clientes obtendrán el token
@@ -21,10 +22,14 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/to
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Dependencia para obtener el usuario actual desde el token JWT
     
+    El usuario se toma de la caché de autenticación (id, email, rol y
+    estado), así que la mayoría de las peticiones no consultan la base de
+    datos. Los endpoints que necesitan el perfil completo lo cargan aparte.
+    
     Args:
         token: Token JWT del header Authorization
         db: Sesión de base de datos
@@ -41,24 +46,18 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        # Decodificar el token JWT
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        
-        # Extraer el user_id del payload (claim "sub")
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-            
-    except JWTError:
+    # Decodificar el token JWT (la firma se verifica una vez por token, ver decode_access_token)
+    payload = decode_access_token(token)
+    if payload is None:
+        raise credentials_exception
+    
+    # Extraer el user_id del payload (claim "sub")
+    user_id: str = payload.get("sub")
+    if user_id is None:
         raise credentials_exception
     
-    # Obtener el usuario de la base de datos
-    user = AuthService.get_user_by_id(db, user_id=int(user_id))
+    # Obtener el usuario de la caché; solo si no está se consulta la base de datos
+    user = await run_in_threadpool(AuthService.get_principal, db, int(user_id))
     if user is None:
         raise credentials_exception
     
@@ -66,8 +65,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Dependencia para verificar que el usuario actual esté activo
     
@@ -102,8 +101,8 @@ def require_role(required_role: UserRole):
         @app.get("/admin/dashboard", dependencies=[Depends(require_role(UserRole.ADMIN))])
     """
     async def role_checker(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        current_user: Principal = Depends(get_current_active_user)
+    ) -> Principal:
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -115,8 +114,8 @@ def require_role(required_role: UserRole):
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """
     Dependencia para verificar que el usuario sea administrador
     
@@ -138,8 +137,8 @@ async def get_current_admin_user(
 
 
 async def get_current_staff_or_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """
     Dependencia para verificar que el usuario sea staff o admin
     
@@ -163,7 +162,7 @@ async def get_current_staff_or_admin_user(
 def get_optional_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[Principal]:
     """
     Dependencia para obtener el usuario actual si existe, pero no requiere autenticación
     Útil para endpoints públicos que pueden mostrar información adicional si el usuario está logueado
@@ -178,18 +177,13 @@ def get_optional_current_user(
     if not token:
         return None
     
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-            
-        user = AuthService.get_user_by_id(db, user_id=int(user_id))
-        return user if user and user.is_active else None
-        
-    except JWTError:
+    payload = decode_access_token(token)
+    if payload is None:
         return None
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    
+    user = AuthService.get_principal(db, user_id=int(user_id))
+    return user if user and user.is_active else None
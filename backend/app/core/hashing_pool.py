@@ -0,0 +1,135 @@
+"""
+Pool acotado para hashing de contraseñas
+bcrypt tarda cientos de milisegundos por operación a propósito. Ejecutarlo
+dentro de un handler ``async`` bloquea el event loop y frena todas las
+peticiones del worker, así que se delega a un pool de hilos dedicado (bcrypt
+libera el GIL mientras calcula, por lo que los hilos trabajan en paralelo).
+
+El pool tiene un límite de operaciones pendientes: cuando se llena, las nuevas
+se rechazan con 429 en lugar de acumular una cola cuya espera superaría el
+timeout del cliente. Registra la profundidad de la cola y la latencia (espera
+en cola y tiempo de hash) para el endpoint de monitoreo.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+# Segundos sugeridos al cliente antes de reintentar cuando el pool está lleno
+_RETRY_AFTER = 1
+
+
+class HashingPool:
+    """Ejecuta funciones de hashing en un pool de hilos con cola acotada"""
+
+    def __init__(self, name: str, workers: int, max_pending: int, latency_window: int = 1024):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        # Últimas latencias en segundos: (espera en cola, tiempo de ejecución)
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=latency_window)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Ejecuta ``func(*args)`` en el pool sin bloquear el event loop.
+
+        Args:
+            func: Función síncrona a ejecutar (ej. ``bcrypt.checkpw``).
+            args: Argumentos de la función.
+
+        Returns:
+            El resultado de la función.
+
+        Raises:
+            HTTPException 429 si ya hay ``max_pending`` operaciones en curso o en cola.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Demasiadas solicitudes de autenticación, intente de nuevo en unos segundos",
+                    headers={"Retry-After": str(_RETRY_AFTER)}
+                )
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=f"{self.name}-hash"
+                )
+            executor = self._executor
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(executor, self._timed, func, args, time.perf_counter())
+        except RuntimeError:
+            # Pool detenido durante el apagado del worker
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    def _timed(self, func: Callable[..., T], args: Tuple[Any, ...], submitted_at: float) -> T:
+        """Ejecuta la función en un hilo del pool registrando su latencia."""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            # El contador baja al terminar el hash, aunque el cliente ya se haya desconectado
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+                self._latencies.append((started_at - submitted_at, finished_at - started_at))
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del pool: cola, contadores y latencias recientes en milisegundos."""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+        stats["queue_wait_ms"] = _summarize([wait for wait, _ in latencies])
+        stats["hash_ms"] = _summarize([duration for _, duration in latencies])
+        return stats
+
+    def shutdown(self) -> None:
+        """Detiene el pool; las operaciones en curso terminan en segundo plano."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Promedio, p50, p95 y máximo de una lista de duraciones en segundos (en ms)."""
+    if not samples:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "avg": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50": round(ordered[int(last * 0.50)] * 1000, 2),
+        "p95": round(ordered[int(last * 0.95)] * 1000, 2),
+        "max": round(ordered[last] * 1000, 2),
+    }
@@ -0,0 +1,118 @@
+"""
+Utilidades de caché HTTP
+Generación de ETags y evaluación de peticiones condicionales
+(If-None-Match / If-Modified-Since) para responder 304 Not Modified.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Genera un ETag fuerte a partir de las partes indicadas
+
+    Args:
+        parts: Valores que identifican la versión del recurso (bytes o convertibles a str)
+
+    Returns:
+        ETag entre comillas, listo para el header
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara un header If-None-Match con el ETag actual (comparación débil)
+
+    Args:
+        if_none_match: Valor del header (puede tener varios ETags separados por coma)
+        etag: ETag actual del recurso
+
+    Returns:
+        True si alguno coincide o el header es "*"
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def has_conditional_headers(request: Request) -> bool:
+    """Indica si la petición trae If-None-Match o If-Modified-Since."""
+    return (
+        "if-none-match" in request.headers
+        or "if-modified-since" in request.headers
+    )
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Evalúa si el cliente ya tiene la versión actual del recurso
+
+    If-None-Match tiene prioridad; If-Modified-Since solo se usa si no viene
+    If-None-Match (RFC 9110, sección 13.1.3).
+
+    Args:
+        request: Petición HTTP
+        etag: ETag actual del recurso
+        last_modified: Fecha de última modificación del recurso (opcional)
+
+    Returns:
+        True si se puede responder 304
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # Las fechas HTTP tienen resolución de segundos
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Construye los headers de validación de caché
+
+    Args:
+        etag: ETag del recurso
+        last_modified: Fecha de última modificación (opcional)
+
+    Returns:
+        Diccionario con ETag y, si aplica, Last-Modified
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Crea una respuesta 304 sin cuerpo con los headers de validación."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, last_modified)
+    )
@@ -0,0 +1,72 @@
+"""
+Procesamiento de imágenes (CPU)
+Genera las variantes redimensionadas de una imagen subida. Se ejecuta en los
+procesos de un ``ProcessPoolExecutor`` (ver ``ImageProcessor``), por lo que
+este módulo no depende de la base de datos ni de la configuración y sus
+funciones reciben y devuelven solo datos serializables.
+"""
+import os
+from typing import Any, Dict
+
+from PIL import Image, ImageOps
+
+# Orientaciones EXIF que intercambian ancho y alto
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def render_variants(
+    source_path: str,
+    output_dir: str,
+    widths: Dict[str, int],
+    quality: int
+) -> Dict[str, Any]:
+    """
+    Genera una variante WebP por cada ancho, sin metadatos EXIF.
+
+    La orientación EXIF se aplica a los píxeles antes de descartar los
+    metadatos. Las variantes se generan de mayor a menor, cada una a partir
+    de la anterior, y los JPEG grandes se decodifican a escala reducida
+    (``draft``), que es lo más costoso con fotos de 4000+ px. Las imágenes
+    más angostas que una variante no se amplían.
+
+    Args:
+        source_path: Ruta del original.
+        output_dir: Directorio donde se escriben las variantes (se crea si no existe).
+        widths: Ancho máximo por nombre de variante.
+        quality: Calidad WebP (0-100).
+
+    Returns:
+        Dimensiones del original y, por variante, el archivo y sus dimensiones.
+
+    Raises:
+        Las excepciones de Pillow si el archivo no es una imagen válida.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    with Image.open(source_path) as original:
+        width, height = original.size
+        if original.getexif().get(_EXIF_ORIENTATION_TAG) in _ROTATED_ORIENTATIONS:
+            width, height = height, width
+
+        largest = max(widths.values())
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        variants = {}
+        for name, max_width in sorted(widths.items(), key=lambda item: item[1], reverse=True):
+            if image.width > max_width:
+                image = image.resize(
+                    (max_width, max(1, round(image.height * max_width / image.width))),
+                    Image.Resampling.LANCZOS
+                )
+            filename = f"{name}.webp"
+            temp_path = os.path.join(output_dir, f".{filename}.tmp")
+            # Sin exif=/icc_profile= la variante no conserva metadatos del original
+            image.save(temp_path, "WEBP", quality=quality, method=4)
+            os.replace(temp_path, os.path.join(output_dir, filename))
+            variants[name] = {"file": filename, "width": image.width, "height": image.height}
+
+    return {"width": width, "height": height, "variants": variants}
@@ -0,0 +1,185 @@
+"""
+Bus de invalidación de cachés entre workers
+Usa PostgreSQL LISTEN/NOTIFY para que todos los procesos (workers de uvicorn y
+contenedores) descarten las entradas que otro proceso modificó.
+
+- Las escrituras publican con ``publish_invalidation`` dentro de su transacción:
+  PostgreSQL solo entrega el NOTIFY si la transacción hace commit.
+- Cada worker ejecuta un ``InvalidationListener`` en un hilo de fondo que
+  escucha el canal y llama a los handlers registrados por ámbito ("catalog",
+  "users", ...).
+"""
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Límite de PostgreSQL para el payload de NOTIFY (8000 bytes) con margen
+_MAX_PAYLOAD_BYTES = 7500
+
+_BOOT_TOKEN = uuid.uuid4().hex[:12]
+
+# Handler por ámbito: recibe las claves a invalidar o None para invalidar todo
+InvalidationHandler = Callable[[Optional[List]], None]
+_handlers: Dict[str, InvalidationHandler] = {}
+
+
+def get_origin_id() -> str:
+    """Identificador del proceso actual (incluye el PID para distinguir forks)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{_BOOT_TOKEN}"
+
+
+def register_invalidation_handler(scope: str, handler: InvalidationHandler) -> None:
+    """
+    Registra la función que invalida las cachés locales de un ámbito
+
+    Args:
+        scope: Nombre del ámbito (ej. "catalog", "users")
+        handler: Función que recibe la lista de claves o None (todo)
+    """
+    _handlers[scope] = handler
+
+
+def publish_invalidation(db: Session, scope: str, keys: Optional[Iterable] = None) -> None:
+    """
+    Publica una invalidación para los demás workers dentro de la transacción actual
+
+    Debe llamarse antes del ``commit``; si la transacción hace rollback el
+    mensaje no se entrega. El worker que escribe invalida su caché local por
+    su cuenta y descarta su propio mensaje al recibirlo.
+
+    Args:
+        db: Sesión de base de datos con la transacción de la escritura
+        scope: Ámbito de caché afectado
+        keys: Claves afectadas (None = invalidar todo el ámbito)
+    """
+    if not settings.CACHE_INVALIDATION_ENABLED:
+        return
+
+    message = {
+        "origin": get_origin_id(),
+        "scope": scope,
+        "keys": list(keys) if keys is not None else None,
+    }
+    payload = json.dumps(message, separators=(",", ":"))
+    if len(payload.encode("utf-8")) > _MAX_PAYLOAD_BYTES:
+        # Demasiadas claves para un solo mensaje: se invalida todo el ámbito
+        message["keys"] = None
+        payload = json.dumps(message, separators=(",", ":"))
+
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": payload}
+    )
+
+
+def dispatch_invalidation(scope: Optional[str], keys: Optional[List] = None) -> None:
+    """
+    Ejecuta los handlers locales de un ámbito (o de todos si scope es None)
+
+    Args:
+        scope: Ámbito a invalidar, o None para todos
+        keys: Claves a invalidar, o None para todo el ámbito
+    """
+    handlers = list(_handlers.items()) if scope is None else [(scope, _handlers.get(scope))]
+    for handler_scope, handler in handlers:
+        if handler is None:
+            logger.debug("Invalidación para ámbito sin handler: %s", handler_scope)
+            continue
+        handler(keys)
+
+
+class InvalidationListener:
+    """Escucha el canal de invalidaciones en un hilo de fondo del worker"""
+
+    def __init__(self, channel: str, poll_interval: float = 1.0):
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de escucha si está habilitado y no está corriendo."""
+        if not settings.CACHE_INVALIDATION_ENABLED:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="cache-invalidation-listener",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de escucha."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Mantiene la conexión LISTEN, reconectando con backoff exponencial."""
+        delay = 1.0
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+                delay = 1.0
+            except psycopg2.Error as e:
+                logger.warning(
+                    "Listener de invalidación desconectado, reintentando en %.0f s ⚠️: %s",
+                    delay, e
+                )
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, 30.0)
+
+    def _listen(self) -> None:
+        """Abre una conexión dedicada, escucha el canal y procesa los mensajes."""
+        conn = psycopg2.connect(settings.SYNC_DATABASE_URL)
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+            logger.info("Escuchando invalidaciones en el canal %s", self.channel)
+
+            # Mientras no se escuchaba pudieron perderse mensajes
+            dispatch_invalidation(None)
+
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([conn], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._handle(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _handle(self, payload: str) -> None:
+        """Procesa un mensaje, ignorando los publicados por este mismo proceso."""
+        try:
+            message = json.loads(payload)
+            if message["origin"] == get_origin_id():
+                return
+            dispatch_invalidation(message["scope"], message.get("keys"))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Mensaje de invalidación inválido %r: %s", payload, e)
+
+
+# Listener global del worker (se inicia en el lifespan de la aplicación)
+invalidation_listener = InvalidationListener(settings.CACHE_INVALIDATION_CHANNEL)
@@ -1,13 +1,34 @@
 """
 Módulo de seguridad
-Maneja hashing de contraseñas y creación de tokens JWT
+Maneja hashing de contraseñas y creación y verificación de tokens JWT
 """
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 import bcrypt
-from jose import jwt
+import jwt as pyjwt
+from jose import JWTError, jwt
 
+from app.core.cache import MISSING, create_cache
 from app.core.config import settings
+from app.core.hashing_pool import HashingPool
+
+# Pool de hashing del worker (bcrypt fuera del event loop, ver hashing_pool)
+password_hashing_pool = HashingPool(
+    "bcrypt",
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+# Tokens de acceso ya verificados: SHA-256 del token -> claims. Un mismo token
+# se presenta en cada petición durante toda su vida, así que la firma se
+# verifica una vez por worker; la entrada vence junto con el "exp" del token.
+access_token_cache = create_cache(
+    "access_tokens",
+    maxsize=settings.ACCESS_TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -46,6 +67,26 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Versión de ``verify_password`` para handlers async: corre en el pool de hashing
+    
+    Raises:
+        HTTPException 429 si el pool de hashing está saturado
+    """
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Versión de ``get_password_hash`` para handlers async: corre en el pool de hashing
+    
+    Raises:
+        HTTPException 429 si el pool de hashing está saturado
+    """
+    return await password_hashing_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea un token JWT
@@ -67,4 +108,69 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+def _decode_with_jose(token: str) -> Optional[Dict[str, Any]]:
+    """Verifica un token con python-jose."""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+
+def _decode_with_pyjwt(token: str) -> Optional[Dict[str, Any]]:
+    """Verifica un token con PyJWT."""
+    try:
+        return pyjwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except pyjwt.InvalidTokenError:
+        return None
+
+
+def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verifica firma y expiración de un token sin usar la caché
+    
+    Usa PyJWT si ``JWT_BACKEND`` es "pyjwt"; si no, python-jose.
+    
+    Args:
+        token: Token JWT codificado
+        
+    Returns:
+        Claims del token, o None si es inválido o expiró
+    """
+    if settings.JWT_BACKEND == "pyjwt":
+        return _decode_with_pyjwt(token)
+    return _decode_with_jose(token)
+
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Obtiene los claims de un token de acceso, verificándolo solo la primera vez
+    
+    Los tokens válidos con "exp" se guardan en ``access_token_cache`` hasta
+    su expiración; los inválidos no se guardan y se verifican cada vez.
+    Los claims retornados son compartidos entre peticiones: no modificarlos.
+    
+    Args:
+        token: Token JWT codificado
+        
+    Returns:
+        Claims del token, o None si es inválido o expiró
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = access_token_cache.get(key)
+    if claims is not MISSING:
+        # La entrada vence con el token; se compara con el reloj real por si este se ajustó
+        return claims if claims["exp"] > time.time() else None
+    
+    claims = verify_access_token(token)
+    if claims is None:
+        return None
+    
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(exp - time.time(), access_token_cache.ttl)
+        if ttl > 0:
+            access_token_cache.set(key, claims, ttl=ttl)
+    return claims
@@ -0,0 +1,120 @@
+"""
+Serialización JSON rápida para respuestas de alto volumen
+
+Con ``FAST_JSON_ENABLED`` activo:
+
+- Las respuestas de la aplicación usan ``FastJSONResponse`` (orjson).
+- Los listados de productos se escriben con orjson directamente desde las
+  filas ORM, que ya cumplen el schema, sin volver a validarlas ni pasar por
+  ``jsonable_encoder`` (``Decimal`` y fechas se emiten igual que pydantic).
+
+Sin el flag se conserva el camino estándar (validación completa).
+"""
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.schemas.product_schemas import ProductListResponse, ProductResponse
+
+_PRODUCT_FIELDS = tuple(ProductResponse.model_fields)
+
+
+def _json_default(value: Any) -> Any:
+    """Serializa los tipos que orjson/json no soportan igual que pydantic."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """Respuesta JSON compacta serializada con orjson"""
+
+    def render(self, content: Any) -> bytes:
+        """Serializa el contenido con orjson (fechas UTC con sufijo "Z")."""
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_UTC_Z)
+
+
+def _trusted_product(product: Any) -> Dict[str, Any]:
+    """Lee los campos de ProductResponse de una fila ORM confiable, sin validarla."""
+    if isinstance(product, ProductResponse):
+        return product.model_dump()
+    return {name: getattr(product, name) for name in _PRODUCT_FIELDS}
+
+
+def _dump_json(content: Any) -> bytes:
+    """Serializa datos ya confiables (dicts/listas) con orjson en modo rápido."""
+    if settings.FAST_JSON_ENABLED:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_UTC_Z)
+    return pydantic_core.to_json(content)
+
+
+def serialize_product_fields(product: Any, product_fields: Tuple[str, ...]) -> bytes:
+    """
+    Serializa solo los campos pedidos de un producto (``fields=``).
+
+    Args:
+        product: Entidad Product o ProductResponse.
+        product_fields: Campos de ProductResponse a incluir, en orden.
+
+    Returns:
+        El JSON en bytes.
+    """
+    return _dump_json({name: getattr(product, name) for name in product_fields})
+
+
+def serialize_product_list(
+    products: Iterable[Any],
+    product_fields: Optional[Tuple[str, ...]] = None,
+    **fields: Any
+) -> bytes:
+    """
+    Serializa un ProductListResponse a JSON.
+
+    En modo rápido las filas se leen directamente de las entidades ORM (ya
+    cumplen el schema) y se escriben con orjson. El JSON es idéntico al del
+    modo estándar.
+
+    Con ``product_fields`` cada producto solo incluye esos campos; las
+    entidades pueden venir cargadas parcialmente (``load_only``), así que no
+    se validan contra ProductResponse.
+
+    Args:
+        products: Productos de la página (entidades ORM o ProductResponse).
+        product_fields: Campos de cada producto a incluir (None = todos).
+        fields: Demás campos de ProductListResponse (total, page, page_size, ...).
+
+    Returns:
+        El JSON en bytes.
+    """
+    if product_fields is not None:
+        page = ProductListResponse.model_validate({"products": [], **fields}).model_dump()
+        page["products"] = [
+            {name: getattr(product, name) for name in product_fields}
+            for product in products
+        ]
+        return _dump_json(page)
+
+    data = {"products": products, **fields}
+    if not settings.FAST_JSON_ENABLED:
+        return ProductListResponse.model_validate(data).model_dump_json().encode("utf-8")
+
+    data["products"] = [_trusted_product(product) for product in products]
+    if isinstance(data.get("facets"), BaseModel):
+        data["facets"] = data["facets"].model_dump()
+    # Mismo orden de campos y valores por defecto que el schema
+    page = {
+        name: data[name] if name in data else info.get_default(call_default_factory=True)
+        for name, info in ProductListResponse.model_fields.items()
+    }
+    return orjson.dumps(page, default=_json_default, option=orjson.OPT_UTC_Z)
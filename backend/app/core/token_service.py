@@ -4,7 +4,7 @@ Service for creating and verifying short-lived JWTs for temporary access.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
 
@@ -50,3 +50,49 @@ class TempTokenService:
         except JWTError as e:
             logger.error(f"Temporary token could not be validated: {e}")
             return None
+
+    def create_download_token(
+        self,
+        user_id: str,
+        sha256: str,
+        storage_path: str,
+        filename: str,
+        content_type: Optional[str] = None,
+        expires_delta: timedelta = timedelta(minutes=5),
+    ) -> str:
+        """
+        Creates a short-lived JWT that grants access to a single stored file.
+
+        The claims carry everything needed to serve the file, so the download
+        endpoint does not have to query the database.
+        """
+        to_encode = {
+            "sub": str(user_id),
+            "exp": datetime.now(timezone.utc) + expires_delta,
+            "type": "file_download",
+            "sha256": sha256,
+            "path": storage_path,
+            "name": filename,
+            "ctype": content_type,
+        }
+        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+
+    def verify_download_token(self, token: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """Verifies a download token for the given file and returns its claims."""
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError as e:
+            logger.warning("Download token could not be validated: %s", e)
+            return None
+
+        if payload.get("type") != "file_download":
+            logger.warning("Invalid token type for file download.")
+            return None
+        if payload.get("sha256") != sha256 or not payload.get("path"):
+            logger.warning("Download token does not match the requested file.")
+            return None
+        return payload
+
+
+# Global instance
+temp_token_service = TempTokenService()
@@ -2,11 +2,44 @@
 Aplicación principal FastAPI
 Configuración de la API con OAuth2 y rutas
 """
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
-from app.routers import auth_router, products_router
+from app.core.invalidation import invalidation_listener
+from app.core.security import password_hashing_pool
+from app.core.serialization import FastJSONResponse
+from app.routers import (
+    auth_router, products_router, monitoring_router, images_router, uploads_router, files_router
+)
+from app.services.catalog_snapshot_service import catalog_snapshot_builder
+from app.services.image_service import image_processor, media_root
+from app.services.reservation_service import reservation_sweeper
+from app.services.upload_service import upload_sweeper
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Inicia y detiene las tareas en segundo plano de cada worker."""
+    os.makedirs(media_root(), exist_ok=True)
+    invalidation_listener.start()
+    reservation_sweeper.start()
+    catalog_snapshot_builder.start()
+    image_processor.start()
+    upload_sweeper.start()
+    yield
+    upload_sweeper.stop()
+    image_processor.stop()
+    catalog_snapshot_builder.stop()
+    reservation_sweeper.stop()
+    invalidation_listener.stop()
+    password_hashing_pool.shutdown()
+
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -15,7 +48,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    default_response_class=FastJSONResponse if settings.FAST_JSON_ENABLED else JSONResponse,
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -30,6 +65,13 @@ app.add_middleware(
 # Incluir routers
 app.include_router(auth_router, prefix=settings.API_V1_PREFIX)
 app.include_router(products_router, prefix=settings.API_V1_PREFIX)
+app.include_router(monitoring_router, prefix=settings.API_V1_PREFIX)
+app.include_router(images_router, prefix=settings.API_V1_PREFIX)
+app.include_router(uploads_router, prefix=settings.API_V1_PREFIX)
+app.include_router(files_router, prefix=settings.API_V1_PREFIX)
+
+# Variantes de imágenes generadas (los originales subidos no se publican)
+app.mount(settings.MEDIA_URL, StaticFiles(directory=media_root(), check_dir=False), name="media")
 
 
 @app.get("/")
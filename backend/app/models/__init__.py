@@ -8,6 +8,11 @@ y permite a Alembic detectar todos los modelos para migraciones.
 from app.models.base import Base
 from app.models.users import User, UserRole
 from app.models.products import Product
+from app.models.inventory import InventoryMovement
+from app.models.reservations import StockReservation
+from app.models.blobs import Blob
+from app.models.images import UploadedImage, ImageStatus
+from app.models.uploads import FileUpload, UploadStatus
 from app.models.orders import Order, OrderItem, OrderStatus
 from app.models.payments import Payment, PaymentStatus, PaymentMethod
 
@@ -15,6 +20,11 @@ __all__ = [
     "Base",
     "User",
     "Product",
+    "InventoryMovement",
+    "StockReservation",
+    "Blob",
+    "UploadedImage",
+    "FileUpload",
     "Order",
     "OrderItem",
     "Payment",
@@ -0,0 +1,39 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class Blob(Base):
+    """Contenido de un archivo subido, identificado por su SHA-256
+    
+    El archivo vive una sola vez en ``UPLOAD_DIR/blobs/`` aunque varias
+    imágenes o subidas lo referencien. ``ref_count`` cuenta las filas de
+    ``uploaded_images`` y ``file_uploads`` que lo usan; cuando llega a cero el
+    recolector de basura lo elimina tras un periodo de gracia.
+    """
+    __tablename__ = "blobs"
+    __table_args__ = (
+        CheckConstraint("ref_count >= 0", name="ck_blobs_ref_count_non_negative"),
+        # Candidatos del recolector de basura
+        Index(
+            "ix_blobs_released_at_unreferenced",
+            "released_at",
+            postgresql_where=text("ref_count = 0")
+        ),
+    )
+    
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    # Momento en que ref_count llegó a cero
+    released_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<Blob(sha256='{self.sha256[:12]}', size={self.size}, ref_count={self.ref_count})>"
@@ -0,0 +1,83 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class UploadedImage(Base):
+    """Imagen subida (foto de producto o de cliente) y sus variantes redimensionadas
+    
+    El original se guarda tal cual en el almacenamiento por contenido y no se
+    publica; un proceso en segundo plano genera las variantes WebP (sin EXIF)
+    y registra sus URLs en ``variants``. Imágenes con el mismo contenido
+    comparten original y variantes.
+    """
+    __tablename__ = "uploaded_images"
+    __table_args__ = (
+        # Cola de procesamiento: solo las imágenes pendientes o en proceso
+        Index(
+            "ix_uploaded_images_queue",
+            "id",
+            postgresql_where=text("status IN ('pending', 'processing')")
+        ),
+        # Imágenes sin producto (candidatas a eliminarse, ver BLOB_ORPHAN_TTL)
+        Index(
+            "ix_uploaded_images_created_at_orphan",
+            "created_at",
+            postgresql_where=text("product_id IS NULL")
+        ),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    product_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("products.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    uploaded_by: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Contenido del original (ver Blob); NULL en imágenes anteriores al almacenamiento por contenido
+    sha256: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("blobs.sha256"), nullable=True, index=True
+    )
+    # Ruta del original relativa a UPLOAD_DIR
+    storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    width: Mapped[Optional[int]] = mapped_column(nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(nullable=True)
+    
+    # pending -> processing -> ready | failed (ver ImageStatus)
+    status: Mapped[str] = mapped_column(String(20), default="pending", server_default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # {"thumb": {"url": ..., "width": ..., "height": ...}, ...}
+    variants: Mapped[dict] = mapped_column(
+        JSONB, default=dict, server_default=text("'{}'::jsonb"), nullable=False
+    )
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<UploadedImage(id={self.id}, status='{self.status}', product_id={self.product_id})>"
+
+
+# Constantes para los estados de procesamiento
+class ImageStatus:
+    """Constantes para los estados de procesamiento de una imagen"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+    
+    @classmethod
+    def all(cls):
+        return [cls.PENDING, cls.PROCESSING, cls.READY, cls.FAILED]
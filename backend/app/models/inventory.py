@@ -0,0 +1,36 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import BigInteger, String, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class InventoryMovement(Base):
+    """Movimiento de inventario (libro de stock de solo inserción)
+    
+    Cada ajuste de stock agrega una fila; las filas nunca se modifican.
+    Si el producto o el usuario se eliminan, el movimiento se conserva.
+    """
+    __tablename__ = "inventory_movements"
+    __table_args__ = (
+        Index("ix_inventory_movements_product_created", "product_id", "created_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    product_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("products.id", ondelete="SET NULL"), nullable=True
+    )
+    delta: Mapped[int] = mapped_column(nullable=False)
+    stock_after: Mapped[int] = mapped_column(nullable=False)
+    reason: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    actor_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return f"<InventoryMovement(id={self.id}, product_id={self.product_id}, delta={self.delta})>"
@@ -1,25 +1,76 @@
 from typing import Optional, List
 from datetime import datetime, timezone
 from decimal import Decimal
-from sqlalchemy import String, Numeric, Text, DateTime
+from sqlalchemy import String, Numeric, Text, DateTime, Computed, CheckConstraint, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 
 
+# Configuración de búsqueda de texto completo (debe coincidir con la migración)
+SEARCH_CONFIG = "spanish"
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('spanish', immutable_unaccent(coalesce(name, ''))), 'A') || "
+    "setweight(to_tsvector('spanish', immutable_unaccent(coalesce(description, ''))), 'B')"
+)
+
+
 class Product(Base):
     """Modelo de producto del inventario
     
     Almacena información de productos con control de stock.
     """
     __tablename__ = "products"
+    __table_args__ = (
+        CheckConstraint("reserved_quantity >= 0", name="ck_products_reserved_quantity_non_negative"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Índices de trigramas (pg_trgm) para autocompletar con tolerancia a errores
+        Index(
+            "ix_products_name_trgm",
+            func.immutable_unaccent(text("name")).label("unaccented_name"),
+            postgresql_using="gin",
+            postgresql_ops={"unaccented_name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_products_sku_trgm",
+            "sku",
+            postgresql_using="gin",
+            postgresql_ops={"sku": "gin_trgm_ops"}
+        ),
+        # Índices parciales para las consultas del catálogo (ver ProductService.get_products)
+        Index(
+            "ix_products_in_stock_category_price",
+            "category", "price", "id",
+            postgresql_where=text("is_active AND stock_quantity > 0")
+        ),
+        Index(
+            "ix_products_active_category_id",
+            "category", "id",
+            postgresql_where=text("is_active")
+        ),
+        Index(
+            "ix_products_active_price_id",
+            "price", "id",
+            postgresql_where=text("is_active")
+        ),
+        Index(
+            "ix_products_active_created_at_id",
+            text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("is_active")
+        ),
+    )
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     sku: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     stock_quantity: Mapped[int] = mapped_column(default=0, nullable=False)
+    # Suma de las reservas de stock vigentes (ver StockReservation)
+    reserved_quantity: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # URLs de las variantes WebP de la imagen subida, por tamaño (ver UploadedImage)
+    image_variants: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     
     # Campos simples sin ENUM
     category: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
@@ -27,6 +78,14 @@ class Product(Base):
     
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
     
+    # Columna generada por PostgreSQL para búsqueda de texto completo (sin acentos)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True
+    )
+    
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         default=lambda: datetime.now(timezone.utc),
@@ -44,10 +103,15 @@ class Product(Base):
     def __repr__(self) -> str:
         return f"<Product(id={self.id}, name='{self.name}', sku='{self.sku}', price={self.price}, stock={self.stock_quantity})>"
     
+    @property
+    def available_quantity(self) -> int:
+        """Stock que se puede vender: existencias menos reservas vigentes"""
+        return max(self.stock_quantity - (self.reserved_quantity or 0), 0)
+    
     @property
     def is_in_stock(self) -> bool:
         """Verifica si el producto tiene stock disponible"""
-        return self.stock_quantity > 0 and self.status == "active"
+        return self.available_quantity > 0 and self.status == "active"
     
     @property
     def is_available(self) -> bool:
@@ -55,5 +119,5 @@ class Product(Base):
         return (
             self.is_active 
             and self.status == "active"
-            and self.stock_quantity > 0
+            and self.available_quantity > 0
         )
\ No newline at end of file
@@ -0,0 +1,40 @@
+from datetime import datetime
+import uuid
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Index, UniqueConstraint, UUID as PGUUID, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class StockReservation(Base):
+    """Reserva temporal de stock de un producto para un pedido
+    
+    Mientras está vigente, la cantidad se descuenta de la disponibilidad del
+    producto (``Product.reserved_quantity``). Se elimina al confirmar o
+    cancelar el pago, o al expirar (barrido periódico).
+    """
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        UniqueConstraint("order_id", "product_id", name="uq_stock_reservations_order_product"),
+        CheckConstraint("quantity > 0", name="ck_stock_reservations_quantity_positive"),
+        Index("ix_stock_reservations_expires_at", "expires_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # RESTRICT: borrar un pedido con reservas dejaría su stock retenido en
+    # products.reserved_quantity; hay que liberarlas antes (release_reservations)
+    order_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("orders.id", ondelete="RESTRICT"), nullable=False
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    quantity: Mapped[int] = mapped_column(nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StockReservation(order_id={self.order_id}, product_id={self.product_id}, quantity={self.quantity})>"
@@ -0,0 +1,76 @@
+from typing import Optional
+from datetime import datetime
+import uuid
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, UUID as PGUUID, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class FileUpload(Base):
+    """Archivo subido por partes (PDFs y fotos para impresión en el checkout)
+    
+    Mientras está en curso, los bytes recibidos se acumulan en
+    ``UPLOAD_DIR/incoming/{id}.part``; el tamaño de ese archivo es el offset
+    desde el que el cliente reanuda. Al completarse se verifica el checksum, el
+    contenido pasa al almacenamiento por contenido (ver Blob) y el archivo
+    queda asociado (opcionalmente) a un pedido.
+    """
+    __tablename__ = "file_uploads"
+    __table_args__ = (
+        # Barrido de subidas abandonadas
+        Index(
+            "ix_file_uploads_expires_at_uploading",
+            "expires_at",
+            postgresql_where=text("status = 'uploading'")
+        ),
+        # Subidas completas sin pedido (candidatas a eliminarse, ver BLOB_ORPHAN_TTL)
+        Index(
+            "ix_file_uploads_completed_at_orphan",
+            "completed_at",
+            postgresql_where=text("status = 'completed' AND order_id IS NULL")
+        ),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    order_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("orders.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    # Tamaño total declarado al iniciar la subida
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Checksum SHA-256 (hex) enviado por el cliente y el calculado al completar
+    expected_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    sha256: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("blobs.sha256"), nullable=True, index=True
+    )
+    # Ruta del archivo completo relativa a UPLOAD_DIR
+    storage_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    
+    # uploading -> completed (ver UploadStatus)
+    status: Mapped[str] = mapped_column(String(20), default="uploading", server_default="uploading", nullable=False)
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<FileUpload(id={self.id}, status='{self.status}', order_id={self.order_id})>"
+
+
+# Constantes para los estados de una subida
+class UploadStatus:
+    """Constantes para los estados de una subida por partes"""
+    UPLOADING = "uploading"
+    COMPLETED = "completed"
+    
+    @classmethod
+    def all(cls):
+        return [cls.UPLOADING, cls.COMPLETED]
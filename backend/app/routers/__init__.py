@@ -3,5 +3,12 @@ Routers package initialization
 """
 from app.routers.auth import router as auth_router
 from app.routers.products import router as products_router
+from app.routers.monitoring import router as monitoring_router
+from app.routers.images import router as images_router
+from app.routers.uploads import router as uploads_router
+from app.routers.files import router as files_router
 
-__all__ = ["auth_router", "products_router"]
+__all__ = [
+    "auth_router", "products_router", "monitoring_router", "images_router", "uploads_router",
+    "files_router"
+]
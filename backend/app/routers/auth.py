@@ -3,14 +3,14 @@ Router de autenticación
 Maneja endpoints relacionados con login y autenticación OAuth2
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.schemas.user_schemas import Token, UserRegister, UserResponse
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, Principal
 from app.core.dependencies import get_current_active_user
-from app.models.users import User
 
 router = APIRouter(prefix="/auth", tags=["Autenticación"])
 
@@ -32,6 +32,10 @@ async def login(
     - token_type: Tipo de token (bearer)
     - user: Información del usuario autenticado
     
+    **Errores:**
+    - 401: Credenciales incorrectas
+    - 429: Demasiados logins simultáneos en el worker (reintentar tras `Retry-After`)
+    
     **Ejemplo de uso con curl:**
     ```bash
     curl -X POST "http://localhost:8000/api/v1/auth/token" \\
@@ -53,7 +57,7 @@ async def login(
     ```
     """
     # Autenticar usuario (OAuth2 usa 'username' pero nosotros usamos email)
-    user = AuthService.authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await AuthService.authenticate_user(db, email=form_data.username, password=form_data.password)
     
     if not user:
         raise HTTPException(
@@ -91,7 +95,7 @@ async def register(
     **Nota:** Los usuarios registrados públicamente siempre tienen rol CUSTOMER
     """
     # Crear usuario
-    user = AuthService.create_user(
+    user = await AuthService.create_user(
         db=db,
         email=user_data.email,
         full_name=user_data.full_name,
@@ -110,7 +114,8 @@ async def register(
 
 @router.get("/me", response_model=UserResponse, summary="Obtener usuario actual")
 async def get_me(
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
 ):
     """
     Obtener información del usuario autenticado actual
@@ -123,12 +128,19 @@ async def get_me(
          -H "Authorization: Bearer <tu_token_jwt>"
     ```
     """
-    return current_user
+    # La autenticación solo trae id, email, rol y estado; el perfil completo se carga aquí
+    user = await run_in_threadpool(AuthService.get_user_by_id, db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+    return user
 
 
 @router.post("/refresh", response_model=Token, summary="Refrescar token")
 async def refresh_token(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
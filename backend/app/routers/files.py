@@ -0,0 +1,109 @@
+"""
+Router de descargas
+Sirve los archivos subidos (PDFs y fotos para impresión) a partir de un enlace
+firmado, sin consultar la base de datos: el token ya indica qué archivo se
+puede descargar.
+"""
+import mimetypes
+import os
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.core import blob_store
+from app.core.config import settings
+from app.core.http_cache import etag_matches
+from app.core.token_service import temp_token_service
+
+router = APIRouter(prefix="/files", tags=["Descargas"])
+
+# El contenido de una ruta por hash nunca cambia; el token en la URL la hace privada
+_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _content_disposition(filename: str) -> str:
+    """Header Content-Disposition de descarga (igual al que genera FileResponse)."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+@router.api_route(
+    "/{sha256}",
+    methods=["GET", "HEAD"],
+    response_class=FileResponse,
+    summary="Descargar un archivo con un enlace firmado",
+    responses={206: {"description": "Rango parcial del archivo"}, 304: {"description": "No modificado"}}
+)
+async def download_file(
+    sha256: str,
+    request: Request,
+    token: str = Query(..., description="Token del enlace de descarga")
+):
+    """
+    Descarga un archivo usando el enlace generado en `POST /uploads/{id}/download-link`.
+
+    - No requiere el header `Authorization`; el token del enlace vence en
+      `DOWNLOAD_TOKEN_TTL` segundos.
+    - Soporta `Range` / `If-Range` (`206`) para reanudar descargas de PDFs grandes.
+    - El `ETag` es el SHA-256 del contenido; `If-None-Match` responde `304`.
+    - `403` si el token es inválido, expiró o corresponde a otro archivo.
+    """
+    claims = temp_token_service.verify_download_token(token, sha256)
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Enlace de descarga inválido o expirado"
+        )
+
+    storage_path = os.path.normpath(claims["path"])
+    if storage_path.startswith(("..", "/")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Enlace de descarga inválido o expirado"
+        )
+
+    etag = f'"{sha256}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            _IMMUTABLE_CACHE_CONTROL
+            if storage_path == blob_store.relative_blob_path(sha256)
+            else _REVALIDATE_CACHE_CONTROL
+        ),
+        "X-Content-Type-Options": "nosniff",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    filename = claims.get("name") or sha256
+    media_type = claims.get("ctype") or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if settings.DOWNLOAD_ACCEL_REDIRECT:
+        # El proxy lee el archivo con sendfile y atiende los rangos
+        response = Response(media_type=media_type, headers=headers)
+        response.headers["X-Accel-Redirect"] = f"{settings.DOWNLOAD_ACCEL_REDIRECT.rstrip('/')}/{storage_path}"
+        response.headers["Content-Disposition"] = _content_disposition(filename)
+        return response
+
+    absolute_path = os.path.join(settings.UPLOAD_DIR, storage_path)
+    try:
+        stat_result = await run_in_threadpool(os.stat, absolute_path)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archivo no encontrado"
+        ) from e
+
+    # Con servidores que soportan "http.response.pathsend" el envío no pasa por Python
+    return FileResponse(
+        absolute_path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result
+    )
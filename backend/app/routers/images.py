@@ -0,0 +1,82 @@
+"""
+Router de imágenes
+Maneja la subida de fotos de productos y de clientes y la consulta de sus
+variantes redimensionadas.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_active_user
+from app.database import get_db
+from app.models.users import UserRole
+from app.services.auth_service import Principal
+from app.schemas.image_schemas import ImageResponse
+from app.services.image_service import ImageService
+from app.services.product_service import ProductService
+
+router = APIRouter(prefix="/images", tags=["Imágenes"])
+
+
+@router.post(
+    "/",
+    response_model=ImageResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Subir una imagen"
+)
+def upload_image(
+    file: UploadFile = File(..., description="Imagen (jpg, jpeg, png, gif o webp)"),
+    product_id: Optional[int] = Form(None, description="Producto al que pertenece la imagen"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Sube una imagen y encola la generación de sus variantes.
+
+    - **Requiere autenticación.** Asignar la imagen a un producto requiere rol `ADMIN`.
+    - El archivo se guarda por bloques y se rechaza con `413` si supera `MAX_UPLOAD_SIZE`.
+    - Responde `202` con la imagen en estado `pending`; las variantes WebP (sin EXIF)
+      se generan en segundo plano. Consulte `GET /images/{image_id}` para ver su estado.
+    - Si ya se subió una imagen idéntica, se reutilizan sus variantes y la
+      respuesta llega en estado `ready`.
+    - Cuando la imagen de un producto queda lista, se actualizan su `image_url`
+      e `image_variants`.
+    """
+    if product_id is not None:
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Se requieren privilegios de administrador"
+            )
+        if ProductService.get_product(db, product_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+
+    return ImageService.save_upload(db, file, uploaded_by=current_user.id, product_id=product_id)
+
+
+@router.get(
+    "/{image_id}",
+    response_model=ImageResponse,
+    summary="Obtener una imagen y sus variantes"
+)
+def get_image(
+    image_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Obtiene el estado de procesamiento de una imagen y las URLs de sus variantes.
+
+    - **Requiere autenticación.** Solo el usuario que la subió o un `ADMIN` pueden verla.
+    """
+    image = ImageService.get_image(db, image_id)
+    if image is None or (image.uploaded_by != current_user.id and current_user.role != UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Imagen no encontrada"
+        )
+    return image
@@ -0,0 +1,44 @@
+"""
+Router de monitoreo
+Expone métricas internas del proceso (cachés en memoria y pool de hashing de
+contraseñas) para administradores.
+"""
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.core.cache import get_cache_stats
+from app.core.dependencies import get_current_admin_user
+from app.core.security import password_hashing_pool
+from app.services.catalog_cache import catalog_snapshots
+
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Monitoreo"],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("/cache", summary="Métricas de las cachés en memoria")
+def cache_metrics() -> Dict[str, Any]:
+    """
+    Retorna tamaño, aciertos, fallos, desalojos e invalidaciones de cada caché.
+    
+    - **Requiere rol `ADMIN`.**
+    - Las métricas son por worker: cada proceso de uvicorn tiene sus propias cachés.
+    - `snapshots` describe las páginas precalculadas por categoría.
+    """
+    return {"caches": get_cache_stats(), "snapshots": catalog_snapshots.stats()}
+
+
+@router.get("/password-hashing", summary="Métricas del pool de hashing de contraseñas")
+def password_hashing_metrics() -> Dict[str, Any]:
+    """
+    Retorna la profundidad de la cola y la latencia del pool de bcrypt.
+    
+    - **Requiere rol `ADMIN`.**
+    - `queue_depth`: operaciones esperando un hilo; `rejected`: respuestas `429`.
+    - `queue_wait_ms` y `hash_ms`: promedio, p50, p95 y máximo de las últimas operaciones.
+    - Las métricas son por worker.
+    """
+    return password_hashing_pool.stats()
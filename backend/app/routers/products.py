@@ -3,9 +3,15 @@
 Router para Productos
 Maneja los endpoints de la API para operaciones CRUD de productos.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import io
+from datetime import datetime
+from fastapi import (
+    APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple, get_args
 
 from app.database import get_db
 from app.schemas.product_schemas import (
@@ -13,26 +19,104 @@ from app.schemas.product_schemas import (
     ProductUpdate, 
     ProductResponse, 
     ProductListResponse,
-    ProductSearchFilters
+    ProductBatchResponse,
+    ProductBulkUpdate,
+    ProductBulkUpdateResponse,
+    ProductSearchFilters,
+    ProductSuggestion,
+    ProductCountMode,
+    ProductFacetName,
+    ProductImportReport,
+    ProductInventoryAdjustment,
+    ProductInventoryAdjustmentResult,
+    ProductInventoryBatchAdjustment
 )
 from app.services.product_service import ProductService
-from app.core.dependencies import get_current_active_user
-from app.models.users import User, UserRole
+from app.services.product_import_service import ProductImportService
+from app.services.product_export_service import EXPORT_FORMATS, ProductExportService
+from app.services.inventory_service import InventoryService
+from app.services.catalog_cache import catalog_snapshots, product_list_cache
+from app.core.cache import MISSING
+from app.core.serialization import serialize_product_fields, serialize_product_list
+from app.core.config import settings
+from app.core.http_cache import (
+    cache_headers,
+    has_conditional_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response
+)
+from app.core.dependencies import get_current_active_user, get_current_admin_user
+from app.models.users import UserRole
+from app.services.auth_service import Principal
 
 router = APIRouter(prefix="/products", tags=["Productos"])
 
+_NOT_MODIFIED_RESPONSE = {304: {"description": "El cliente ya tiene la versión actual (ETag)"}}
+
+
+def _product_etag(
+    product_id: int,
+    last_modified: datetime,
+    fields: Optional[Tuple[str, ...]] = None
+) -> str:
+    """ETag de un producto: depende de su ID, fecha de modificación y campos pedidos."""
+    if fields is None:
+        return make_etag("product", product_id, last_modified.isoformat())
+    return make_etag("product", product_id, last_modified.isoformat(), ",".join(fields))
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Convierte el parámetro ``fields`` en los campos de ProductResponse a incluir.
+
+    El ID siempre se incluye y los campos quedan en el orden del schema.
+
+    Raises:
+        HTTPException 400 si algún campo no existe.
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - set(ProductResponse.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos no soportados: {', '.join(sorted(unknown))}"
+        )
+    names.add("id")
+    return tuple(name for name in ProductResponse.model_fields if name in names)
+
+
+def _parse_facets(facets: Optional[str]) -> Tuple[str, ...]:
+    """
+    Convierte el parámetro ``facets`` en una tupla ordenada y sin duplicados.
+
+    Raises:
+        HTTPException 400 si alguna faceta no existe.
+    """
+    if not facets:
+        return ()
+    names = {name.strip() for name in facets.split(",") if name.strip()}
+    unknown = names - set(get_args(ProductFacetName))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Facetas no soportadas: {', '.join(sorted(unknown))}"
+        )
+    return tuple(sorted(names))
+
 
 @router.post(
     "/", 
     response_model=ProductResponse, 
     status_code=status.HTTP_201_CREATED,
-    summary="Crear un nuevo producto",
-    dependencies=[Depends(get_current_active_user)]
+    summary="Crear un nuevo producto"
 )
 def create_product(
     product: ProductCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Crea un nuevo producto en el inventario.
@@ -49,38 +133,293 @@ def create_product(
     return ProductService.create_product(db=db, product_data=product)
 
 
+@router.post(
+    "/import",
+    response_model=ProductImportReport,
+    summary="Importar productos masivamente (CSV / NDJSON)"
+)
+def import_products(
+    file: UploadFile = File(..., description="Archivo CSV con encabezados o NDJSON (un producto por línea)"),
+    file_format: Optional[str] = Query(
+        None,
+        alias="format",
+        pattern="^(csv|ndjson)$",
+        description="Formato del archivo; si se omite se deduce de la extensión"
+    ),
+    batch_size: int = Query(5000, ge=100, le=50000, description="Filas por lote de COPY"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Importa o actualiza productos en bloque, identificándolos por `sku`.
+    
+    - **Requiere rol `ADMIN`.**
+    - Cada fila se valida con las mismas reglas de `ProductCreate` (más `sku` y `category`).
+    - Las filas inválidas se reportan en `errors` sin abortar la importación.
+    - Las filas que dejarían el stock por debajo de lo reservado no se aplican y se reportan en `errors`.
+    - El archivo se procesa en streaming y se carga por lotes con `COPY`.
+    """
+    resolved_format = file_format or ProductImportService.detect_format(file.filename)
+    if resolved_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se pudo determinar el formato; use ?format=csv o ?format=ndjson"
+        )
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return ProductImportService.import_products(
+            db, stream, resolved_format, batch_size=batch_size
+        )
+    except UnicodeDecodeError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El archivo debe estar codificado en UTF-8"
+        ) from e
+    except csv.Error as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV inválido: {e}"
+        ) from e
+    finally:
+        stream.detach()
+
+
+@router.post(
+    "/inventory-adjustments",
+    response_model=List[ProductInventoryAdjustmentResult],
+    summary="Ajustar el stock de varios productos"
+)
+def adjust_inventory_batch(
+    payload: ProductInventoryBatchAdjustment,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Suma o resta stock a varios productos a la vez (ej. recepción de mercancía).
+    
+    - **Requiere rol `ADMIN`.**
+    - Cada ajuste identifica el producto por `product_id` o por `sku`.
+    - Todos los ajustes se aplican en una sola sentencia atómica y quedan en el libro de inventario.
+    - Si algún producto no existe (`404`) o quedaría con menos stock que el reservado (`409`)
+      no se aplica ninguno.
+    - `409` si un ajuste por `product_id` y otro por `sku` apuntan al mismo producto.
+    """
+    return InventoryService.adjust_stock_batch(db, payload.adjustments, actor_id=current_user.id)
+
+
+@router.post(
+    "/{product_id}/inventory-adjustments",
+    response_model=ProductInventoryAdjustmentResult,
+    summary="Ajustar el stock de un producto"
+)
+def adjust_inventory(
+    product_id: int,
+    adjustment: ProductInventoryAdjustment,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Suma o resta stock a un producto y registra el movimiento.
+    
+    - **Requiere rol `ADMIN`.**
+    - El ajuste es atómico: ajustes concurrentes no se pierden.
+    - Responde `409` si el stock quedaría negativo o por debajo de lo reservado por pedidos en curso.
+    """
+    return InventoryService.adjust_stock(db, product_id, adjustment, actor_id=current_user.id)
+
+
+@router.patch(
+    "/bulk",
+    response_model=ProductBulkUpdateResponse,
+    summary="Actualizar varios productos en una sola operación"
+)
+def bulk_update_products(
+    payload: ProductBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Aplica cambios parciales (precio, stock, etc.) a varios productos a la vez.
+    
+    - **Requiere rol `ADMIN`.**
+    - Cada cambio identifica el producto por `id` o por `sku` y usa los campos de `ProductUpdate`.
+    - Todos los cambios se aplican en una sola transacción.
+    - Las referencias inexistentes se reportan en `not_found_ids` / `not_found_skus`.
+    - `409` si un cambio por `id` y otro por `sku` apuntan al mismo producto.
+    - `409` si algún stock quedaría por debajo de lo reservado por pedidos en curso.
+    """
+    return ProductService.bulk_update_products(db, payload.changes)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Exportar el catálogo (CSV / NDJSON)"
+)
+def export_products(
+    filters: ProductSearchFilters = Depends(),
+    file_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="Formato del archivo"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Descarga el catálogo completo (o filtrado) ordenado por ID.
+    
+    - **Requiere rol `ADMIN`.**
+    - Acepta los mismos filtros que el listado de productos.
+    - Se genera en streaming con un cursor del servidor: la memoria no crece con el catálogo.
+    - El CSV tiene las columnas que acepta `POST /products/import`.
+    """
+    filename = f"productos-{datetime.now():%Y%m%d-%H%M%S}.{file_format}"
+    return StreamingResponse(
+        ProductExportService.export_products(db, filters, file_format),
+        media_type=EXPORT_FORMATS[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=ProductBatchResponse,
+    summary="Obtener varios productos por ID"
+)
+def get_products_batch(
+    ids: str = Query(..., description="IDs separados por coma, ej. `1,2,3`"),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene varios productos en una sola petición (carrito, resumen de checkout).
+    
+    - **No requiere autenticación.**
+    - Conserva el orden solicitado e informa en `missing_ids` los que no existen.
+    - Usa la caché del catálogo y resuelve el resto con una sola consulta.
+    """
+    try:
+        product_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El parámetro ids debe ser una lista de enteros separados por coma"
+        ) from e
+
+    if not product_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar al menos un ID"
+        )
+    if len(product_ids) > settings.PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten máximo {settings.PRODUCT_BATCH_MAX_IDS} IDs por petición"
+        )
+
+    products, missing_ids = ProductService.get_products_by_ids(db, product_ids)
+    return {"products": products, "missing_ids": missing_ids}
+
+
+@router.get(
+    "/suggest",
+    response_model=List[ProductSuggestion],
+    summary="Autocompletar productos por nombre o SKU"
+)
+def suggest_products(
+    q: str = Query(..., min_length=2, max_length=100, description="Texto ingresado en el buscador"),
+    limit: int = Query(8, ge=1, le=20, description="Número máximo de sugerencias"),
+    db: Session = Depends(get_db)
+):
+    """
+    Sugiere productos activos mientras el usuario escribe en el buscador.
+    
+    - **No requiere autenticación.**
+    - Búsqueda difusa por trigramas (`pg_trgm`) sobre nombre y SKU: tolera errores de tipeo.
+    - Solo retorna `id`, `name`, `price` e `image_url`.
+    - Las consultas más frecuentes se sirven desde la caché del catálogo.
+    """
+    return ProductService.suggest_products(db, q, limit)
+
+
 @router.get(
     "/{product_id}", 
     response_model=ProductResponse, 
-    summary="Obtener un producto por ID"
+    summary="Obtener un producto por ID",
+    responses=_NOT_MODIFIED_RESPONSE
 )
 def get_product(
     product_id: int, 
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a incluir separados por coma (ej. `id,name,price,image_url`)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
     Obtiene la información detallada de un producto específico por su ID.
     
     - **No requiere autenticación.**
+    - Se sirve desde la caché del catálogo cuando está disponible.
+    - Soporta `If-None-Match` / `If-Modified-Since`: si el producto no cambió
+      responde `304` sin cuerpo.
+    - `fields` limita la respuesta a los campos indicados (el `id` siempre se incluye).
     """
-    db_product = ProductService.get_product(db, product_id=product_id)
+    product_fields = _parse_fields(fields)
+    if has_conditional_headers(request):
+        last_modified = ProductService.get_product_last_modified(db, product_id)
+        if last_modified is not None:
+            etag = _product_etag(product_id, last_modified, product_fields)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+
+    db_product = ProductService.get_product_response(db, product_id=product_id)
     if db_product is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Producto no encontrado"
         )
+
+    last_modified = db_product.updated_at or db_product.created_at
+    headers = cache_headers(_product_etag(product_id, last_modified, product_fields), last_modified)
+    if product_fields is not None:
+        return Response(
+            content=serialize_product_fields(db_product, product_fields),
+            media_type="application/json",
+            headers=headers
+        )
+    response.headers.update(headers)
     return db_product
 
 
 @router.get(
     "/", 
     response_model=ProductListResponse, 
-    summary="Listar productos con filtros y paginación"
+    summary="Listar productos con filtros y paginación",
+    responses=_NOT_MODIFIED_RESPONSE
 )
 def get_products(
+    request: Request,
     filters: ProductSearchFilters = Depends(),
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor opaco (`next_cursor` de la respuesta anterior). Si se envía, se ignora `page`"
+    ),
+    count: ProductCountMode = Query(
+        "exact",
+        description="Cálculo del total: exact (cacheado), estimated (planner) o none"
+    ),
+    facets: Optional[str] = Query(
+        None,
+        description="Facetas a incluir separadas por coma: category, price"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Campos de cada producto separados por coma (ej. `id,name,price,image_url`)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -88,37 +427,106 @@ def get_products(
     
     - **No requiere autenticación.**
     - **Filtros disponibles:** búsqueda por texto, categoría, rango de precios, etc.
+    - **Búsqueda:** `search` usa el índice de texto completo (español, sin acentos)
+      y admite prefijos; con `sort=relevance` los resultados se ordenan por `ts_rank`.
+    - **Paginación:** por número de página (`page`) o por cursor (`cursor`/`next_cursor`).
+      El cursor mantiene un costo constante sin importar la profundidad y no desplaza
+      resultados si el inventario cambia mientras se navega.
+    - **Total:** `count=estimated` usa la estimación del planner en listados grandes y
+      `count=none` omite el conteo; `total_mode` indica cuál se usó.
+    - **Facetas:** `facets=category,price` agrega conteos por categoría y por rango de
+      precio en una sola consulta (cada faceta ignora su propio filtro). También
+      entrega el total exacto, así que reemplaza al conteo.
+    - **Campos:** `fields=id,name,price,image_url` carga solo esas columnas en SQL y
+      devuelve cada producto con esos campos (el `id` siempre se incluye).
+    - Las páginas se guardan ya serializadas en la caché del catálogo. Las primeras
+      páginas de cada categoría (solo `category`, sin otros filtros) se precalculan
+      tras cada escritura y se sirven directamente desde memoria.
+    - La respuesta incluye un `ETag` del contenido; con `If-None-Match` responde `304`.
     """
-    skip = (page - 1) * page_size
-    products, total_count = ProductService.get_products(
-        db, filters=filters, skip=skip, limit=page_size
+    requested_facets = _parse_facets(facets)
+    product_fields = _parse_fields(fields)
+    filters_key = ProductService.filters_cache_key(filters)
+
+    entry = None
+    if (
+        filters.category
+        and filters.sort is None
+        and cursor is None
+        and count == "exact"
+        and not requested_facets
+        and product_fields is None
+        and all(value is None for name, value in filters_key if name != "category")
+    ):
+        # Solo categoría: primeras páginas precalculadas
+        entry = catalog_snapshots.get(filters.category, page, page_size)
+    if entry is not None:
+        etag, body = entry
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+
+    cache_key = (
+        filters_key,
+        filters.sort,
+        page,
+        page_size,
+        cursor,
+        count,
+        requested_facets,
+        product_fields
     )
+    generation = product_list_cache.generation
+    entry = product_list_cache.get(cache_key)
+    if entry is MISSING:
+        skip = (page - 1) * page_size
+        result = ProductService.get_products(
+            db,
+            filters=filters,
+            skip=skip,
+            limit=page_size,
+            cursor=cursor,
+            count_mode=count,
+            facets=requested_facets,
+            fields=product_fields
+        )
+        body = serialize_product_list(
+            result.products,
+            product_fields=product_fields,
+            total=result.total,
+            total_mode=result.total_mode,
+            page=page,
+            page_size=page_size,
+            next_cursor=result.next_cursor,
+            facets=result.facets
+        )
+        # ETag por contenido: igual en todos los workers para la misma página
+        entry = (make_etag(body), body)
+        product_list_cache.set(cache_key, entry, generation=generation)
     
-    return {
-        "total": total_count,
-        "products": products,
-        "page": page,
-        "page_size": page_size
-    }
+    etag, body = entry
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.put(
     "/{product_id}", 
     response_model=ProductResponse, 
-    summary="Actualizar un producto",
-    dependencies=[Depends(get_current_active_user)]
+    summary="Actualizar un producto"
 )
 def update_product(
     product_id: int,
     product: ProductUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Actualiza la información de un producto existente.
     
     - **Requiere autenticación.**
     - **Solo accesible para roles `ADMIN` o `MANAGER`.**
+    - Responde `409` si el stock quedaría por debajo de lo reservado por pedidos en curso.
     """
     if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
         raise HTTPException(
@@ -140,13 +548,12 @@ def update_product(
 @router.delete(
     "/{product_id}", 
     status_code=status.HTTP_204_NO_CONTENT, 
-    summary="Eliminar un producto",
-    dependencies=[Depends(get_current_active_user)]
+    summary="Eliminar un producto"
 )
 def delete_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Elimina un producto del inventario.
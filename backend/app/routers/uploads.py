@@ -0,0 +1,134 @@
+"""
+Router de subidas por partes
+Maneja la subida reanudable de archivos para impresión (PDFs y fotos) que los
+clientes adjuntan a sus pedidos en el checkout.
+"""
+import uuid
+
+from fastapi import APIRouter, Depends, Header, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_active_user
+from app.database import get_db
+from app.schemas.upload_schemas import DownloadLinkResponse, UploadComplete, UploadCreate, UploadResponse
+from app.services.auth_service import Principal
+from app.services.upload_service import UploadService
+
+router = APIRouter(prefix="/uploads", tags=["Subidas"])
+
+
+@router.post(
+    "/",
+    response_model=UploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Iniciar una subida por partes"
+)
+def init_upload(
+    data: UploadCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Registra un archivo que se enviará por partes.
+
+    - **Requiere autenticación.**
+    - `size` no puede superar `MAX_UPLOAD_SIZE` (`413`).
+    - La respuesta incluye el `id` de la subida y el `chunk_size` máximo por parte.
+    - Si `checksum_sha256` corresponde a un archivo del mismo tamaño que el
+      usuario ya subió, la subida se responde `completed` sin enviar partes.
+    """
+    return UploadService.init_upload(db, data, current_user)
+
+
+@router.get(
+    "/{upload_id}",
+    response_model=UploadResponse,
+    summary="Consultar una subida (offset para reanudar)"
+)
+def get_upload(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Retorna el estado de una subida y su `offset` (bytes recibidos).
+
+    - **Requiere autenticación.**
+    - Después de una interrupción, el cliente continúa enviando desde `offset`.
+    """
+    upload = UploadService.get_upload_for_user(db, upload_id, current_user)
+    return UploadService.to_response(upload)
+
+
+@router.patch(
+    "/{upload_id}",
+    response_model=UploadResponse,
+    summary="Enviar una parte del archivo"
+)
+async def append_chunk(
+    upload_id: uuid.UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0, description="Posición de la parte en el archivo"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Agrega los bytes del cuerpo (`application/octet-stream`) en `Upload-Offset`.
+
+    - **Requiere autenticación.**
+    - El cuerpo se escribe a disco a medida que llega; cada parte puede tener
+      máximo `chunk_size` bytes.
+    - `409` si `Upload-Offset` no coincide con los bytes recibidos (el detalle
+      incluye el `offset` correcto).
+    """
+    upload = await run_in_threadpool(UploadService.get_upload_for_user, db, upload_id, current_user)
+    # La conexión vuelve al pool antes de recibir el cuerpo: un cliente lento
+    # no debe retenerla mientras envía la parte (la subida queda desconectada)
+    await run_in_threadpool(db.close)
+    return await UploadService.append_chunk(upload, upload_offset, request.stream())
+
+
+@router.post(
+    "/{upload_id}/complete",
+    response_model=UploadResponse,
+    summary="Completar una subida y adjuntarla a un pedido"
+)
+def complete_upload(
+    upload_id: uuid.UUID,
+    data: UploadComplete,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Verifica el tamaño y el checksum SHA-256 del archivo y lo adjunta al pedido.
+
+    - **Requiere autenticación.**
+    - `409` si aún faltan bytes; `422` si el checksum enviado al iniciar no
+      coincide (la subida vuelve a offset 0).
+    - `order_id` adjunta el archivo a un pedido del usuario.
+    """
+    upload = UploadService.get_upload_for_user(db, upload_id, current_user)
+    return UploadService.complete_upload(db, upload, data.order_id, current_user)
+
+
+@router.post(
+    "/{upload_id}/download-link",
+    response_model=DownloadLinkResponse,
+    summary="Generar un enlace de descarga firmado"
+)
+def create_download_link(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Genera un enlace temporal para descargar un archivo completado.
+
+    - **Requiere autenticación.** El dueño de la subida, `ADMIN` o `STAFF`.
+    - El enlace vence en `DOWNLOAD_TOKEN_TTL` segundos y no requiere el header
+      `Authorization`, así que puede abrirse directamente en el navegador.
+    - `409` si la subida aún no se completa.
+    """
+    upload = UploadService.get_upload_for_user(db, upload_id, current_user)
+    return UploadService.create_download_link(upload, current_user)
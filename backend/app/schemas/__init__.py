@@ -23,13 +23,27 @@ from app.schemas.user_schemas import (
 from app.schemas.product_schemas import (
     ProductBase,
     ProductCreate,
+    ProductImportRow,
     ProductUpdate,
+    ProductBulkChange,
+    ProductBulkUpdate,
+    ProductBulkUpdateResponse,
     ProductStockUpdate,
     ProductResponse,
     ProductWithStock,
     ProductListResponse,
+    ProductSuggestion,
+    CategoryFacet,
+    PriceRangeFacet,
+    ProductFacets,
+    ProductBatchResponse,
     ProductSearchFilters,
+    ProductImportError,
+    ProductImportReport,
     ProductInventoryAdjustment,
+    ProductInventoryBatchItem,
+    ProductInventoryBatchAdjustment,
+    ProductInventoryAdjustmentResult,
 )
 
 # Order schemas
@@ -51,9 +65,24 @@ from app.schemas.order_schemas import (
     OrderFilters,
     OrderStatistics,
     CheckoutRequest,
+    StockReservationResponse,
     CheckoutResponse,
 )
 
+# Image schemas
+from app.schemas.image_schemas import (
+    ImageVariant,
+    ImageResponse,
+)
+
+# Upload schemas
+from app.schemas.upload_schemas import (
+    UploadCreate,
+    UploadComplete,
+    UploadResponse,
+    DownloadLinkResponse,
+)
+
 # Payment schemas
 from app.schemas.payment_schemas import (
     PaymentBase,
@@ -87,13 +116,27 @@ __all__ = [
     # Product
     "ProductBase",
     "ProductCreate",
+    "ProductImportRow",
     "ProductUpdate",
+    "ProductBulkChange",
+    "ProductBulkUpdate",
+    "ProductBulkUpdateResponse",
     "ProductStockUpdate",
     "ProductResponse",
     "ProductWithStock",
     "ProductListResponse",
+    "ProductSuggestion",
+    "CategoryFacet",
+    "PriceRangeFacet",
+    "ProductFacets",
+    "ProductBatchResponse",
     "ProductSearchFilters",
+    "ProductImportError",
+    "ProductImportReport",
     "ProductInventoryAdjustment",
+    "ProductInventoryBatchItem",
+    "ProductInventoryBatchAdjustment",
+    "ProductInventoryAdjustmentResult",
     # Order
     "OrderItemBase",
     "OrderItemCreate",
@@ -112,7 +155,16 @@ __all__ = [
     "OrderFilters",
     "OrderStatistics",
     "CheckoutRequest",
+    "StockReservationResponse",
     "CheckoutResponse",
+    # Image
+    "ImageVariant",
+    "ImageResponse",
+    # Upload
+    "UploadCreate",
+    "UploadComplete",
+    "UploadResponse",
+    "DownloadLinkResponse",
     # Payment
     "PaymentBase",
     "PaymentCreate",
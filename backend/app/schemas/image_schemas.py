@@ -0,0 +1,60 @@
+"""
+Schemas Pydantic para el modelo UploadedImage
+
+Define la estructura de datos de las imágenes subidas y sus variantes
+redimensionadas en las respuestas de la API.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+# ============= Image Schemas =============
+
+class ImageVariant(BaseModel):
+    """Variante redimensionada (WebP) de una imagen"""
+    url: str
+    width: int
+    height: int
+
+class ImageResponse(BaseModel):
+    """Schema de respuesta de una imagen subida"""
+    id: int
+    product_id: Optional[int] = None
+    original_filename: str
+    content_type: Optional[str] = None
+    size_bytes: int
+    status: str = Field(description="pending, processing, ready o failed")
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: Dict[str, ImageVariant] = Field(
+        default_factory=dict,
+        description="Variantes disponibles por nombre (vacío hasta que se procese)"
+    )
+    error: Optional[str] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": 42,
+                "product_id": 1,
+                "original_filename": "resma-papel.jpg",
+                "content_type": "image/jpeg",
+                "size_bytes": 3481220,
+                "status": "ready",
+                "width": 4032,
+                "height": 3024,
+                "variants": {
+                    "thumb": {"url": "/media/images/42/thumb.webp", "width": 160, "height": 120},
+                    "card": {"url": "/media/images/42/card.webp", "width": 480, "height": 360},
+                    "large": {"url": "/media/images/42/large.webp", "width": 1200, "height": 900}
+                },
+                "error": None,
+                "created_at": "2024-01-15T10:30:00Z",
+                "processed_at": "2024-01-15T10:30:02Z"
+            }
+        }
+    )
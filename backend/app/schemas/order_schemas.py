@@ -241,6 +241,14 @@ class CheckoutRequest(BaseModel):
         }
     })
 
+class StockReservationResponse(BaseModel):
+    """Reserva temporal de stock de un producto mientras se completa el pago"""
+    product_id: int
+    quantity: int
+    expires_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
 class CheckoutResponse(BaseModel):
     """Schema de respuesta del checkout"""
     order_id: UUID
@@ -6,9 +6,22 @@ de productos en las peticiones y respuestas de la API.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Literal
 from decimal import Decimal
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+
+# Criterios de ordenamiento soportados por el listado de productos
+ProductSortOption = Literal["relevance", "newest", "price_asc", "price_desc"]
+
+# Estrategias para calcular el total de un listado de productos
+ProductCountMode = Literal["exact", "estimated", "none"]
+
+# Facetas que el listado de productos puede calcular junto con la página
+ProductFacetName = Literal["category", "price"]
+
+# Máximos que admiten las columnas price (NUMERIC(10, 2)) y stock_quantity (INTEGER)
+MAX_PRODUCT_PRICE = Decimal("99999999.99")
+MAX_STOCK_QUANTITY = 2_147_483_647
 
 # Schemas Base
 class ProductBase(BaseModel):
@@ -46,6 +59,22 @@ class ProductCreate(ProductBase):
         }
     })
 
+class ProductImportRow(ProductCreate):
+    """Schema de una fila de importación masiva (el SKU identifica el producto)
+
+    Los límites coinciden con los tipos de las columnas: una fila que no cabe
+    se reporta como error de la fila en vez de hacer fallar el lote completo.
+    """
+    sku: str = Field(..., min_length=1, max_length=100, description="SKU único del producto")
+    name: str = Field(..., min_length=1, max_length=255, description="Nombre del producto")
+    price: Decimal = Field(
+        ..., gt=0, le=MAX_PRODUCT_PRICE, decimal_places=2, description="Precio del producto (mayor a 0)"
+    )
+    stock_quantity: int = Field(
+        default=0, ge=0, le=MAX_STOCK_QUANTITY, description="Cantidad en stock (mayor o igual a 0)"
+    )
+    category: str = Field(..., min_length=1, max_length=100, description="Categoría del producto")
+
 # Schemas de Actualización
 class ProductUpdate(BaseModel):
     """Schema para actualizar un producto existente"""
@@ -75,6 +104,52 @@ class ProductUpdate(BaseModel):
         }
     })
 
+# Campos que la base de datos no admite en NULL
+_NON_NULLABLE_UPDATE_FIELDS = ("name", "price", "stock_quantity", "category", "is_active")
+
+class ProductBulkChange(BaseModel):
+    """Cambio de un producto dentro de una actualización masiva (por ID o SKU)"""
+    id: Optional[int] = Field(None, gt=0, description="ID del producto")
+    sku: Optional[str] = Field(None, min_length=1, max_length=100, description="SKU del producto")
+    fields: ProductUpdate = Field(..., description="Campos a modificar")
+    
+    @model_validator(mode='after')
+    def validate_change(self) -> 'ProductBulkChange':
+        """Valida que se identifique el producto de una sola forma y haya campos a cambiar"""
+        if (self.id is None) == (self.sku is None):
+            raise ValueError('Debe indicar exactamente uno de id o sku')
+        if not self.fields.model_fields_set:
+            raise ValueError('Debe indicar al menos un campo a modificar')
+        null_fields = [
+            name for name in _NON_NULLABLE_UPDATE_FIELDS
+            if name in self.fields.model_fields_set and getattr(self.fields, name) is None
+        ]
+        if null_fields:
+            raise ValueError(f"Los campos no pueden ser nulos: {', '.join(null_fields)}")
+        return self
+
+class ProductBulkUpdate(BaseModel):
+    """Schema para actualizar varios productos en una sola transacción"""
+    changes: list[ProductBulkChange] = Field(..., min_length=1, max_length=1000)
+    
+    @field_validator('changes')
+    @classmethod
+    def validate_unique_references(cls, v: list[ProductBulkChange]) -> list[ProductBulkChange]:
+        """Valida que ningún producto se referencie dos veces"""
+        references = [("id", change.id) if change.id is not None else ("sku", change.sku) for change in v]
+        if len(set(references)) != len(references):
+            raise ValueError('Cada producto solo puede aparecer una vez en la actualización')
+        return v
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "changes": [
+                {"id": 1, "fields": {"price": 16500.00}},
+                {"sku": "CUA-100-001", "fields": {"stock_quantity": 200, "is_active": True}}
+            ]
+        }
+    })
+
 class ProductStockUpdate(BaseModel):
     """Schema para actualizar solo el stock"""
     stock_quantity: int = Field(..., ge=0, description="Nueva cantidad en stock")
@@ -93,6 +168,10 @@ class ProductResponse(ProductBase):
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
+    image_variants: Optional[Dict[str, str]] = Field(
+        None,
+        description="URLs de la imagen redimensionada (WebP) por tamaño, ej. thumb, card, large"
+    )
     
     model_config = ConfigDict(
         from_attributes=True,
@@ -112,30 +191,87 @@ class ProductResponse(ProductBase):
         }
     )
 
+class ProductSuggestion(BaseModel):
+    """Sugerencia de autocompletado (solo los datos que muestra el buscador)"""
+    id: int
+    name: str
+    price: Decimal
+    image_url: Optional[str] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
 class ProductWithStock(ProductResponse):
     """Schema de producto con información de disponibilidad"""
     is_in_stock: bool = Field(description="Si el producto tiene stock disponible")
+    available_quantity: int = Field(description="Stock menos las reservas de pedidos en curso")
     
     @classmethod
     def from_product(cls, product):
         """Crea una instancia desde un modelo Product"""
         return cls(
             **product.__dict__,
-            is_in_stock=product.is_in_stock
+            is_in_stock=product.is_in_stock,
+            available_quantity=product.available_quantity
         )
     
     model_config = ConfigDict(from_attributes=True)
 
 # Schemas para listados
+class CategoryFacet(BaseModel):
+    """Número de productos de una categoría"""
+    value: str
+    count: int
+
+class PriceRangeFacet(BaseModel):
+    """Número de productos en un rango de precios [min_price, max_price)"""
+    min_price: Optional[Decimal] = Field(None, description="Límite inferior (None = sin límite)")
+    max_price: Optional[Decimal] = Field(None, description="Límite superior exclusivo (None = sin límite)")
+    count: int
+
+class ProductFacets(BaseModel):
+    """Conteos para los filtros del catálogo (solo las facetas solicitadas)"""
+    category: Optional[list[CategoryFacet]] = None
+    price: Optional[list[PriceRangeFacet]] = None
+
 class ProductListResponse(BaseModel):
     """Schema para listado paginado de productos"""
-    total: int
+    total: Optional[int] = Field(description="Total de resultados (None si se pidió count=none)")
+    total_mode: ProductCountMode = Field(
+        "exact",
+        description="Cómo se obtuvo el total: exact, estimated (estimación del planner) o none"
+    )
     products: list[ProductResponse]
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor para pedir la página siguiente (None si no hay más resultados)"
+    )
+    facets: Optional[ProductFacets] = Field(
+        None,
+        description="Conteos por faceta (solo si se pidieron con el parámetro facets)"
+    )
     
     model_config = ConfigDict(from_attributes=True)
 
+class ProductBulkUpdateResponse(BaseModel):
+    """Resultado de una actualización masiva"""
+    updated: list[ProductResponse]
+    not_found_ids: list[int] = Field(default_factory=list)
+    not_found_skus: list[str] = Field(default_factory=list)
+
+class ProductBatchResponse(BaseModel):
+    """Schema para la consulta de varios productos por ID"""
+    products: list[ProductResponse] = Field(description="Productos encontrados, en el orden solicitado")
+    missing_ids: list[int] = Field(default_factory=list, description="IDs solicitados que no existen")
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "products": [],
+            "missing_ids": [42]
+        }
+    })
+
 class ProductSearchFilters(BaseModel):
     """Schema para filtros de búsqueda de productos"""
     search: Optional[str] = Field(None, description="Búsqueda por nombre o descripción")
@@ -144,6 +280,10 @@ class ProductSearchFilters(BaseModel):
     max_price: Optional[Decimal] = Field(None, ge=0, description="Precio máximo")
     is_active: Optional[bool] = Field(None, description="Filtrar por estado activo")
     in_stock: Optional[bool] = Field(None, description="Solo productos con stock")
+    sort: Optional[ProductSortOption] = Field(
+        None,
+        description="Ordenamiento: relevance (requiere search), newest, price_asc o price_desc"
+    )
     
     model_config = ConfigDict(json_schema_extra={
         "example": {
@@ -152,7 +292,37 @@ class ProductSearchFilters(BaseModel):
             "min_price": 5000.00,
             "max_price": 50000.00,
             "is_active": True,
-            "in_stock": True
+            "in_stock": True,
+            "sort": "relevance"
+        }
+    })
+
+# Schemas para importación masiva
+class ProductImportError(BaseModel):
+    """Error de validación de una fila de importación"""
+    row: int = Field(description="Número de fila de datos (empezando en 1)")
+    sku: Optional[str] = None
+    errors: list[str]
+
+class ProductImportReport(BaseModel):
+    """Resultado de una importación masiva de productos"""
+    total_rows: int = 0
+    created: int = 0
+    updated: int = 0
+    duplicates: int = Field(0, description="Filas con SKU repetido en el mismo lote (gana la última)")
+    failed: int = 0
+    errors: list[ProductImportError] = Field(default_factory=list)
+    errors_truncated: bool = Field(False, description="Si hubo más errores de los reportados")
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "total_rows": 3,
+            "created": 1,
+            "updated": 1,
+            "duplicates": 0,
+            "failed": 1,
+            "errors": [{"row": 3, "sku": "CUA-100-001", "errors": ["price: Input should be greater than 0"]}],
+            "errors_truncated": False
         }
     })
 
@@ -162,9 +332,61 @@ class ProductInventoryAdjustment(BaseModel):
     adjustment: int = Field(..., description="Cantidad a ajustar (positivo para agregar, negativo para quitar)")
     reason: Optional[str] = Field(None, max_length=500, description="Razón del ajuste")
     
+    @field_validator('adjustment')
+    @classmethod
+    def validate_adjustment(cls, v: int) -> int:
+        """Valida que el ajuste modifique el stock"""
+        if v == 0:
+            raise ValueError('El ajuste no puede ser cero')
+        return v
+    
     model_config = ConfigDict(json_schema_extra={
         "example": {
             "adjustment": -5,
             "reason": "Productos dañados"
         }
     })
+
+class ProductInventoryBatchItem(ProductInventoryAdjustment):
+    """Ajuste de inventario de un producto dentro de un lote (por ID o SKU)"""
+    product_id: Optional[int] = Field(None, gt=0, description="ID del producto")
+    sku: Optional[str] = Field(None, min_length=1, max_length=100, description="SKU del producto")
+    
+    @model_validator(mode='after')
+    def validate_reference(self) -> 'ProductInventoryBatchItem':
+        """Valida que el producto se identifique de una sola forma"""
+        if (self.product_id is None) == (self.sku is None):
+            raise ValueError('Debe indicar exactamente uno de product_id o sku')
+        return self
+
+class ProductInventoryBatchAdjustment(BaseModel):
+    """Schema para ajustar el stock de varios productos (ej. recepción de mercancía)"""
+    adjustments: list[ProductInventoryBatchItem] = Field(..., min_length=1, max_length=1000)
+    
+    @field_validator('adjustments')
+    @classmethod
+    def validate_unique_references(cls, v: list[ProductInventoryBatchItem]) -> list[ProductInventoryBatchItem]:
+        """Valida que ningún producto se referencie dos veces"""
+        references = [
+            ("id", item.product_id) if item.product_id is not None else ("sku", item.sku)
+            for item in v
+        ]
+        if len(set(references)) != len(references):
+            raise ValueError('Cada producto solo puede aparecer una vez en el lote')
+        return v
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "adjustments": [
+                {"sku": "CUA-100-001", "adjustment": 120, "reason": "Recepción pedido proveedor"},
+                {"product_id": 7, "adjustment": -2, "reason": "Productos dañados"}
+            ]
+        }
+    })
+
+class ProductInventoryAdjustmentResult(BaseModel):
+    """Resultado de un ajuste de inventario aplicado"""
+    product_id: int
+    sku: str
+    adjustment: int
+    stock_quantity: int = Field(description="Stock resultante después del ajuste")
@@ -0,0 +1,62 @@
+"""
+Schemas Pydantic para el modelo FileUpload
+
+Define la estructura de datos de las subidas por partes (iniciar, completar,
+consultar el offset para reanudar y generar enlaces de descarga) en las
+peticiones y respuestas de la API.
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, ConfigDict
+
+# ============= Upload Schemas =============
+
+class UploadCreate(BaseModel):
+    """Schema para iniciar una subida por partes"""
+    filename: str = Field(..., min_length=1, max_length=255, description="Nombre del archivo")
+    content_type: Optional[str] = Field(None, max_length=100, description="Tipo MIME")
+    size: int = Field(..., gt=0, description="Tamaño total en bytes")
+    checksum_sha256: Optional[str] = Field(
+        None,
+        pattern="^[0-9a-f]{64}$",
+        description="SHA-256 (hex) del archivo completo; si se envía se verifica al completar"
+    )
+    order_id: Optional[UUID] = Field(None, description="Pedido al que se adjunta el archivo")
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "filename": "fotos-boda.pdf",
+            "content_type": "application/pdf",
+            "size": 8388608,
+            "checksum_sha256": None,
+            "order_id": None
+        }
+    })
+
+class UploadComplete(BaseModel):
+    """Schema para completar una subida"""
+    order_id: Optional[UUID] = Field(None, description="Pedido al que se adjunta el archivo")
+
+class UploadResponse(BaseModel):
+    """Schema de respuesta de una subida por partes"""
+    id: UUID
+    filename: str
+    content_type: Optional[str] = None
+    size: int
+    offset: int = Field(description="Bytes recibidos; la siguiente parte debe enviarse desde aquí")
+    chunk_size: int = Field(description="Tamaño máximo de cada parte en bytes")
+    status: str = Field(description="uploading o completed")
+    sha256: Optional[str] = None
+    order_id: Optional[UUID] = None
+    created_at: datetime
+    expires_at: datetime
+    completed_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class DownloadLinkResponse(BaseModel):
+    """Schema de respuesta de un enlace de descarga firmado"""
+    url: str = Field(description="URL de descarga; incluye el token y no requiere autenticación")
+    expires_at: datetime
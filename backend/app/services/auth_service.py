@@ -3,23 +3,72 @@ Servicio de autenticación
 Maneja la lógica de negocio relacionada con autenticación de usuarios
 """
 from datetime import timedelta
-from typing import Optional
+from typing import Iterable, NamedTuple, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.models.users import User
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.models.users import User, UserRole
+from app.core.security import verify_password_async, create_access_token, get_password_hash_async
+from app.core.cache import MISSING, create_cache
 from app.core.config import settings
+from app.core.invalidation import register_invalidation_handler
+
+# Ámbito de las notificaciones de invalidación de usuarios
+USERS_SCOPE = "users"
+
+
+class Principal(NamedTuple):
+    """Usuario autenticado: solo los datos necesarios para autorizar una petición"""
+    id: int
+    email: str
+    role: str
+    is_active: bool
+
+
+# Usuario autenticado por ID (ver AuthService.get_principal)
+principal_cache = create_cache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL
+)
+
+
+def invalidate_users(user_ids: Optional[Iterable] = None) -> None:
+    """
+    Descarta de la caché los usuarios modificados en este worker
+
+    Los demás workers la ejecutan al recibir la notificación publicada con
+    ``publish_invalidation``. Toda escritura futura que modifique un usuario
+    (rol, estado, email) debe publicar en ``USERS_SCOPE`` antes del commit y
+    llamar a esta función después; si no, un cambio como desactivar una
+    cuenta solo se ve cuando vence ``PRINCIPAL_CACHE_TTL`` (30 s por defecto).
+
+    Args:
+        user_ids: IDs de los usuarios modificados (None = todos)
+    """
+    if user_ids is None:
+        principal_cache.clear()
+        return
+    for user_id in user_ids:
+        principal_cache.delete(user_id)
+
+
+register_invalidation_handler(USERS_SCOPE, invalidate_users)
 
 
 class AuthService:
     """Servicio para operaciones de autenticación"""
     
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         """
         Autentica un usuario verificando email y contraseña
         
+        La consulta corre en el threadpool y bcrypt en el pool de hashing,
+        así que el event loop no se bloquea.
+        
         Args:
             db: Sesión de base de datos
             email: Email del usuario
@@ -27,17 +76,65 @@ class AuthService:
             
         Returns:
             User si las credenciales son válidas, None en caso contrario
+            
+        Raises:
+            HTTPException 429 si el pool de hashing está saturado
         """
-        user = db.query(User).filter(User.email == email).first()
+        user = await run_in_threadpool(AuthService.get_user_by_email, db, email)
         
         if not user:
             return None
             
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
             
         return user
     
+    @staticmethod
+    def get_principal(db: Session, user_id: int) -> Optional[Principal]:
+        """
+        Obtiene el usuario autenticado por su ID, desde la caché si es posible
+        
+        Solo se consultan (y guardan) id, email, rol y estado. Las escrituras
+        que publican en el scope "users" invalidan la entrada en todos los
+        workers; ``PRINCIPAL_CACHE_TTL`` acota lo que tarda en verse un cambio
+        hecho directamente en la base de datos.
+        
+        Args:
+            db: Sesión de base de datos
+            user_id: ID del usuario
+            
+        Returns:
+            Principal si el usuario existe, None en caso contrario
+        """
+        principal = principal_cache.get(user_id)
+        if principal is not MISSING:
+            return principal
+        return AuthService.load_principal(db, user_id)
+    
+    @staticmethod
+    def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+        """
+        Consulta el usuario autenticado en la base de datos y lo guarda en la caché
+        
+        Args:
+            db: Sesión de base de datos
+            user_id: ID del usuario
+            
+        Returns:
+            Principal si el usuario existe, None en caso contrario
+        """
+        generation = principal_cache.generation
+        row = db.execute(
+            select(User.id, User.email, User.role, User.is_active).where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        
+        principal = Principal(*row)
+        principal_cache.set(user_id, principal, generation=generation)
+        return principal
+    
     @staticmethod
     def create_user_token(user: User) -> str:
         """
@@ -96,10 +193,13 @@ class AuthService:
         return db.query(User).filter(User.id == user_id).first()
     
     @staticmethod
-    def create_user(db: Session, email: str, full_name: str, password: str, role=None) -> User:
+    async def create_user(db: Session, email: str, full_name: str, password: str, role=None) -> User:
         """
         Crea un nuevo usuario
         
+        El hash de la contraseña se calcula en el pool de hashing y las
+        operaciones de base de datos en el threadpool.
+        
         Args:
             db: Sesión de base de datos
             email: Email del usuario
@@ -111,24 +211,28 @@ class AuthService:
             Usuario creado
             
         Raises:
-            HTTPException si el email ya existe
+            HTTPException si el email ya existe, 429 si el pool de hashing está saturado
         """
         # Verificar si el email ya existe
-        if AuthService.get_user_by_email(db, email):
+        if await run_in_threadpool(AuthService.get_user_by_email, db, email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El email ya está registrado"
             )
         
         # Crear el usuario
-        from app.models.users import UserRole
         user = User(
             email=email,
             full_name=full_name,
-            password_hash=get_password_hash(password),
+            password_hash=await get_password_hash_async(password),
             role=role or UserRole.CUSTOMER
         )
         
+        return await run_in_threadpool(AuthService._save_new_user, db, user)
+    
+    @staticmethod
+    def _save_new_user(db: Session, user: User) -> User:
+        """Guarda un usuario nuevo (un ID nuevo no tiene entradas en caché que invalidar)."""
         db.add(user)
         db.commit()
         db.refresh(user)
@@ -0,0 +1,142 @@
+"""
+Servicio de blobs
+Lleva el conteo de referencias del almacenamiento por contenido (ver
+``app.core.blob_store``): cada fila de ``uploaded_images`` o ``file_uploads``
+con ``sha256`` es una referencia a su blob.
+
+- ``add_reference`` registra el blob la primera vez que se ve su contenido o
+  incrementa su contador; corre en la transacción que crea la referencia.
+- ``release_references`` decrementa los contadores de las filas eliminadas y
+  marca ``released_at`` cuando llegan a cero.
+- ``collect_garbage`` elimina los blobs sin referencias tras
+  ``BLOB_GC_GRACE_PERIOD`` segundos, borrando sus archivos antes del commit
+  mientras la fila sigue bloqueada: una subida concurrente del mismo
+  contenido espera el commit y vuelve a publicar su copia.
+"""
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import blob_store
+from app.models.blobs import Blob
+
+_ADD_REFERENCE_SQL = """
+    INSERT INTO blobs (sha256, size, ref_count)
+    VALUES (:sha256, :size, 1)
+    ON CONFLICT (sha256) DO UPDATE
+    SET ref_count = blobs.ref_count + 1, released_at = NULL
+"""
+
+# Las filas se bloquean en orden de hash para que liberaciones concurrentes no se bloqueen mutuamente
+_RELEASE_REFERENCES_SQL = """
+    WITH released AS (
+        SELECT sha256, count(*) AS n
+        FROM unnest(CAST(:hashes AS text[])) AS sha256
+        GROUP BY sha256
+    ),
+    locked AS MATERIALIZED (
+        SELECT sha256 FROM blobs
+        WHERE sha256 IN (SELECT sha256 FROM released)
+        ORDER BY sha256
+        FOR UPDATE
+    )
+    UPDATE blobs
+    SET ref_count = blobs.ref_count - released.n,
+        released_at = CASE
+            WHEN blobs.ref_count - released.n = 0 THEN now()
+            ELSE blobs.released_at
+        END
+    FROM released, locked
+    WHERE blobs.sha256 = released.sha256 AND locked.sha256 = blobs.sha256
+"""
+
+# Los NOT EXISTS protegen los archivos aunque un contador haya quedado desfasado
+_COLLECT_GARBAGE_SQL = """
+    DELETE FROM blobs
+    WHERE sha256 IN (
+        SELECT sha256 FROM blobs
+        WHERE ref_count = 0
+          AND released_at < now() - make_interval(secs => :grace_period)
+        ORDER BY released_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    AND NOT EXISTS (SELECT 1 FROM uploaded_images WHERE uploaded_images.sha256 = blobs.sha256)
+    AND NOT EXISTS (SELECT 1 FROM file_uploads WHERE file_uploads.sha256 = blobs.sha256)
+    RETURNING sha256
+"""
+
+
+class BlobService:
+    """Servicio para el conteo de referencias de los blobs"""
+
+    @staticmethod
+    def add_reference(db: Session, sha256: str, size: int) -> None:
+        """
+        Registra una referencia a un blob (lo crea si es nuevo).
+
+        No hace commit: la referencia se confirma junto con la fila que la usa.
+
+        Args:
+            db: Sesión de base de datos.
+            sha256: Hash del contenido.
+            size: Tamaño del contenido en bytes.
+        """
+        db.execute(text(_ADD_REFERENCE_SQL), {"sha256": sha256, "size": size})
+
+    @staticmethod
+    def release_references(db: Session, hashes: List[str]) -> None:
+        """
+        Libera una referencia por cada hash (los repetidos cuentan varias veces).
+
+        No hace commit: se confirma junto con la eliminación de las filas.
+
+        Args:
+            db: Sesión de base de datos.
+            hashes: Hashes de las filas eliminadas.
+        """
+        if hashes:
+            db.execute(text(_RELEASE_REFERENCES_SQL), {"hashes": hashes})
+
+    @staticmethod
+    def get_stored(db: Session, sha256: str) -> Optional[Blob]:
+        """
+        Obtiene un blob referenciado cuyo archivo está en disco.
+
+        La fila queda bloqueada hasta el commit, así que el recolector de
+        basura no puede eliminarla antes de que se registre la nueva referencia.
+
+        Args:
+            db: Sesión de base de datos.
+            sha256: Hash del contenido.
+
+        Returns:
+            El blob si ya está almacenado, de lo contrario None.
+        """
+        blob = db.get(Blob, sha256, with_for_update=True)
+        if blob is None or blob.ref_count == 0 or not blob_store.exists(sha256):
+            return None
+        return blob
+
+    @staticmethod
+    def collect_garbage(db: Session, grace_period: int, batch_size: int) -> int:
+        """
+        Elimina un lote de blobs sin referencias con sus archivos.
+
+        Args:
+            db: Sesión de base de datos.
+            grace_period: Segundos que se conserva un blob después de quedar sin referencias.
+            batch_size: Máximo de blobs a eliminar en esta transacción.
+
+        Returns:
+            Número de blobs eliminados.
+        """
+        hashes = db.execute(text(_COLLECT_GARBAGE_SQL), {
+            "grace_period": grace_period,
+            "batch_size": batch_size,
+        }).scalars().all()
+        for sha256 in hashes:
+            blob_store.remove_blob(sha256)
+        db.commit()
+        return len(hashes)
@@ -0,0 +1,151 @@
+"""
+Cachés del catálogo de productos
+Centraliza las cachés en memoria del catálogo y su invalidación tras escrituras.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.core.invalidation import register_invalidation_handler
+
+# Ámbito de las notificaciones de invalidación del catálogo
+CATALOG_SCOPE = "catalog"
+
+# Detalle de producto por ID (ProductResponse ya validado)
+product_cache = create_cache(
+    "products",
+    maxsize=settings.PRODUCT_CACHE_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL
+)
+
+# Páginas de listado ya serializadas a JSON (bytes)
+product_list_cache = create_cache(
+    "product_lists",
+    maxsize=settings.PRODUCT_LIST_CACHE_SIZE,
+    ttl=settings.PRODUCT_LIST_CACHE_TTL
+)
+
+# Conteos exactos por combinación normalizada de filtros
+product_count_cache = create_cache(
+    "product_counts",
+    maxsize=settings.PRODUCT_COUNT_CACHE_SIZE,
+    ttl=settings.PRODUCT_COUNT_CACHE_TTL
+)
+
+# Facetas (y total exacto) por combinación normalizada de filtros
+product_facet_cache = create_cache(
+    "product_facets",
+    maxsize=settings.PRODUCT_FACET_CACHE_SIZE,
+    ttl=settings.PRODUCT_FACET_CACHE_TTL
+)
+
+# Sugerencias de autocompletado por texto normalizado
+product_suggest_cache = create_cache(
+    "product_suggestions",
+    maxsize=settings.PRODUCT_SUGGEST_CACHE_SIZE,
+    ttl=settings.PRODUCT_SUGGEST_CACHE_TTL
+)
+
+
+class CatalogSnapshots:
+    """
+    Primeras páginas de cada categoría ya serializadas (ETag y JSON en bytes)
+
+    Las construye ``CatalogSnapshotBuilder`` en segundo plano y se reemplazan
+    en bloque; una invalidación las descarta y pide reconstruirlas.
+    """
+
+    def __init__(self):
+        self._pages: Dict[Tuple[str, int, int], Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.built_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        # Se activa cuando hay que reconstruir (al iniciar y tras cada escritura)
+        self.rebuild_requested = threading.Event()
+        self.rebuild_requested.set()
+
+    def get(self, category: str, page: int, page_size: int) -> Optional[Tuple[str, bytes]]:
+        """Obtiene el ETag y el cuerpo de una página, o None si no hay snapshot."""
+        entry = self._pages.get((category, page, page_size))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def replace(self, pages: Dict[Tuple[str, int, int], Tuple[str, bytes]], generation: int) -> bool:
+        """
+        Publica un conjunto completo de snapshots
+
+        Se descarta si hubo una invalidación desde ``generation`` (leída antes
+        de consultar la base de datos).
+
+        Returns:
+            True si se publicaron.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._pages = pages
+            self.built_at = time.time()
+            return True
+
+    def clear(self) -> None:
+        """Descarta los snapshots y pide reconstruirlos."""
+        with self._lock:
+            self.generation += 1
+            self._pages = {}
+            self.built_at = None
+        self.rebuild_requested.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna las métricas de uso de los snapshots."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": "catalog_snapshots",
+                "pages": len(self._pages),
+                "bytes": sum(len(body) for _, body in self._pages.values()),
+                "built_at": self.built_at,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Snapshots por categoría para GET /products?category=... sin otros filtros
+catalog_snapshots = CatalogSnapshots()
+
+
+def invalidate_catalog(product_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Invalida las cachés del catálogo después de crear, editar o eliminar productos
+
+    Cualquier escritura puede cambiar cualquier listado o conteo, así que esas
+    cachés (y los snapshots por categoría, que se reconstruyen en segundo
+    plano) se vacían completas; del detalle solo se eliminan los productos
+    afectados (o todos si no se indican). Los demás workers la ejecutan al
+    recibir la notificación publicada con ``publish_invalidation``.
+
+    Args:
+        product_ids: IDs de los productos modificados (None = todos)
+    """
+    product_list_cache.clear()
+    product_count_cache.clear()
+    product_facet_cache.clear()
+    product_suggest_cache.clear()
+    catalog_snapshots.clear()
+
+    if product_ids is None:
+        product_cache.clear()
+        return
+    for product_id in product_ids:
+        product_cache.delete(product_id)
+
+
+register_invalidation_handler(CATALOG_SCOPE, invalidate_catalog)
@@ -0,0 +1,160 @@
+"""
+Servicio de snapshots del catálogo
+Construye en segundo plano las primeras páginas de cada categoría ya
+serializadas a JSON, para que ``GET /products?category=...`` sin otros filtros
+se responda desde memoria, sin consultar la base de datos ni validar schemas.
+
+Los snapshots se generan con el mismo código que el listado
+(``ProductService.get_products`` + ``serialize_product_list``), así que el
+cuerpo y el ETag son idénticos a los del camino normal. Tras cada escritura
+``invalidate_catalog`` los descarta y este hilo los reconstruye.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from app.core.serialization import serialize_product_list
+from app.database import SessionLocal
+from app.models.products import Product
+from app.schemas.product_schemas import ProductSearchFilters
+from app.services.catalog_cache import catalog_snapshots
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshotBuilder:
+    """Reconstruye los snapshots por categoría en un hilo de fondo del worker"""
+
+    def __init__(
+        self,
+        pages: int,
+        page_sizes: List[int],
+        max_categories: int,
+        debounce: float,
+        refresh_interval: float
+    ):
+        self.pages = pages
+        self.page_sizes = page_sizes
+        self.max_categories = max_categories
+        self.debounce = debounce
+        self.refresh_interval = refresh_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de construcción si está habilitado y no está corriendo."""
+        if not settings.CATALOG_SNAPSHOTS_ENABLED:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="catalog-snapshot-builder",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de construcción."""
+        self._stop_event.set()
+        # Despierta al hilo si está esperando una invalidación
+        catalog_snapshots.rebuild_requested.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def build(self) -> int:
+        """
+        Construye y publica los snapshots de todas las categorías.
+
+        Si hubo una escritura mientras se construían, se descartan (la
+        invalidación ya pidió una nueva reconstrucción).
+
+        Returns:
+            Número de páginas publicadas.
+        """
+        generation = catalog_snapshots.generation
+        db = SessionLocal()
+        try:
+            pages = self._render_pages(db)
+        finally:
+            db.close()
+
+        if not catalog_snapshots.replace(pages, generation):
+            return 0
+        logger.info("Snapshots del catálogo construidos: %s páginas", len(pages))
+        return len(pages)
+
+    def _render_pages(self, db: Session) -> Dict[Tuple[str, int, int], Tuple[str, bytes]]:
+        """
+        Serializa las primeras páginas de cada categoría.
+
+        Args:
+            db: Sesión de base de datos.
+
+        Returns:
+            ETag y cuerpo por (categoría, página, tamaño de página).
+        """
+        categories = db.scalars(
+            select(Product.category)
+            .where(Product.category.isnot(None), Product.category != "")
+            .distinct()
+            .order_by(Product.category)
+            .limit(self.max_categories)
+        ).all()
+
+        pages = {}
+        for category in categories:
+            filters = ProductSearchFilters(category=category)
+            for page_size in self.page_sizes:
+                for page in range(1, self.pages + 1):
+                    result = ProductService.get_products(
+                        db,
+                        filters=filters,
+                        skip=(page - 1) * page_size,
+                        limit=page_size
+                    )
+                    body = serialize_product_list(
+                        result.products,
+                        total=result.total,
+                        total_mode=result.total_mode,
+                        page=page,
+                        page_size=page_size,
+                        next_cursor=result.next_cursor,
+                        facets=result.facets
+                    )
+                    pages[(category, page, page_size)] = (make_etag(body), body)
+                    if result.next_cursor is None:
+                        break
+        return pages
+
+    def _run(self) -> None:
+        """Reconstruye al recibir invalidaciones o cada ``refresh_interval`` segundos."""
+        while not self._stop_event.is_set():
+            catalog_snapshots.rebuild_requested.wait(self.refresh_interval)
+            # Agrupa ráfagas de escrituras en una sola reconstrucción
+            if self._stop_event.wait(self.debounce):
+                break
+            catalog_snapshots.rebuild_requested.clear()
+            try:
+                self.build()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Cualquier error terminaría el hilo y los snapshots dejarían de renovarse
+                logger.exception("Error construyendo los snapshots del catálogo ⚠️")
+
+
+# Constructor global del worker (se inicia en el lifespan de la aplicación)
+catalog_snapshot_builder = CatalogSnapshotBuilder(
+    pages=settings.CATALOG_SNAPSHOT_PAGES,
+    page_sizes=settings.CATALOG_SNAPSHOT_PAGE_SIZES,
+    max_categories=settings.CATALOG_SNAPSHOT_MAX_CATEGORIES,
+    debounce=settings.CATALOG_SNAPSHOT_DEBOUNCE,
+    refresh_interval=settings.CATALOG_SNAPSHOT_REFRESH_INTERVAL
+)
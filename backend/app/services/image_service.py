@@ -0,0 +1,499 @@
+"""
+Servicio de imágenes
+Recibe las imágenes subidas (fotos de productos y de clientes) y genera sus
+variantes redimensionadas en segundo plano.
+
+- El original se escribe en disco por bloques, validando extensión y tamaño
+  sin cargar el archivo completo en memoria, y se guarda en el almacenamiento
+  por contenido (``app.core.blob_store``). Si ya hay una imagen lista con el
+  mismo contenido, la nueva reutiliza sus variantes y queda ``ready`` sin
+  volver a procesarse; si no, queda en estado ``pending``.
+- ``ImageProcessor`` toma lotes de imágenes pendientes (``FOR UPDATE SKIP
+  LOCKED``), genera las variantes WebP en un pool de procesos (el trabajo de
+  CPU no corre en los hilos que atienden peticiones) y registra sus URLs. Si
+  la imagen es de un producto, actualiza ``image_url`` e ``image_variants``.
+
+El estado vive en la base de datos, así que el procesamiento se reanuda tras
+un reinicio: las imágenes que quedaron en "processing" por un worker caído se
+retoman después de ``IMAGE_PROCESS_STALE_AFTER`` segundos. Las imágenes sin
+producto se eliminan después de ``BLOB_ORPHAN_TTL`` segundos (ver
+``UploadSweeper``).
+"""
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import bindparam, case, select, text, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core import blob_store, image_processing
+from app.core.config import settings
+from app.core.invalidation import publish_invalidation
+from app.database import SessionLocal
+from app.models.images import ImageStatus, UploadedImage
+from app.models.products import Product
+from app.services.blob_service import BlobService
+from app.services.catalog_cache import CATALOG_SCOPE, invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+# Subdirectorio de UPLOAD_DIR publicado en MEDIA_URL
+MEDIA_DIR = "media"
+
+# Toma un lote de imágenes pendientes (o abandonadas por un worker caído)
+_CLAIM_SQL = """
+    UPDATE uploaded_images
+    SET status = 'processing', attempts = attempts + 1, claimed_at = now()
+    WHERE id IN (
+        SELECT id FROM uploaded_images
+        WHERE status = 'pending'
+           OR (status = 'processing' AND claimed_at < now() - make_interval(secs => :stale_after))
+        ORDER BY id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, sha256, storage_path, product_id
+"""
+
+# Elimina un lote de imágenes que no pertenecen a ningún producto
+_DELETE_ORPHANS_SQL = """
+    DELETE FROM uploaded_images
+    WHERE id IN (
+        SELECT id FROM uploaded_images
+        WHERE product_id IS NULL
+          AND status IN ('ready', 'failed')
+          AND created_at < now() - make_interval(secs => :orphan_ttl)
+        ORDER BY created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, sha256, storage_path
+"""
+
+
+def media_root() -> str:
+    """Directorio servido públicamente en ``MEDIA_URL``."""
+    return os.path.join(settings.UPLOAD_DIR, MEDIA_DIR)
+
+
+class ImageService:
+    """Servicio para imágenes subidas"""
+
+    @staticmethod
+    def save_upload(
+        db: Session,
+        file: UploadFile,
+        uploaded_by: Optional[int],
+        product_id: Optional[int] = None
+    ) -> UploadedImage:
+        """
+        Guarda el original de una imagen y la deja pendiente de procesar.
+
+        Si otra imagen con el mismo contenido ya tiene variantes, se reutilizan
+        y la imagen queda lista de inmediato.
+
+        Args:
+            db: Sesión de base de datos.
+            file: Archivo recibido.
+            uploaded_by: ID del usuario que sube la imagen.
+            product_id: Producto al que pertenece la imagen (opcional).
+
+        Returns:
+            La imagen registrada (estado ``pending`` o ``ready``).
+
+        Raises:
+            HTTPException 400 si la extensión no está permitida o el archivo
+            está vacío, 413 si supera ``MAX_UPLOAD_SIZE``.
+        """
+        extension = os.path.splitext(file.filename or "")[1].lower().lstrip(".")
+        if extension not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Extensión no permitida. Use: {', '.join(settings.ALLOWED_EXTENSIONS)}"
+            )
+
+        writer = blob_store.BlobWriter(max_size=settings.MAX_UPLOAD_SIZE)
+        try:
+            writer.copy_from(file.file)
+        except blob_store.BlobTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"El archivo supera el tamaño máximo de {settings.MAX_UPLOAD_SIZE} bytes"
+            ) from e
+        if writer.size == 0:
+            writer.discard()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El archivo está vacío"
+            )
+
+        try:
+            # Mismo contenido ya procesado: se reutilizan sus variantes
+            processed = db.execute(
+                select(UploadedImage.width, UploadedImage.height, UploadedImage.variants)
+                .where(UploadedImage.sha256 == writer.sha256, UploadedImage.status == ImageStatus.READY)
+                .limit(1)
+            ).first()
+
+            BlobService.add_reference(db, writer.sha256, writer.size)
+            image = UploadedImage(
+                product_id=product_id,
+                uploaded_by=uploaded_by,
+                original_filename=(file.filename or writer.sha256)[:255],
+                sha256=writer.sha256,
+                storage_path=blob_store.relative_blob_path(writer.sha256),
+                content_type=file.content_type,
+                size_bytes=writer.size
+            )
+            product = None
+            if processed is not None:
+                image.status = ImageStatus.READY
+                image.width = processed.width
+                image.height = processed.height
+                image.variants = processed.variants
+                image.processed_at = datetime.now(timezone.utc)
+                product = ImageService._product_values(product_id, processed.variants, image.processed_at)
+            db.add(image)
+            if product is not None:
+                db.execute(update(Product), [product])
+                publish_invalidation(db, CATALOG_SCOPE, [product_id])
+            db.commit()
+        except BaseException:
+            db.rollback()
+            writer.discard()
+            raise
+        db.refresh(image)
+        writer.place()
+
+        if product is not None:
+            invalidate_catalog([product_id])
+        if image.status == ImageStatus.PENDING:
+            image_processor.wake()
+        logger.info(
+            "Imagen %s subida (%s bytes%s) 📷",
+            image.id, writer.size, ", variantes reutilizadas" if processed is not None else ""
+        )
+        return image
+
+    @staticmethod
+    def get_image(db: Session, image_id: int) -> Optional[UploadedImage]:
+        """
+        Obtiene una imagen por su ID.
+
+        Args:
+            db: Sesión de base de datos.
+            image_id: ID de la imagen.
+
+        Returns:
+            La imagen si se encuentra, de lo contrario None.
+        """
+        return db.get(UploadedImage, image_id)
+
+    @staticmethod
+    def claim_batch(db: Session, batch_size: int) -> List[Row]:
+        """
+        Marca como "processing" un lote de imágenes pendientes y lo retorna.
+
+        Con ``SKIP LOCKED`` varios workers pueden tomar lotes a la vez sin
+        repetir imágenes.
+
+        Args:
+            db: Sesión de base de datos.
+            batch_size: Máximo de imágenes del lote.
+
+        Returns:
+            Filas con ``id``, ``sha256``, ``storage_path`` y ``product_id``.
+        """
+        rows = db.execute(text(_CLAIM_SQL), {
+            "batch_size": batch_size,
+            "stale_after": settings.IMAGE_PROCESS_STALE_AFTER,
+        }).all()
+        db.commit()
+        return rows
+
+    @staticmethod
+    def complete_batch(
+        db: Session,
+        results: List[Tuple[Row, Dict[str, Any]]],
+        failures: List[Tuple[int, str]]
+    ) -> None:
+        """
+        Registra el resultado de un lote en una sola transacción.
+
+        Las imágenes listas guardan sus variantes (y las de producto
+        actualizan el producto); las fallidas vuelven a "pending" hasta
+        agotar ``IMAGE_PROCESS_MAX_ATTEMPTS`` intentos.
+
+        Args:
+            db: Sesión de base de datos.
+            results: Fila reclamada y resultado de ``render_variants`` por imagen.
+            failures: ID de la imagen y mensaje de error por imagen fallida.
+        """
+        now = datetime.now(timezone.utc)
+        images = []
+        products = []
+        for row, rendered in results:
+            variants = {
+                name: {
+                    "url": ImageService.variant_url(row.id, row.sha256, variant["file"]),
+                    "width": variant["width"],
+                    "height": variant["height"],
+                }
+                for name, variant in rendered["variants"].items()
+            }
+            images.append({
+                "id": row.id,
+                "status": ImageStatus.READY,
+                "width": rendered["width"],
+                "height": rendered["height"],
+                "variants": variants,
+                "error": None,
+                "processed_at": now,
+            })
+            product = ImageService._product_values(row.product_id, variants, now)
+            if product is not None:
+                products.append(product)
+
+        if images:
+            db.execute(update(UploadedImage), images)
+        if products:
+            db.execute(update(Product), products)
+            publish_invalidation(db, CATALOG_SCOPE, [product["id"] for product in products])
+
+        if failures:
+            table = UploadedImage.__table__
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("image_id"))
+                .values(
+                    status=case(
+                        (table.c.attempts >= settings.IMAGE_PROCESS_MAX_ATTEMPTS, ImageStatus.FAILED),
+                        else_=ImageStatus.PENDING
+                    ),
+                    error=bindparam("message"),
+                    claimed_at=None
+                ),
+                [{"image_id": image_id, "message": message} for image_id, message in failures]
+            )
+        db.commit()
+
+        if products:
+            invalidate_catalog([product["id"] for product in products])
+
+    @staticmethod
+    def retry_failed(db: Session) -> int:
+        """
+        Vuelve a encolar las imágenes fallidas (ej. después de corregir la causa del error).
+
+        Args:
+            db: Sesión de base de datos.
+
+        Returns:
+            Número de imágenes encoladas.
+        """
+        result = db.execute(
+            update(UploadedImage)
+            .where(UploadedImage.status == ImageStatus.FAILED)
+            .values(status=ImageStatus.PENDING, attempts=0, error=None)
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def delete_orphans(db: Session, orphan_ttl: int, batch_size: int) -> int:
+        """
+        Elimina un lote de imágenes sin producto más antiguas que ``orphan_ttl``.
+
+        Cada imagen libera su referencia al blob; el original y las variantes
+        se borran cuando el recolector de basura elimina el blob. Las imágenes
+        anteriores al almacenamiento por contenido se borran de inmediato.
+
+        Args:
+            db: Sesión de base de datos.
+            orphan_ttl: Segundos que se conserva una imagen sin producto.
+            batch_size: Máximo de imágenes a eliminar en esta transacción.
+
+        Returns:
+            Número de imágenes eliminadas.
+        """
+        rows = db.execute(text(_DELETE_ORPHANS_SQL), {
+            "orphan_ttl": orphan_ttl,
+            "batch_size": batch_size,
+        }).all()
+        BlobService.release_references(db, [row.sha256 for row in rows if row.sha256 is not None])
+        db.commit()
+
+        for row in rows:
+            if row.sha256 is None:
+                blob_store.discard(os.path.join(settings.UPLOAD_DIR, row.storage_path))
+                shutil.rmtree(ImageService.variant_dir(row.id, None), ignore_errors=True)
+        return len(rows)
+
+    @staticmethod
+    def variant_url(image_id: int, sha256: Optional[str], filename: str) -> str:
+        """URL pública de una variante."""
+        return f"{settings.MEDIA_URL}/images/{ImageService._variant_key(image_id, sha256)}/{filename}"
+
+    @staticmethod
+    def variant_dir(image_id: int, sha256: Optional[str]) -> str:
+        """Directorio donde se escriben las variantes de una imagen."""
+        if sha256 is None:
+            return os.path.join(media_root(), "images", str(image_id))
+        return blob_store.derived_dir(sha256)
+
+    @staticmethod
+    def _variant_key(image_id: int, sha256: Optional[str]) -> str:
+        """Subruta de las variantes: por contenido, o por ID en imágenes anteriores a los blobs."""
+        return str(image_id) if sha256 is None else f"{sha256[:2]}/{sha256}"
+
+    @staticmethod
+    def _product_values(
+        product_id: Optional[int],
+        variants: Dict[str, Any],
+        now: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Valores a actualizar en el producto de una imagen lista (None si no aplica)."""
+        if product_id is None or not variants:
+            return None
+        largest = max(variants.values(), key=lambda variant: variant["width"])
+        return {
+            "id": product_id,
+            "image_url": largest["url"],
+            "image_variants": {name: variant["url"] for name, variant in variants.items()},
+            "updated_at": now,
+        }
+
+
+class ImageProcessor:
+    """Procesa las imágenes pendientes por lotes en un pool de procesos"""
+
+    def __init__(self, interval: float, batch_size: int, workers: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.workers = workers
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de procesamiento si está habilitado y no está corriendo."""
+        if not settings.IMAGE_PROCESSOR_ENABLED:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="image-processor",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de procesamiento y el pool de procesos."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def wake(self) -> None:
+        """Pide procesar las imágenes pendientes sin esperar el siguiente intervalo."""
+        self._wake_event.set()
+
+    def process_pending(self) -> int:
+        """
+        Procesa todas las imágenes pendientes, en lotes de ``batch_size``.
+
+        Returns:
+            Número de imágenes procesadas (listas o fallidas).
+        """
+        total = 0
+        db = SessionLocal()
+        try:
+            while not self._stop_event.is_set():
+                batch = ImageService.claim_batch(db, self.batch_size)
+                if batch:
+                    self._process_batch(db, batch)
+                    total += len(batch)
+                if len(batch) < self.batch_size:
+                    break
+        finally:
+            db.close()
+        if total:
+            logger.info("Imágenes procesadas: %s", total)
+        return total
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos la primera vez que se necesita."""
+        if self._pool is None:
+            # spawn: no se heredan los hilos ni las conexiones del worker
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _process_batch(self, db: Session, batch: List[Row]) -> None:
+        """Genera las variantes de un lote en el pool y registra los resultados."""
+        pool = self._get_pool()
+        futures = [
+            (row, pool.submit(
+                image_processing.render_variants,
+                os.path.join(settings.UPLOAD_DIR, row.storage_path),
+                ImageService.variant_dir(row.id, row.sha256),
+                settings.IMAGE_VARIANT_WIDTHS,
+                settings.IMAGE_WEBP_QUALITY
+            ))
+            for row in batch
+        ]
+
+        results = []
+        failures = []
+        for row, future in futures:
+            try:
+                results.append((row, future.result()))
+            except BrokenProcessPool as e:
+                # Un proceso murió (ej. sin memoria): se recrea el pool en el siguiente lote.
+                # El pool roto se cierra para liberar sus procesos y su hilo de gestión
+                if self._pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                failures.append((row.id, f"Pool de procesos interrumpido: {e}"))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Archivo corrupto o formato no soportado por Pillow
+                logger.warning("Error procesando la imagen %s ⚠️: %s", row.id, e)
+                failures.append((row.id, str(e)[:500]))
+
+        ImageService.complete_batch(db, results, failures)
+
+    def _run(self) -> None:
+        """Procesa al recibir subidas o cada ``interval`` segundos hasta que se detenga."""
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
+            try:
+                self.process_pending()
+            except SQLAlchemyError as e:
+                logger.warning("Error procesando imágenes pendientes ⚠️: %s", e)
+            self._wake_event.wait(self.interval)
+
+
+# Procesador global del worker (se inicia en el lifespan de la aplicación)
+image_processor = ImageProcessor(
+    interval=settings.IMAGE_PROCESS_INTERVAL,
+    batch_size=settings.IMAGE_PROCESS_BATCH,
+    workers=settings.IMAGE_PROCESS_WORKERS
+)
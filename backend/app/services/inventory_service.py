@@ -0,0 +1,235 @@
+"""
+Servicio de inventario
+Ajusta el stock de forma atómica y registra cada ajuste en el libro
+``inventory_movements``. El ajuste se hace con un único UPDATE condicional
+(``stock_quantity = stock_quantity + delta``), sin leer y reescribir el valor,
+por lo que ajustes concurrentes no se pierden y el stock nunca queda por
+debajo de lo reservado por pedidos en curso.
+"""
+import logging
+from collections import Counter
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, String, cast, column, func, insert, or_, select, update, values
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import publish_invalidation
+from app.models.inventory import InventoryMovement
+from app.models.products import Product
+from app.schemas.product_schemas import (
+    ProductInventoryAdjustment,
+    ProductInventoryAdjustmentResult,
+    ProductInventoryBatchItem
+)
+from app.services.catalog_cache import CATALOG_SCOPE, invalidate_catalog
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryService:
+    """Servicio para ajustes de inventario"""
+
+    @staticmethod
+    def adjust_stock(
+        db: Session,
+        product_id: int,
+        adjustment: ProductInventoryAdjustment,
+        actor_id: Optional[int]
+    ) -> ProductInventoryAdjustmentResult:
+        """
+        Ajusta el stock de un producto.
+
+        Args:
+            db: Sesión de base de datos.
+            product_id: ID del producto.
+            adjustment: Cantidad a sumar (o restar) y razón.
+            actor_id: ID del usuario que hace el ajuste.
+
+        Returns:
+            El ajuste aplicado con el stock resultante.
+
+        Raises:
+            HTTPException 404 si el producto no existe, 409 si el stock quedaría
+            negativo o por debajo de lo reservado.
+        """
+        item = ProductInventoryBatchItem(
+            product_id=product_id,
+            adjustment=adjustment.adjustment,
+            reason=adjustment.reason
+        )
+        return InventoryService.adjust_stock_batch(db, [item], actor_id)[0]
+
+    @staticmethod
+    def adjust_stock_batch(
+        db: Session,
+        items: List[ProductInventoryBatchItem],
+        actor_id: Optional[int]
+    ) -> List[ProductInventoryAdjustmentResult]:
+        """
+        Ajusta el stock de varios productos en una sola sentencia.
+
+        Un ``UPDATE ... FROM (VALUES ...)`` aplica todos los ajustes cuyo
+        resultado no sea menor que el stock reservado y, en la misma sentencia
+        (CTE), inserta los movimientos en el libro de inventario. El lote es
+        todo o nada: si algún ajuste no se puede aplicar se hace rollback y no
+        se modifica nada.
+
+        Args:
+            db: Sesión de base de datos.
+            items: Ajustes identificados por ID o SKU (sin repetir productos).
+            actor_id: ID del usuario que hace el ajuste.
+
+        Returns:
+            Los ajustes aplicados, en el orden recibido.
+
+        Raises:
+            HTTPException 404 si algún producto no existe, 409 si algún stock
+            quedaría negativo o por debajo de lo reservado, o si dos ajustes
+            referencian el mismo producto (uno por ID y otro por SKU).
+        """
+        table = Product.__table__
+
+        # Los SKU se resuelven a IDs (bloqueando las filas) para que un mismo
+        # producto referenciado por ID y por SKU no se confunda con falta de stock
+        ids_by_sku = ProductService.lock_ids_by_sku(
+            db, [item.sku for item in items if item.sku is not None]
+        )
+        missing_skus = [
+            item.sku for item in items if item.sku is not None and item.sku not in ids_by_sku
+        ]
+        if missing_skus:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"message": "Producto no encontrado", "products": missing_skus}
+            )
+        target_ids = [
+            item.product_id if item.product_id is not None else ids_by_sku[item.sku]
+            for item in items
+        ]
+        duplicated_ids = sorted(
+            product_id for product_id, count in Counter(target_ids).items() if count > 1
+        )
+        if duplicated_ids:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Varios ajustes referencian el mismo producto por product_id y sku",
+                    "products": duplicated_ids
+                }
+            )
+
+        changes = values(
+            column("row_index", Integer()),
+            column("ref_id", Integer()),
+            column("delta", Integer()),
+            column("reason", String()),
+            name="changes"
+        ).data([
+            (index, product_id, item.adjustment, item.reason)
+            for index, (item, product_id) in enumerate(zip(items, target_ids))
+        ])
+
+        new_stock = table.c.stock_quantity + cast(changes.c.delta, Integer)
+        updated = (
+            update(table)
+            .where(table.c.id == cast(changes.c.ref_id, Integer))
+            # El stock reservado por pedidos en curso no se puede retirar
+            .where(new_stock >= table.c.reserved_quantity)
+            .values(stock_quantity=new_stock, updated_at=func.now())
+            .returning(
+                table.c.id,
+                table.c.sku,
+                table.c.stock_quantity,
+                changes.c.row_index,
+                changes.c.delta,
+                changes.c.reason
+            )
+            .cte("updated")
+        )
+        movements = insert(InventoryMovement).from_select(
+            ["product_id", "delta", "stock_after", "reason", "actor_id"],
+            select(
+                updated.c.id,
+                updated.c.delta,
+                updated.c.stock_quantity,
+                updated.c.reason,
+                cast(actor_id, Integer)
+            )
+        ).cte("movements")
+
+        rows = db.execute(
+            select(updated).add_cte(movements).order_by(updated.c.row_index)
+        ).all()
+
+        if len(rows) != len(items):
+            db.rollback()
+            InventoryService._raise_rejected(db, items, {row.row_index for row in rows})
+
+        product_ids = [row.id for row in rows]
+        publish_invalidation(db, CATALOG_SCOPE, product_ids)
+        db.commit()
+        invalidate_catalog(product_ids)
+
+        logger.info(
+            "Ajuste de inventario aplicado ✅ productos=%s usuario=%s", len(rows), actor_id
+        )
+        return [
+            ProductInventoryAdjustmentResult(
+                product_id=row.id,
+                sku=row.sku,
+                adjustment=row.delta,
+                stock_quantity=row.stock_quantity
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _raise_rejected(
+        db: Session,
+        items: List[ProductInventoryBatchItem],
+        applied_indexes: set
+    ) -> None:
+        """
+        Identifica por qué se rechazaron ajustes y lanza el error correspondiente.
+
+        Args:
+            db: Sesión de base de datos.
+            items: Ajustes del lote.
+            applied_indexes: Posiciones de los ajustes que sí se podían aplicar.
+
+        Raises:
+            HTTPException 404 si hay productos inexistentes, si no 409.
+        """
+        rejected = [item for index, item in enumerate(items) if index not in applied_indexes]
+        ids = [item.product_id for item in rejected if item.product_id is not None]
+        skus = [item.sku for item in rejected if item.sku is not None]
+        existing = db.execute(
+            select(Product.id, Product.sku).where(or_(Product.id.in_(ids), Product.sku.in_(skus)))
+        ).all()
+        existing_ids = {row.id for row in existing}
+        existing_skus = {row.sku for row in existing}
+
+        not_found = [
+            item.product_id if item.product_id is not None else item.sku
+            for item in rejected
+            if item.product_id not in existing_ids and item.sku not in existing_skus
+        ]
+        if not_found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"message": "Producto no encontrado", "products": not_found}
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Stock insuficiente para aplicar el ajuste",
+                "products": [
+                    item.product_id if item.product_id is not None else item.sku
+                    for item in rejected
+                ]
+            }
+        )
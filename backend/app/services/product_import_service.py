@@ -0,0 +1,314 @@
+"""
+Servicio de importación masiva de productos
+Carga archivos CSV o NDJSON en streaming: valida cada fila con ProductImportRow,
+copia los lotes válidos con COPY a una tabla temporal y hace upsert por SKU.
+La memoria usada depende del tamaño de lote, no del tamaño del archivo.
+"""
+import csv
+import io
+import json
+import logging
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import publish_invalidation
+from app.schemas.product_schemas import (
+    ProductImportError,
+    ProductImportReport,
+    ProductImportRow
+)
+from app.services.catalog_cache import CATALOG_SCOPE, invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# Columnas que se copian a la tabla temporal (en este orden)
+_STAGING_COLUMNS = (
+    "row_number", "sku", "name", "description", "price",
+    "stock_quantity", "image_url", "category", "is_active",
+)
+
+_CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS product_import_staging (
+        row_number BIGINT NOT NULL,
+        sku VARCHAR(100) NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description TEXT,
+        price NUMERIC(10, 2) NOT NULL,
+        stock_quantity INTEGER NOT NULL,
+        image_url VARCHAR(500),
+        category VARCHAR(100) NOT NULL,
+        is_active BOOLEAN NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+_COPY_SQL = (
+    f"COPY product_import_staging ({', '.join(_STAGING_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+# Si un SKU se repite dentro del lote gana la última fila (DISTINCT ON).
+# Un producto existente no se actualiza si el nuevo stock es menor que sus
+# unidades reservadas: esas filas vuelven con inserted NULL para reportarlas.
+_UPSERT_SQL = """
+    WITH latest AS (
+        SELECT DISTINCT ON (sku)
+            row_number, sku, name, description, price, stock_quantity,
+            image_url, category, is_active
+        FROM product_import_staging
+        ORDER BY sku, row_number DESC
+    ),
+    upserted AS (
+        INSERT INTO products (
+            sku, name, description, price, stock_quantity,
+            image_url, category, status, is_active, created_at
+        )
+        SELECT
+            sku, name, description, price, stock_quantity,
+            image_url, category, 'active', is_active, now()
+        FROM latest
+        ON CONFLICT (sku) DO UPDATE SET
+            name = EXCLUDED.name,
+            description = EXCLUDED.description,
+            price = EXCLUDED.price,
+            stock_quantity = EXCLUDED.stock_quantity,
+            image_url = EXCLUDED.image_url,
+            category = EXCLUDED.category,
+            is_active = EXCLUDED.is_active,
+            updated_at = now()
+        WHERE EXCLUDED.stock_quantity >= products.reserved_quantity
+        RETURNING sku, (xmax = 0) AS inserted
+    )
+    SELECT
+        latest.row_number,
+        latest.sku,
+        latest.stock_quantity,
+        products.reserved_quantity,
+        upserted.inserted
+    FROM latest
+    LEFT JOIN upserted ON upserted.sku = latest.sku
+    LEFT JOIN products ON products.sku = latest.sku
+"""
+
+
+class ProductImportService:
+    """Servicio para importación masiva de productos"""
+
+    @staticmethod
+    def detect_format(filename: Optional[str]) -> Optional[str]:
+        """
+        Deduce el formato de importación a partir de la extensión del archivo.
+
+        Args:
+            filename: Nombre del archivo.
+
+        Returns:
+            "csv", "ndjson" o None si no se reconoce.
+        """
+        if not filename:
+            return None
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return "csv"
+        if extension in ("ndjson", "jsonl"):
+            return "ndjson"
+        return None
+
+    @staticmethod
+    def import_products(
+        db: Session,
+        stream: TextIO,
+        file_format: str,
+        batch_size: int = 5000,
+        max_reported_errors: int = 1000
+    ) -> ProductImportReport:
+        """
+        Importa productos desde un stream de texto, haciendo upsert por SKU.
+
+        Cada lote se confirma en su propia transacción, por lo que una
+        importación interrumpida puede repetirse sin duplicar productos.
+        Las filas inválidas se reportan y no detienen la importación.
+
+        Args:
+            db: Sesión de base de datos.
+            stream: Archivo de texto (CSV con encabezados o NDJSON).
+            file_format: "csv" o "ndjson".
+            batch_size: Filas válidas por lote de COPY.
+            max_reported_errors: Máximo de errores detallados en el reporte.
+
+        Returns:
+            Reporte con filas creadas, actualizadas y con error.
+
+        Raises:
+            ValueError si el formato no es soportado.
+        """
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Formato de importación no soportado: {file_format}")
+
+        report = ProductImportReport()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        batch_rows = 0
+
+        for row_number, raw_row in ProductImportService._iter_rows(stream, file_format):
+            report.total_rows += 1
+            row, errors = ProductImportService._validate_row(raw_row)
+            if errors:
+                report.failed += 1
+                if len(report.errors) < max_reported_errors:
+                    sku = raw_row.get("sku") if isinstance(raw_row, dict) else None
+                    report.errors.append(ProductImportError(
+                        row=row_number,
+                        sku=str(sku) if sku is not None else None,
+                        errors=errors
+                    ))
+                else:
+                    report.errors_truncated = True
+                continue
+
+            writer.writerow((
+                row_number, row.sku, row.name, row.description, row.price,
+                row.stock_quantity, row.image_url, row.category, row.is_active,
+            ))
+            batch_rows += 1
+            if batch_rows >= batch_size:
+                ProductImportService._flush_batch(
+                    db, buffer, batch_rows, report, max_reported_errors
+                )
+                buffer.seek(0)
+                buffer.truncate()
+                batch_rows = 0
+
+        if batch_rows:
+            ProductImportService._flush_batch(
+                db, buffer, batch_rows, report, max_reported_errors
+            )
+        else:
+            db.commit()
+
+        logger.info(
+            "Importación de productos finalizada ✅ filas=%s creados=%s actualizados=%s errores=%s",
+            report.total_rows, report.created, report.updated, report.failed
+        )
+        return report
+
+    @staticmethod
+    def _iter_rows(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+        """
+        Recorre el archivo fila por fila sin cargarlo completo en memoria.
+
+        Args:
+            stream: Archivo de texto.
+            file_format: "csv" o "ndjson".
+
+        Yields:
+            Tuplas (número de fila, datos crudos de la fila).
+        """
+        if file_format == "csv":
+            reader = csv.DictReader(stream)
+            for row_number, row in enumerate(reader, start=1):
+                # Columnas extra (clave None) y celdas vacías se descartan
+                yield row_number, {
+                    key.strip(): value
+                    for key, value in row.items()
+                    if key is not None and value not in (None, "")
+                }
+            return
+
+        row_number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                data = e
+            yield row_number, data
+
+    @staticmethod
+    def _validate_row(raw_row: Any) -> Tuple[Optional[ProductImportRow], List[str]]:
+        """
+        Valida una fila con ProductImportRow.
+
+        Args:
+            raw_row: Diccionario con la fila, o la excepción si no se pudo leer.
+
+        Returns:
+            Una tupla con la fila validada (o None) y la lista de errores.
+        """
+        if isinstance(raw_row, ValueError):
+            return None, [f"JSON inválido: {raw_row}"]
+        if not isinstance(raw_row, dict):
+            return None, ["La fila debe ser un objeto JSON"]
+
+        try:
+            return ProductImportRow.model_validate(raw_row), []
+        except ValidationError as e:
+            return None, [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            ]
+
+    @staticmethod
+    def _flush_batch(
+        db: Session,
+        buffer: io.StringIO,
+        batch_rows: int,
+        report: ProductImportReport,
+        max_reported_errors: int
+    ) -> None:
+        """
+        Copia un lote a la tabla temporal, hace el upsert y confirma la transacción.
+
+        Las filas que dejarían el stock por debajo de lo reservado no se
+        aplican y se reportan como errores.
+
+        Args:
+            db: Sesión de base de datos.
+            buffer: Lote serializado en formato CSV.
+            batch_rows: Número de filas del lote.
+            report: Reporte a actualizar.
+            max_reported_errors: Máximo de errores detallados en el reporte.
+        """
+        # Tras cada commit la sesión puede recibir otra conexión del pool, y
+        # las tablas temporales son por conexión: se crea antes de cada lote
+        db.execute(text(_CREATE_STAGING_SQL))
+
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_SQL, buffer)
+        finally:
+            cursor.close()
+
+        rows = db.execute(text(_UPSERT_SQL)).all()
+        report.duplicates += batch_rows - len(rows)
+        for row in rows:
+            if row.inserted is True:
+                report.created += 1
+            elif row.inserted is False:
+                report.updated += 1
+            else:
+                report.failed += 1
+                if len(report.errors) < max_reported_errors:
+                    report.errors.append(ProductImportError(
+                        row=row.row_number,
+                        sku=row.sku,
+                        errors=[
+                            f"stock_quantity: {row.stock_quantity} es menor que las "
+                            f"unidades reservadas ({row.reserved_quantity})"
+                        ]
+                    ))
+                else:
+                    report.errors_truncated = True
+
+        publish_invalidation(db, CATALOG_SCOPE)
+        db.commit()
+        invalidate_catalog()
+
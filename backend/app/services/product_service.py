@@ -3,14 +3,75 @@
 Servicio de productos
 Maneja la lógica de negocio para operaciones CRUD de productos.
 """
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+import base64
+import binascii
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session, Query, load_only
+from sqlalchemy import (
+    Boolean, Integer, Numeric, String, and_, any_, bindparam, case, cast, column, false, func,
+    literal, or_, select, true, tuple_, update, values
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
 from fastapi import HTTPException, status
 from decimal import Decimal
 
-from app.models.products import Product
-from app.schemas.product_schemas import ProductCreate, ProductUpdate, ProductSearchFilters
+from app.core.config import settings
+from app.models.products import Product, SEARCH_CONFIG
+from app.core.cache import MISSING
+from app.core.invalidation import publish_invalidation
+from app.schemas.product_schemas import (
+    ProductBulkChange,
+    ProductBulkUpdateResponse,
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductSearchFilters,
+    ProductSuggestion,
+    CategoryFacet,
+    PriceRangeFacet,
+    ProductFacets
+)
+from app.services.catalog_cache import (
+    CATALOG_SCOPE,
+    invalidate_catalog,
+    product_cache,
+    product_count_cache,
+    product_facet_cache,
+    product_suggest_cache
+)
+
+# Palabras (letras/números, incluyendo acentos) que componen una búsqueda
+_SEARCH_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Claves de ordenamiento estables por criterio: (atributo, descendente).
+# El ID siempre desempata para que la paginación por cursor sea determinista.
+_SORT_KEYS = {
+    None: (("id", False),),
+    "newest": (("created_at", True), ("id", True)),
+    "price_asc": (("price", False), ("id", False)),
+    "price_desc": (("price", True), ("id", True)),
+}
+
+# Conversión de los valores guardados en el cursor a su tipo original
+_CURSOR_VALUE_PARSERS = {
+    "id": int,
+    "price": Decimal,
+    "created_at": datetime.fromisoformat,
+}
+
+
+class ProductPage(NamedTuple):
+    """Resultado de una consulta paginada de productos"""
+    products: List[Product]
+    total: Optional[int]
+    total_mode: str
+    next_cursor: Optional[str]
+    facets: Optional[ProductFacets] = None
 
 
 class ProductService:
@@ -39,8 +100,11 @@ class ProductService:
             sku=sku
         )
         db.add(db_product)
+        db.flush()
+        publish_invalidation(db, CATALOG_SCOPE, [db_product.id])
         db.commit()
         db.refresh(db_product)
+        invalidate_catalog([db_product.id])
         return db_product
 
     @staticmethod
@@ -57,35 +121,488 @@ class ProductService:
         """
         return db.query(Product).filter(Product.id == product_id).first()
 
+    @staticmethod
+    def get_product_response(db: Session, product_id: int) -> Optional[ProductResponse]:
+        """
+        Obtiene un producto ya serializado, usando la caché del catálogo.
+
+        A diferencia de ``get_product`` no retorna la entidad ORM (que no debe
+        compartirse entre sesiones), sino un ProductResponse inmutable.
+
+        Args:
+            db: Sesión de base de datos.
+            product_id: ID del producto.
+
+        Returns:
+            El producto serializado si existe, de lo contrario None.
+        """
+        generation = product_cache.generation
+        cached = product_cache.get(product_id)
+        if cached is not MISSING:
+            return cached
+
+        db_product = ProductService.get_product(db, product_id)
+        if db_product is None:
+            return None
+
+        product = ProductResponse.model_validate(db_product)
+        product_cache.set(product_id, product, generation=generation)
+        return product
+
+    @staticmethod
+    def get_products_by_ids(
+        db: Session,
+        product_ids: List[int]
+    ) -> Tuple[List[ProductResponse], List[int]]:
+        """
+        Obtiene varios productos por ID con una sola consulta.
+
+        Los productos en caché no se consultan; el resto se resuelve con
+        ``WHERE id = ANY(:ids)`` y se guarda en la caché.
+
+        Args:
+            db: Sesión de base de datos.
+            product_ids: IDs solicitados (se ignoran duplicados).
+
+        Returns:
+            Una tupla con los productos en el orden solicitado y los IDs inexistentes.
+        """
+        unique_ids = list(dict.fromkeys(product_ids))
+        generation = product_cache.generation
+
+        found = {}
+        pending_ids = []
+        for product_id in unique_ids:
+            cached = product_cache.get(product_id)
+            if cached is MISSING:
+                pending_ids.append(product_id)
+            else:
+                found[product_id] = cached
+
+        if pending_ids:
+            ids_param = bindparam("ids", pending_ids, type_=ARRAY(Integer))
+            for db_product in db.query(Product).filter(Product.id == any_(ids_param)):
+                product = ProductResponse.model_validate(db_product)
+                product_cache.set(db_product.id, product, generation=generation)
+                found[db_product.id] = product
+
+        products = [found[product_id] for product_id in unique_ids if product_id in found]
+        missing_ids = [product_id for product_id in unique_ids if product_id not in found]
+        return products, missing_ids
+
+    @staticmethod
+    def suggest_products(db: Session, text_query: str, limit: int = 8) -> List[ProductSuggestion]:
+        """
+        Sugiere productos activos mientras el usuario escribe.
+
+        Usa similitud de trigramas (``pg_trgm``, operador ``<%``) sobre el
+        nombre sin acentos y el SKU, resuelta con sus índices GIN, por lo que
+        tolera errores de tipeo y palabras incompletas. Solo se leen las
+        columnas que muestra el buscador y los resultados se cachean por
+        texto normalizado.
+
+        Args:
+            db: Sesión de base de datos.
+            text_query: Texto ingresado por el usuario.
+            limit: Número máximo de sugerencias.
+
+        Returns:
+            Las sugerencias ordenadas de mayor a menor similitud.
+        """
+        normalized = " ".join(text_query.lower().split())
+        if not normalized:
+            return []
+
+        return product_suggest_cache.get_or_set(
+            (normalized, limit),
+            lambda: ProductService._query_suggestions(db, normalized, limit)
+        )
+
+    @staticmethod
+    def _query_suggestions(db: Session, normalized: str, limit: int) -> List[ProductSuggestion]:
+        """
+        Ejecuta la consulta de trigramas de ``suggest_products``.
+
+        Args:
+            db: Sesión de base de datos.
+            normalized: Texto en minúsculas y sin espacios repetidos.
+            limit: Número máximo de sugerencias.
+
+        Returns:
+            Las sugerencias encontradas.
+        """
+        search_text = func.immutable_unaccent(literal(normalized))
+        # Misma expresión que el índice ix_products_name_trgm
+        name_text = func.immutable_unaccent(Product.name)
+        sku_text = literal(normalized)
+        score = func.greatest(
+            func.word_similarity(search_text, name_text),
+            func.word_similarity(sku_text, Product.sku)
+        )
+
+        rows = (
+            db.query(Product.id, Product.name, Product.price, Product.image_url)
+            .filter(Product.is_active.is_(True))
+            .filter(or_(
+                search_text.op("<%")(name_text),
+                sku_text.op("<%")(Product.sku)
+            ))
+            .order_by(score.desc(), Product.id)
+            .limit(limit)
+            .all()
+        )
+        return [ProductSuggestion.model_validate(row) for row in rows]
+
+    @staticmethod
+    def get_product_last_modified(db: Session, product_id: int) -> Optional[datetime]:
+        """
+        Obtiene la fecha de última modificación de un producto.
+
+        Usa la caché si el producto está en ella; si no, consulta solo las
+        columnas de fecha (sin cargar la entidad ORM). Sirve para responder
+        peticiones condicionales sin construir el producto completo.
+
+        Args:
+            db: Sesión de base de datos.
+            product_id: ID del producto.
+
+        Returns:
+            ``updated_at`` (o ``created_at`` si nunca se modificó), o None si no existe.
+        """
+        cached = product_cache.get(product_id)
+        if cached is not MISSING:
+            return cached.updated_at or cached.created_at
+
+        return db.execute(
+            select(func.coalesce(Product.updated_at, Product.created_at))
+            .where(Product.id == product_id)
+        ).scalar_one_or_none()
+
     @staticmethod
     def get_products(
         db: Session,
         filters: ProductSearchFilters,
         skip: int = 0,
-        limit: int = 10
-    ) -> Tuple[List[Product], int]:
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
+        facets: Tuple[str, ...] = (),
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> ProductPage:
         """
         Obtiene una lista paginada y filtrada de productos.
 
+        Si se recibe un cursor se usa paginación por keyset (``WHERE`` sobre la
+        clave de ordenamiento) y se ignora ``skip``, de modo que el costo no
+        crece con la profundidad de la página.
+
         Args:
             db: Sesión de base de datos.
             filters: Filtros de búsqueda.
-            skip: Número de registros a saltar.
+            skip: Número de registros a saltar (modo por páginas).
             limit: Número máximo de registros a devolver.
+            cursor: Cursor opaco devuelto como ``next_cursor`` por la página anterior.
+            count_mode: Estrategia de conteo del total (ver ``_count_products``).
+            facets: Facetas a calcular ("category", "price"); su consulta también
+                da el total exacto, por lo que reemplaza al conteo.
+            fields: Columnas a cargar (``load_only``); None carga el producto
+                completo. Siempre se agregan el ID y las claves de ordenamiento.
 
         Returns:
-            Una tupla con la lista de productos y el conteo total.
+            ProductPage con los productos, el conteo total, el cursor siguiente
+            y las facetas solicitadas.
+
+        Raises:
+            HTTPException 400 si el cursor es inválido o no aplica al ordenamiento.
         """
-        query = db.query(Product)
+        query, ts_query = ProductService._apply_filters(db.query(Product), filters)
+        product_facets = None
+        if facets:
+            product_facets, facet_total = ProductService.get_product_facets(db, filters, facets)
+            total_count, total_mode = (None, "none") if count_mode == "none" else (facet_total, "exact")
+        else:
+            total_count, total_mode = ProductService._count_products(db, query, filters, count_mode)
 
-        if filters.search:
-            search_term = f"%{filters.search}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.description.ilike(search_term)
+        # El rank de relevancia no es una clave estable para keyset
+        supports_cursor = not (filters.sort == "relevance" and ts_query is not None)
+        keyset_sort = filters.sort if filters.sort in _SORT_KEYS else None
+        if cursor is not None:
+            if not supports_cursor:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="La paginación por cursor no está disponible para sort=relevance"
                 )
-            )
+            cursor_values = ProductService._decode_cursor(cursor, keyset_sort)
+            query = query.filter(ProductService._keyset_condition(keyset_sort, cursor_values))
+            skip = 0
+
+        query = ProductService._apply_sort(query, filters.sort, ts_query)
+        if fields is not None:
+            columns = dict.fromkeys(("id", *fields, *(attr for attr, _ in _SORT_KEYS[keyset_sort])))
+            query = query.options(load_only(*(getattr(Product, name) for name in columns)))
+        # Se pide un registro extra para saber si existe una página siguiente
+        rows = query.offset(skip).limit(limit + 1).all()
+        products = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit and supports_cursor:
+            next_cursor = ProductService._encode_cursor(keyset_sort, products[-1])
+        
+        return ProductPage(products, total_count, total_mode, next_cursor, product_facets)
+
+    @staticmethod
+    def get_product_facets(
+        db: Session,
+        filters: ProductSearchFilters,
+        facets: Tuple[str, ...]
+    ) -> Tuple[ProductFacets, int]:
+        """
+        Calcula los conteos por faceta y el total del listado en una sola consulta.
+
+        Usa ``GROUPING SETS`` sobre los productos que cumplen los filtros comunes.
+        Cada faceta ignora su propio filtro (la faceta de categoría cuenta todas
+        las categorías con el rango de precio activo y viceversa), de modo que el
+        sidebar puede mostrar las alternativas; cada conteo aplica el filtro de la
+        otra faceta con ``FILTER (WHERE ...)``. El resultado se cachea por
+        combinación de filtros.
+
+        Args:
+            db: Sesión de base de datos.
+            filters: Filtros de búsqueda activos.
+            facets: Facetas a calcular ("category", "price").
+
+        Returns:
+            Una tupla con las facetas y el total exacto de productos con todos los filtros.
+        """
+        facets = tuple(sorted(set(facets)))
+        cache_key = (ProductService.filters_cache_key(filters), facets)
+        return product_facet_cache.get_or_set(
+            cache_key,
+            lambda: ProductService._compute_facets(db, filters, facets)
+        )
+
+    @staticmethod
+    def _compute_facets(
+        db: Session,
+        filters: ProductSearchFilters,
+        facets: Tuple[str, ...]
+    ) -> Tuple[ProductFacets, int]:
+        """
+        Ejecuta la consulta de facetas (ver ``get_product_facets``).
+
+        Args:
+            db: Sesión de base de datos.
+            filters: Filtros de búsqueda activos.
+            facets: Facetas a calcular, ordenadas.
+
+        Returns:
+            Una tupla con las facetas y el total exacto.
+        """
+        bounds = [Decimal(bound) for bound in settings.PRODUCT_PRICE_FACET_BOUNDS]
+        # width_bucket: 0 = por debajo del primer límite, len(bounds) = desde el último
+        price_bucket = func.width_bucket(
+            Product.price, bindparam("price_bounds", bounds, type_=ARRAY(Numeric(10, 2)))
+        )
+
+        category_condition = true()
+        if filters.category:
+            category_condition = Product.category == filters.category
+        price_conditions = []
+        if filters.min_price is not None:
+            price_conditions.append(Product.price >= filters.min_price)
+        if filters.max_price is not None:
+            price_conditions.append(Product.price <= filters.max_price)
+        price_condition = and_(true(), *price_conditions)
+
+        row_count = func.count()
+        columns = [
+            row_count.filter(and_(category_condition, price_condition)).label("total"),
+            row_count.filter(price_condition).label("category_count"),
+            row_count.filter(category_condition).label("price_count"),
+        ]
+        grouping_sets = [tuple_()]
+        # GROUPING(x) es 0 en las filas agrupadas por x
+        if "category" in facets:
+            columns += [Product.category, func.grouping(Product.category).label("by_category")]
+            grouping_sets.append(tuple_(Product.category))
+        if "price" in facets:
+            columns += [price_bucket.label("price_bucket"), func.grouping(price_bucket).label("by_price")]
+            grouping_sets.append(tuple_(price_bucket))
+
+        common_filters = filters.model_copy(
+            update={"category": None, "min_price": None, "max_price": None}
+        )
+        query, _ = ProductService._apply_filters(db.query(*columns), common_filters)
+        rows = query.group_by(func.grouping_sets(*grouping_sets)).all()
+
+        total = 0
+        categories = []
+        price_counts = {}
+        for row in rows:
+            if getattr(row, "by_category", 1) == 0:
+                if row.category_count:
+                    categories.append(CategoryFacet(value=row.category, count=row.category_count))
+            elif getattr(row, "by_price", 1) == 0:
+                price_counts[row.price_bucket] = row.price_count
+            else:
+                total = row.total
+
+        result = ProductFacets()
+        if "category" in facets:
+            result.category = sorted(categories, key=lambda facet: (-facet.count, facet.value))
+        if "price" in facets:
+            lower_bounds = [None, *bounds]
+            upper_bounds = [*bounds, None]
+            result.price = [
+                PriceRangeFacet(
+                    min_price=lower_bounds[index],
+                    max_price=upper_bounds[index],
+                    count=price_counts.get(index, 0)
+                )
+                for index in range(len(bounds) + 1)
+            ]
+        return result, total
+
+    @staticmethod
+    def _count_products(
+        db: Session,
+        query: Query,
+        filters: ProductSearchFilters,
+        count_mode: str
+    ) -> Tuple[Optional[int], str]:
+        """
+        Calcula el total de un listado según la estrategia solicitada.
+
+        - ``exact``: ``COUNT(*)`` cacheado por combinación de filtros (TTL corto,
+          se invalida con cada escritura de productos).
+        - ``estimated``: estimación de filas del planner de PostgreSQL; si la
+          estimación es pequeña se usa el conteo exacto, que es barato.
+        - ``none``: no se cuenta (clientes con scroll infinito).
+
+        Args:
+            db: Sesión de base de datos.
+            query: Consulta filtrada (sin ordenamiento ni paginación).
+            filters: Filtros de búsqueda usados para la clave de caché.
+            count_mode: exact, estimated o none.
+
+        Returns:
+            Una tupla con el total (o None) y la estrategia realmente usada.
+        """
+        if count_mode == "none":
+            return None, "none"
+
+        if count_mode == "estimated":
+            estimate = ProductService._estimate_count(db, query)
+            if estimate >= settings.PRODUCT_COUNT_ESTIMATE_THRESHOLD:
+                return estimate, "estimated"
+
+        cache_key = ProductService.filters_cache_key(filters)
+        return product_count_cache.get_or_set(cache_key, query.count), "exact"
+
+    @staticmethod
+    def _estimate_count(db: Session, query: Query) -> int:
+        """
+        Obtiene la estimación de filas del planner para una consulta.
+
+        Args:
+            db: Sesión de base de datos.
+            query: Consulta filtrada.
+
+        Returns:
+            Número de filas estimado por ``EXPLAIN``.
+        """
+        compiled = query.statement.compile(dialect=db.get_bind().dialect)
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def filters_cache_key(filters: ProductSearchFilters) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Normaliza los filtros (sin el ordenamiento) para usarlos como clave de caché.
+
+        Args:
+            filters: Filtros de búsqueda.
+
+        Returns:
+            Una tupla ordenada y hasheable con los filtros efectivos.
+        """
+        data = filters.model_dump(exclude={"sort"})
+        if data["search"]:
+            # Una búsqueda sin palabras ("!!!") no encuentra nada: su clave es "", no None
+            tokens = _SEARCH_TOKEN_PATTERN.findall(data["search"].lower())
+            data["search"] = " ".join(tokens)
+        else:
+            data["search"] = None
+        data["in_stock"] = data["in_stock"] or None
+        return tuple(sorted(data.items()))
+
+    @staticmethod
+    def _build_search_query(search: str) -> Optional[ColumnElement]:
+        """
+        Construye un tsquery de prefijos a partir del texto ingresado.
+
+        Cada palabra se convierte en un prefijo (``palabra:*``) para que la
+        búsqueda funcione mientras el usuario escribe. Se eliminan acentos
+        igual que en la columna ``search_vector``.
+
+        Args:
+            search: Texto de búsqueda ingresado por el usuario.
+
+        Returns:
+            La expresión tsquery, o None si el texto no contiene palabras.
+        """
+        tokens = _SEARCH_TOKEN_PATTERN.findall(search)
+        if not tokens:
+            return None
+
+        prefix_query = " & ".join(f"{token}:*" for token in tokens)
+        return func.to_tsquery(SEARCH_CONFIG, func.immutable_unaccent(prefix_query))
+
+    @staticmethod
+    def filter_query(query: Query, filters: ProductSearchFilters) -> Query:
+        """
+        Aplica los filtros de búsqueda (sin ordenamiento) a una consulta sobre Product.
+
+        Permite que otros servicios (ej. la exportación) filtren igual que el
+        listado de productos, con sus propias columnas y orden.
+
+        Args:
+            query: Consulta base sobre Product o sus columnas.
+            filters: Filtros de búsqueda; ``sort`` se ignora.
+
+        Returns:
+            La consulta filtrada.
+        """
+        query, _ = ProductService._apply_filters(query, filters)
+        return query
+
+    @staticmethod
+    def _apply_filters(
+        query: Query,
+        filters: ProductSearchFilters
+    ) -> Tuple[Query, Optional[ColumnElement]]:
+        """
+        Aplica los filtros de búsqueda a una consulta de productos.
+
+        Args:
+            query: Consulta base sobre Product.
+            filters: Filtros de búsqueda.
+
+        Returns:
+            Una tupla con la consulta filtrada y el tsquery usado (o None).
+        """
+        ts_query = None
+        if filters.search:
+            ts_query = ProductService._build_search_query(filters.search)
+            if ts_query is not None:
+                query = query.filter(Product.search_vector.bool_op("@@")(ts_query))
+            else:
+                # El texto no tiene palabras buscables: ningún producto coincide
+                query = query.filter(false())
         
         if filters.category:
             query = query.filter(Product.category == filters.category)
@@ -100,12 +617,126 @@ class ProductService:
             query = query.filter(Product.is_active == filters.is_active)
             
         if filters.in_stock:
-            query = query.filter(Product.stock_quantity > 0)
+            # Igual que available_quantity: descuenta las reservas vigentes.
+            # stock_quantity > 0 se mantiene para usar el índice parcial de productos en stock
+            query = query.filter(
+                Product.stock_quantity > 0,
+                Product.stock_quantity - Product.reserved_quantity > 0
+            )
 
-        total_count = query.count()
-        products = query.offset(skip).limit(limit).all()
-        
-        return products, total_count
+        return query, ts_query
+
+    @staticmethod
+    def _apply_sort(
+        query: Query,
+        sort: Optional[str],
+        ts_query: Optional[ColumnElement] = None
+    ) -> Query:
+        """
+        Aplica el ordenamiento solicitado, usando el ID como desempate estable.
+
+        Args:
+            query: Consulta filtrada.
+            sort: Criterio de ordenamiento (ver ProductSortOption).
+            ts_query: tsquery de la búsqueda, necesario para ``relevance``.
+
+        Returns:
+            La consulta ordenada.
+        """
+        if sort == "relevance" and ts_query is not None:
+            rank = func.ts_rank(Product.search_vector, ts_query)
+            return query.order_by(rank.desc(), Product.id)
+
+        keys = _SORT_KEYS.get(sort, _SORT_KEYS[None])
+        return query.order_by(*[
+            getattr(Product, attr).desc() if descending else getattr(Product, attr).asc()
+            for attr, descending in keys
+        ])
+
+    @staticmethod
+    def _encode_cursor(sort: Optional[str], product: Product) -> str:
+        """
+        Codifica la posición de un producto como cursor opaco (base64 URL-safe).
+
+        Args:
+            sort: Criterio de ordenamiento de la página.
+            product: Último producto de la página.
+
+        Returns:
+            El cursor como string.
+        """
+        cursor_values = []
+        for attr, _ in _SORT_KEYS[sort]:
+            value = getattr(product, attr)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            cursor_values.append(value)
+
+        raw = json.dumps({"s": sort, "v": cursor_values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: Optional[str]) -> List[Any]:
+        """
+        Decodifica un cursor y valida que corresponda al ordenamiento actual.
+
+        Args:
+            cursor: Cursor recibido del cliente.
+            sort: Criterio de ordenamiento de la petición.
+
+        Returns:
+            Los valores de la clave de ordenamiento, ya convertidos a su tipo.
+
+        Raises:
+            HTTPException 400 si el cursor está malformado o es de otro ordenamiento.
+        """
+        invalid_cursor = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            keys = _SORT_KEYS[sort]
+            if payload["s"] != sort or len(payload["v"]) != len(keys):
+                raise invalid_cursor
+            return [
+                _CURSOR_VALUE_PARSERS[attr](value)
+                for (attr, _), value in zip(keys, payload["v"])
+            ]
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, ArithmeticError) as e:
+            raise invalid_cursor from e
+
+    @staticmethod
+    def _keyset_condition(sort: Optional[str], cursor_values: List[Any]) -> ColumnElement:
+        """
+        Construye la condición "después de la posición del cursor".
+
+        Para claves (k1, k2) genera ``k1 > v1 OR (k1 = v1 AND k2 > v2)``,
+        invirtiendo la comparación en las claves descendentes.
+
+        Args:
+            sort: Criterio de ordenamiento.
+            cursor_values: Valores de la clave extraídos del cursor.
+
+        Returns:
+            La expresión booleana para el WHERE.
+        """
+        keys = _SORT_KEYS[sort]
+        conditions = []
+        for index, (attr, descending) in enumerate(keys):
+            sort_column = getattr(Product, attr)
+            comparison = (
+                sort_column < cursor_values[index] if descending else sort_column > cursor_values[index]
+            )
+            equalities = [
+                getattr(Product, previous_attr) == cursor_values[previous_index]
+                for previous_index, (previous_attr, _) in enumerate(keys[:index])
+            ]
+            conditions.append(and_(*equalities, comparison))
+        return or_(*conditions)
 
     @staticmethod
     def update_product(db: Session, product_id: int, product_data: ProductUpdate) -> Optional[Product]:
@@ -119,19 +750,197 @@ class ProductService:
 
         Returns:
             El producto actualizado o None si no se encuentra.
+
+        Raises:
+            HTTPException 409 si el nuevo stock es menor que lo reservado.
         """
-        db_product = ProductService.get_product(db, product_id)
+        update_data = product_data.model_dump(exclude_unset=True)
+        # Si cambia el stock, la fila se bloquea para que no entren reservas
+        # entre la validación y el commit
+        query = db.query(Product).filter(Product.id == product_id)
+        if "stock_quantity" in update_data:
+            query = query.with_for_update()
+        db_product = query.first()
         if not db_product:
             return None
 
-        update_data = product_data.model_dump(exclude_unset=True)
+        new_stock = update_data.get("stock_quantity")
+        if new_stock is not None and new_stock < db_product.reserved_quantity:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    "El stock no puede quedar por debajo de las unidades reservadas "
+                    f"({db_product.reserved_quantity})"
+                )
+            )
+
         for key, value in update_data.items():
             setattr(db_product, key, value)
 
+        publish_invalidation(db, CATALOG_SCOPE, [product_id])
         db.commit()
         db.refresh(db_product)
+        invalidate_catalog([product_id])
         return db_product
 
+    @staticmethod
+    def lock_ids_by_sku(db: Session, skus: List[str]) -> Dict[str, int]:
+        """
+        Resuelve SKUs a IDs bloqueando las filas hasta el fin de la transacción.
+
+        Las filas se bloquean en orden de ID para que lotes concurrentes no se
+        bloqueen mutuamente. Sirve para detectar que un lote referencia el
+        mismo producto por ID y por SKU antes de escribir.
+
+        Args:
+            db: Sesión de base de datos.
+            skus: SKUs a resolver.
+
+        Returns:
+            Diccionario SKU -> ID con los SKUs que existen.
+        """
+        if not skus:
+            return {}
+        return dict(db.execute(
+            select(Product.sku, Product.id)
+            .where(Product.sku == any_(bindparam("skus", skus, type_=ARRAY(String))))
+            .order_by(Product.id)
+            .with_for_update()
+        ).all())
+
+    @staticmethod
+    def bulk_update_products(
+        db: Session,
+        changes: List[ProductBulkChange]
+    ) -> ProductBulkUpdateResponse:
+        """
+        Actualiza varios productos en una sola transacción y un solo UPDATE.
+
+        Los cambios se envían como una tabla ``VALUES`` con un valor y una
+        bandera por campo, de modo que cada fila solo modifica los campos que
+        trae (``UPDATE ... FROM (VALUES ...) ... RETURNING``). Las cachés del
+        catálogo se invalidan una sola vez por lote.
+
+        Args:
+            db: Sesión de base de datos.
+            changes: Cambios a aplicar, identificados por ID o SKU.
+
+        Returns:
+            Los productos actualizados (en el orden de los cambios) y las
+            referencias que no existen.
+
+        Raises:
+            HTTPException 409 si un cambio por ID y otro por SKU apuntan al
+            mismo producto, o si algún stock quedaría por debajo de lo
+            reservado (no se aplica ningún cambio).
+        """
+        table = Product.__table__
+
+        # Los SKU se resuelven a IDs (bloqueando las filas) para detectar
+        # cambios que referencian el mismo producto de dos formas
+        skus = [change.sku for change in changes if change.sku is not None]
+        ids_by_sku = ProductService.lock_ids_by_sku(db, skus)
+        target_ids = [
+            change.id if change.id is not None else ids_by_sku.get(change.sku)
+            for change in changes
+        ]
+        referenced_ids = [product_id for product_id in target_ids if product_id is not None]
+        duplicated_ids = sorted(
+            product_id for product_id, count in Counter(referenced_ids).items() if count > 1
+        )
+        if duplicated_ids:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    "Varios cambios referencian el mismo producto por id y sku: "
+                    f"{', '.join(str(product_id) for product_id in duplicated_ids)}"
+                )
+            )
+        field_names = sorted(set().union(*(change.fields.model_fields_set for change in changes)))
+
+        value_columns = [
+            column("row_index", Integer()),
+            column("ref_id", Integer()),
+        ]
+        for name in field_names:
+            value_columns.append(column(name, table.c[name].type))
+            value_columns.append(column(f"set_{name}", Boolean()))
+
+        rows = []
+        for index, (change, product_id) in enumerate(zip(changes, target_ids)):
+            if product_id is None:
+                continue
+            row = [index, product_id]
+            for name in field_names:
+                is_set = name in change.fields.model_fields_set
+                row.append(getattr(change.fields, name) if is_set else None)
+                row.append(is_set)
+            rows.append(tuple(row))
+
+        if not rows:
+            db.rollback()
+            return ProductBulkUpdateResponse(
+                updated=[],
+                not_found_ids=[change.id for change in changes if change.id is not None],
+                not_found_skus=skus
+            )
+
+        changes_table = values(*value_columns, name="changes").data(rows)
+
+        # En VALUES los NULL no tienen tipo: se convierten al tipo de la columna
+        assignments = {
+            name: case(
+                (changes_table.c[f"set_{name}"], cast(changes_table.c[name], table.c[name].type)),
+                else_=table.c[name]
+            )
+            for name in field_names
+        }
+        assignments["updated_at"] = func.now()
+
+        statement = (
+            update(table)
+            .where(table.c.id == cast(changes_table.c.ref_id, Integer))
+            .values(assignments)
+            .returning(*[table.c[name] for name in ProductResponse.model_fields], changes_table.c.row_index)
+        )
+        if "stock_quantity" in assignments:
+            # El stock reservado por pedidos en curso no se puede retirar
+            statement = statement.where(assignments["stock_quantity"] >= table.c.reserved_quantity)
+        returned_rows = db.execute(statement).mappings().all()
+
+        updated_ids = [row["id"] for row in returned_rows]
+        if "stock_quantity" in assignments:
+            # Los productos que existen y no se actualizaron los rechazó la condición de stock
+            skipped_ids = set(referenced_ids) - set(updated_ids)
+            below_reserved_ids = sorted(db.scalars(
+                select(Product.id).where(Product.id.in_(skipped_ids))
+            ).all()) if skipped_ids else []
+            if below_reserved_ids:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=(
+                        "El stock no puede quedar por debajo de las unidades reservadas: "
+                        f"{', '.join(str(product_id) for product_id in below_reserved_ids)}"
+                    )
+                )
+        if updated_ids:
+            publish_invalidation(db, CATALOG_SCOPE, updated_ids)
+        db.commit()
+        if updated_ids:
+            invalidate_catalog(updated_ids)
+
+        updated_rows = sorted(returned_rows, key=lambda row: row["row_index"])
+        updated_indexes = {row["row_index"] for row in returned_rows}
+        missing = [change for index, change in enumerate(changes) if index not in updated_indexes]
+        return ProductBulkUpdateResponse(
+            updated=[ProductResponse.model_validate(dict(row)) for row in updated_rows],
+            not_found_ids=[change.id for change in missing if change.id is not None],
+            not_found_skus=[change.sku for change in missing if change.sku is not None]
+        )
+
     @staticmethod
     def delete_product(db: Session, product_id: int) -> bool:
         """
@@ -149,5 +958,7 @@ class ProductService:
             return False
         
         db.delete(db_product)
+        publish_invalidation(db, CATALOG_SCOPE, [product_id])
         db.commit()
+        invalidate_catalog([product_id])
         return True
@@ -0,0 +1,317 @@
+"""
+Servicio de reservas de stock
+Retiene el stock de un pedido entre el checkout y la confirmación del pago
+(webhook de Wompi) para no sobrevender, sin bloquear filas de ``products``
+mientras el cliente paga.
+
+- ``products.reserved_quantity`` acumula las reservas vigentes; la
+  disponibilidad es ``stock_quantity - reserved_quantity``.
+- ``stock_reservations`` guarda cada reserva con su expiración (indexada) para
+  liberarla al pagar, cancelar o expirar.
+
+Cada operación es una sola sentencia SQL (CTEs que modifican datos). Las filas
+de productos se bloquean en orden de ID, así que checkouts concurrentes sobre
+los mismos productos se serializan sin deadlocks, y la condición de
+disponibilidad se reevalúa sobre la versión más reciente de cada fila.
+"""
+import logging
+import threading
+import uuid
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.invalidation import publish_invalidation
+from app.database import SessionLocal
+from app.schemas.order_schemas import OrderItemCreate, StockReservationResponse
+from app.services.catalog_cache import CATALOG_SCOPE, invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+# Reserva todas las cantidades de un pedido o ninguna (el llamador compara
+# las filas insertadas con las solicitadas y hace rollback si faltan)
+_RESERVE_SQL = """
+    WITH requested AS (
+        SELECT product_id, sum(quantity) AS quantity
+        FROM unnest(CAST(:product_ids AS integer[]), CAST(:quantities AS integer[]))
+            AS item(product_id, quantity)
+        GROUP BY product_id
+    ),
+    locked AS MATERIALIZED (
+        SELECT id FROM products
+        WHERE id IN (SELECT product_id FROM requested)
+        ORDER BY id
+        FOR UPDATE
+    ),
+    reserved AS (
+        UPDATE products
+        SET reserved_quantity = products.reserved_quantity + requested.quantity
+        FROM requested, locked
+        WHERE products.id = requested.product_id
+          AND locked.id = products.id
+          AND products.is_active
+          AND products.stock_quantity - products.reserved_quantity >= requested.quantity
+        RETURNING products.id, requested.quantity
+    )
+    INSERT INTO stock_reservations (order_id, product_id, quantity, expires_at)
+    SELECT CAST(:order_id AS uuid), id, quantity, now() + make_interval(mins => :ttl_minutes)
+    FROM reserved
+    RETURNING product_id, quantity, expires_at
+"""
+
+# Parte común de liberar/confirmar: descuenta las reservas eliminadas en el
+# CTE "released" de reserved_quantity (y del stock si {stock_change} lo indica)
+_RELEASE_TAIL_SQL = """
+    totals AS (
+        SELECT product_id, sum(quantity) AS quantity
+        FROM released
+        GROUP BY product_id
+    ),
+    locked AS MATERIALIZED (
+        SELECT id FROM products
+        WHERE id IN (SELECT product_id FROM totals)
+        ORDER BY id
+        FOR UPDATE
+    ),
+    updated AS (
+        UPDATE products
+        SET reserved_quantity = products.reserved_quantity - totals.quantity{stock_change}
+        FROM totals, locked
+        WHERE products.id = totals.product_id AND locked.id = products.id
+        RETURNING products.id
+    )
+    SELECT product_id, quantity FROM released
+"""
+
+_RELEASE_ORDER_SQL = """
+    WITH released AS (
+        DELETE FROM stock_reservations
+        WHERE order_id = CAST(:order_id AS uuid)
+        RETURNING product_id, quantity
+    ),
+""" + _RELEASE_TAIL_SQL.format(stock_change="")
+
+_CONFIRM_ORDER_SQL = """
+    WITH released AS (
+        DELETE FROM stock_reservations
+        WHERE order_id = CAST(:order_id AS uuid)
+        RETURNING product_id, quantity
+    ),
+""" + _RELEASE_TAIL_SQL.format(
+    stock_change=",\n            stock_quantity = products.stock_quantity - totals.quantity,\n"
+                 "            updated_at = now()"
+)
+
+# SKIP LOCKED: varios workers pueden barrer a la vez sin esperarse
+_RELEASE_EXPIRED_SQL = """
+    WITH released AS (
+        DELETE FROM stock_reservations
+        WHERE id IN (
+            SELECT id FROM stock_reservations
+            WHERE expires_at <= now()
+            ORDER BY expires_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING product_id, quantity
+    ),
+""" + _RELEASE_TAIL_SQL.format(stock_change="")
+
+
+class ReservationService:
+    """Servicio para reservas temporales de stock"""
+
+    @staticmethod
+    def reserve_stock(
+        db: Session,
+        order_id: uuid.UUID,
+        items: List[OrderItemCreate],
+        ttl_minutes: Optional[int] = None
+    ) -> List[StockReservationResponse]:
+        """
+        Reserva el stock de los items de un pedido hasta que expire la reserva.
+
+        Args:
+            db: Sesión de base de datos.
+            order_id: ID del pedido (debe existir en ``orders``).
+            items: Items del checkout (se suman las cantidades de un mismo producto).
+            ttl_minutes: Duración de la reserva (por defecto STOCK_RESERVATION_TTL_MINUTES).
+
+        Returns:
+            Las reservas creadas, una por producto.
+
+        Raises:
+            HTTPException 409 si algún producto no está disponible en la cantidad
+            pedida o el pedido ya tiene reservas.
+        """
+        requested_ids = {item.product_id for item in items}
+        try:
+            rows = db.execute(text(_RESERVE_SQL), {
+                "order_id": str(order_id),
+                "product_ids": [item.product_id for item in items],
+                "quantities": [item.quantity for item in items],
+                "ttl_minutes": ttl_minutes or settings.STOCK_RESERVATION_TTL_MINUTES,
+            }).all()
+        except IntegrityError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="El pedido ya tiene stock reservado"
+            ) from e
+
+        if len(rows) != len(requested_ids):
+            db.rollback()
+            reserved_ids = {row.product_id for row in rows}
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Stock insuficiente para completar el pedido",
+                    "products": sorted(requested_ids - reserved_ids)
+                }
+            )
+
+        ReservationService._commit_and_invalidate(db, rows)
+        return [StockReservationResponse.model_validate(row) for row in rows]
+
+    @staticmethod
+    def release_reservations(db: Session, order_id: uuid.UUID) -> int:
+        """
+        Libera las reservas de un pedido (pago rechazado o pedido cancelado).
+
+        Args:
+            db: Sesión de base de datos.
+            order_id: ID del pedido.
+
+        Returns:
+            Número de reservas liberadas.
+        """
+        rows = db.execute(text(_RELEASE_ORDER_SQL), {"order_id": str(order_id)}).all()
+        ReservationService._commit_and_invalidate(db, rows)
+        return len(rows)
+
+    @staticmethod
+    def confirm_reservations(db: Session, order_id: uuid.UUID) -> int:
+        """
+        Convierte las reservas de un pedido pagado en salida de stock.
+
+        Elimina las reservas y descuenta sus cantidades tanto del stock como
+        de lo reservado, en una sola sentencia.
+
+        Args:
+            db: Sesión de base de datos.
+            order_id: ID del pedido.
+
+        Returns:
+            Número de reservas confirmadas (0 si ya habían expirado).
+        """
+        rows = db.execute(text(_CONFIRM_ORDER_SQL), {"order_id": str(order_id)}).all()
+        ReservationService._commit_and_invalidate(db, rows)
+        if not rows:
+            logger.warning("Pedido %s confirmado sin reservas vigentes ⚠️", order_id)
+        return len(rows)
+
+    @staticmethod
+    def release_expired(db: Session, batch_size: int) -> int:
+        """
+        Libera un lote de reservas expiradas.
+
+        Args:
+            db: Sesión de base de datos.
+            batch_size: Máximo de reservas a liberar en esta transacción.
+
+        Returns:
+            Número de reservas liberadas.
+        """
+        rows = db.execute(text(_RELEASE_EXPIRED_SQL), {"batch_size": batch_size}).all()
+        ReservationService._commit_and_invalidate(db, rows)
+        return len(rows)
+
+    @staticmethod
+    def _commit_and_invalidate(db: Session, rows: List) -> None:
+        """
+        Confirma la transacción e invalida las cachés del catálogo de los productos afectados.
+
+        ``reserved_quantity`` cambia la disponibilidad, que leen el filtro
+        ``in_stock``, los conteos y las facetas.
+
+        Args:
+            db: Sesión de base de datos.
+            rows: Filas devueltas por la sentencia (con ``product_id``).
+        """
+        product_ids = sorted({row.product_id for row in rows})
+        if product_ids:
+            publish_invalidation(db, CATALOG_SCOPE, product_ids)
+        db.commit()
+        if product_ids:
+            invalidate_catalog(product_ids)
+
+
+class ReservationSweeper:
+    """Libera periódicamente las reservas expiradas en un hilo de fondo del worker"""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de barrido si está habilitado y no está corriendo."""
+        if not settings.STOCK_RESERVATION_SWEEPER_ENABLED:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="stock-reservation-sweeper",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de barrido."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def sweep(self) -> int:
+        """
+        Libera todas las reservas expiradas, en lotes de ``batch_size``.
+
+        Returns:
+            Número total de reservas liberadas.
+        """
+        total = 0
+        db = SessionLocal()
+        try:
+            while not self._stop_event.is_set():
+                released = ReservationService.release_expired(db, self.batch_size)
+                total += released
+                if released < self.batch_size:
+                    break
+        finally:
+            db.close()
+        if total:
+            logger.info("Reservas de stock expiradas liberadas: %s", total)
+        return total
+
+    def _run(self) -> None:
+        """Ejecuta un barrido cada ``interval`` segundos hasta que se detenga."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except SQLAlchemyError as e:
+                logger.warning("Error liberando reservas expiradas ⚠️: %s", e)
+
+
+# Barrido global del worker (se inicia en el lifespan de la aplicación)
+reservation_sweeper = ReservationSweeper(
+    interval=settings.STOCK_RESERVATION_SWEEP_INTERVAL,
+    batch_size=settings.STOCK_RESERVATION_SWEEP_BATCH
+)
@@ -0,0 +1,648 @@
+"""
+Servicio de subidas por partes
+Recibe archivos grandes (PDFs y fotos para impresión) en partes que se
+escriben directamente a disco, de modo que la memoria usada por subida no
+depende del tamaño del archivo.
+
+- ``init``: registra la subida con su tamaño total y crea el archivo parcial.
+- ``append``: agrega una parte en el offset indicado; el offset es el tamaño
+  del archivo parcial, así que una subida interrumpida se reanuda consultando
+  la subida y enviando desde ahí.
+- ``complete``: verifica tamaño y checksum SHA-256, mueve el archivo al
+  almacenamiento por contenido (``app.core.blob_store``) y lo adjunta al
+  pedido. Si el contenido ya estaba almacenado, la parte se descarta.
+
+Si al iniciar se envía el checksum de un contenido ya almacenado, la subida se
+completa de inmediato sin transferir bytes. Las subidas completas que no se
+adjuntan a un pedido se eliminan después de ``BLOB_ORPHAN_TTL`` segundos.
+
+El SHA-256 se calcula de forma incremental mientras llegan las partes; el
+estado del hash se guarda por proceso y, si la siguiente parte llega a otro
+worker o tras un reinicio, se reconstruye leyendo el archivo parcial.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core import blob_store
+from app.core.cache import MISSING, create_cache
+from app.core.config import settings
+from app.core.token_service import temp_token_service
+from app.database import SessionLocal
+from app.models.orders import Order
+from app.models.uploads import FileUpload, UploadStatus
+from app.models.users import UserRole
+from app.schemas.upload_schemas import DownloadLinkResponse, UploadCreate, UploadResponse
+from app.services.auth_service import Principal
+from app.services.blob_service import BlobService
+from app.services.image_service import ImageService
+
+logger = logging.getLogger(__name__)
+
+# Subdirectorio de UPLOAD_DIR con las partes en curso
+INCOMING_DIR = "incoming"
+
+# Bloque de lectura al reconstruir el hash desde disco
+_READ_SIZE = 1024 * 1024
+
+# Estado del SHA-256 por subida: (offset, hasher) del proceso actual
+upload_hash_cache = create_cache(
+    "upload_hashes",
+    maxsize=256,
+    ttl=settings.UPLOAD_SESSION_TTL
+)
+
+_DELETE_EXPIRED_SQL = """
+    DELETE FROM file_uploads
+    WHERE id IN (
+        SELECT id FROM file_uploads
+        WHERE status = 'uploading' AND expires_at <= now()
+        ORDER BY expires_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id
+"""
+
+# Elimina un lote de subidas completas que no se adjuntaron a ningún pedido
+_DELETE_ORPHANS_SQL = """
+    DELETE FROM file_uploads
+    WHERE id IN (
+        SELECT id FROM file_uploads
+        WHERE status = 'completed'
+          AND order_id IS NULL
+          AND completed_at < now() - make_interval(secs => :orphan_ttl)
+        ORDER BY completed_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING sha256, storage_path
+"""
+
+
+class UploadService:
+    """Servicio para subidas por partes"""
+
+    @staticmethod
+    def init_upload(db: Session, data: UploadCreate, user: Principal) -> UploadResponse:
+        """
+        Registra una nueva subida.
+
+        Args:
+            db: Sesión de base de datos.
+            data: Nombre, tamaño total, checksum esperado y pedido (opcional).
+            user: Usuario que sube el archivo.
+
+        Returns:
+            La subida con offset 0, o completada si ``checksum_sha256``
+            corresponde a un archivo que el mismo usuario ya subió completo,
+            con el mismo tamaño.
+
+        Raises:
+            HTTPException 400 si la extensión no está permitida, 413 si el
+            tamaño supera ``MAX_UPLOAD_SIZE``, 404 si el pedido no existe.
+        """
+        extension = os.path.splitext(data.filename)[1].lower().lstrip(".")
+        if extension not in settings.UPLOAD_FILE_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Extensión no permitida. Use: {', '.join(settings.UPLOAD_FILE_EXTENSIONS)}"
+            )
+        if data.size > settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"El archivo supera el tamaño máximo de {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+        if data.order_id is not None:
+            UploadService._get_order_for_user(db, data.order_id, user)
+
+        now = datetime.now(timezone.utc)
+        upload = FileUpload(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            order_id=data.order_id,
+            filename=data.filename,
+            content_type=data.content_type,
+            size=data.size,
+            expected_sha256=data.checksum_sha256,
+            expires_at=now + timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+        )
+
+        # El checksum del cliente no prueba que tenga el archivo: el atajo solo
+        # aplica a contenido que este usuario ya subió (y el servidor verificó).
+        # Los demás duplicados se detectan al completar, con el hash calculado
+        if data.checksum_sha256 is not None and UploadService._user_has_content(
+            db, user.id, data.checksum_sha256
+        ):
+            blob = BlobService.get_stored(db, data.checksum_sha256)
+            if blob is not None and blob.size == data.size:
+                # Contenido ya almacenado: no hace falta recibir los bytes
+                BlobService.add_reference(db, blob.sha256, blob.size)
+                upload.status = UploadStatus.COMPLETED
+                upload.sha256 = blob.sha256
+                upload.storage_path = blob_store.relative_blob_path(blob.sha256)
+                upload.completed_at = now
+                db.add(upload)
+                db.commit()
+                db.refresh(upload)
+                logger.info("Subida %s completada con contenido existente (%s bytes) 📎", upload.id, upload.size)
+                return UploadService.to_response(upload)
+
+        part_path = UploadService.part_path(upload.id)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        open(part_path, "xb").close()
+
+        db.add(upload)
+        try:
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            UploadService._discard_part(upload.id)
+            raise
+        db.refresh(upload)
+        return UploadService.to_response(upload)
+
+    @staticmethod
+    def _user_has_content(db: Session, user_id: int, sha256: str) -> bool:
+        """Indica si el usuario tiene una subida completada con ese contenido."""
+        return db.query(
+            db.query(FileUpload)
+            .filter(
+                FileUpload.user_id == user_id,
+                FileUpload.sha256 == sha256,
+                FileUpload.status == UploadStatus.COMPLETED
+            )
+            .exists()
+        ).scalar()
+
+    @staticmethod
+    def get_upload_for_user(db: Session, upload_id: uuid.UUID, user: Principal) -> FileUpload:
+        """
+        Obtiene una subida del usuario (o cualquiera si es ADMIN o STAFF).
+
+        Raises:
+            HTTPException 404 si no existe o pertenece a otro usuario.
+        """
+        upload = db.get(FileUpload, upload_id)
+        if upload is None or (
+            upload.user_id != user.id and user.role not in [UserRole.ADMIN, UserRole.STAFF]
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Subida no encontrada"
+            )
+        return upload
+
+    @staticmethod
+    async def append_chunk(
+        upload: FileUpload,
+        offset: int,
+        stream: AsyncIterator[bytes]
+    ) -> UploadResponse:
+        """
+        Agrega una parte al archivo parcial a medida que llega del cliente.
+
+        Los bytes se escriben y se agregan al hash por fragmentos, sin
+        acumular la parte en memoria. Lo recibido antes de un corte de
+        conexión se conserva y el cliente reanuda desde el nuevo offset.
+
+        Args:
+            upload: Subida en curso.
+            offset: Posición en la que el cliente cree que continúa el archivo.
+            stream: Cuerpo de la petición.
+
+        Returns:
+            La subida con el offset actualizado.
+
+        Raises:
+            HTTPException 409 si la subida ya se completó, si el offset no
+            coincide o si hay otra parte en curso; 413 si la parte supera
+            ``UPLOAD_CHUNK_SIZE`` o el archivo su tamaño declarado.
+        """
+        if upload.status != UploadStatus.UPLOADING:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="La subida ya fue completada"
+            )
+
+        # Abrir, escribir y hashear bloquean: todo el acceso a disco va al threadpool
+        target = await run_in_threadpool(UploadService._open_part_at, upload.id, offset)
+        with target:
+            hasher = await run_in_threadpool(UploadService._hasher_at, upload.id, target, offset)
+            received = 0
+            try:
+                async for piece in stream:
+                    if received + len(piece) > settings.UPLOAD_CHUNK_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Cada parte puede tener máximo {settings.UPLOAD_CHUNK_SIZE} bytes"
+                        )
+                    if offset + received + len(piece) > upload.size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"El archivo supera el tamaño declarado de {upload.size} bytes"
+                        )
+                    await run_in_threadpool(UploadService._write_piece, target, hasher, piece)
+                    received += len(piece)
+            finally:
+                # El hash queda sincronizado con lo escrito aunque la parte se corte
+                await run_in_threadpool(target.flush)
+                upload_hash_cache.set(upload.id, (offset + received, hasher))
+
+        return UploadService.to_response(upload, offset=offset + received)
+
+    @staticmethod
+    def complete_upload(
+        db: Session,
+        upload: FileUpload,
+        order_id: Optional[uuid.UUID],
+        user: Principal
+    ) -> UploadResponse:
+        """
+        Verifica la subida, guarda el archivo como blob y la adjunta a un pedido.
+
+        Completar una subida ya completada solo actualiza el pedido.
+
+        Args:
+            db: Sesión de base de datos.
+            upload: Subida del usuario.
+            order_id: Pedido al que se adjunta (si no, se conserva el indicado al iniciar).
+            user: Usuario que completa la subida.
+
+        Returns:
+            La subida completada.
+
+        Raises:
+            HTTPException 409 si faltan bytes, 422 si el checksum no coincide
+            (la subida se reinicia en offset 0), 404 si el pedido no existe.
+        """
+        if order_id is not None:
+            UploadService._get_order_for_user(db, order_id, user)
+            upload.order_id = order_id
+
+        if upload.status == UploadStatus.UPLOADING:
+            part_path = UploadService.part_path(upload.id)
+            try:
+                source = open(part_path, "r+b")
+            except FileNotFoundError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Subida no encontrada"
+                ) from e
+
+            with source:
+                UploadService._lock_part(source)
+                received = source.seek(0, os.SEEK_END)
+                if received != upload.size:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail={"message": "La subida está incompleta", "offset": received}
+                    )
+
+                digest = UploadService._hasher_at(upload.id, source, received).hexdigest()
+                upload_hash_cache.delete(upload.id)
+                if upload.expected_sha256 is not None and digest != upload.expected_sha256:
+                    # Contenido corrupto: se descarta y el cliente vuelve a empezar
+                    source.truncate(0)
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="El checksum SHA-256 no coincide; vuelva a subir el archivo"
+                    )
+
+                # La referencia se registra antes de que el autoflush escriba la llave foránea
+                BlobService.add_reference(db, digest, received)
+                upload.status = UploadStatus.COMPLETED
+                upload.sha256 = digest
+                upload.storage_path = blob_store.relative_blob_path(digest)
+                upload.completed_at = datetime.now(timezone.utc)
+                # El blob se publica antes del commit (con el bloqueo de la parte aún
+                # tomado): si falla, la subida sigue en curso y se puede reintentar.
+                # add_reference deja bloqueada la fila del blob, así que el
+                # recolector no puede borrar el archivo antes del commit
+                try:
+                    blob_store.place_blob(part_path, digest)
+                except Exception:
+                    db.rollback()
+                    raise
+                db.commit()
+        else:
+            db.commit()
+
+        db.refresh(upload)
+        logger.info("Subida %s completada (%s bytes) 📎", upload.id, upload.size)
+        return UploadService.to_response(upload)
+
+    @staticmethod
+    def create_download_link(upload: FileUpload, user: Principal) -> DownloadLinkResponse:
+        """
+        Genera un enlace firmado y de corta duración para descargar una subida.
+
+        El token lleva el hash, la ruta y el nombre del archivo, así que la
+        descarga se sirve sin consultar la base de datos.
+
+        Args:
+            upload: Subida completada.
+            user: Usuario que solicita el enlace.
+
+        Returns:
+            URL de descarga y su vencimiento.
+
+        Raises:
+            HTTPException 409 si la subida aún no se completa.
+        """
+        if upload.status != UploadStatus.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="La subida aún no se ha completado"
+            )
+        expires_in = timedelta(seconds=settings.DOWNLOAD_TOKEN_TTL)
+        token = temp_token_service.create_download_token(
+            user_id=str(user.id),
+            sha256=upload.sha256,
+            storage_path=upload.storage_path,
+            filename=upload.filename,
+            content_type=upload.content_type,
+            expires_delta=expires_in
+        )
+        return DownloadLinkResponse(
+            url=f"{settings.API_V1_PREFIX}/files/{upload.sha256}?token={token}",
+            expires_at=datetime.now(timezone.utc) + expires_in
+        )
+
+    @staticmethod
+    def to_response(upload: FileUpload, offset: Optional[int] = None) -> UploadResponse:
+        """
+        Construye la respuesta de una subida con su offset actual.
+
+        Args:
+            upload: Subida.
+            offset: Bytes recibidos si ya se conocen (si no, se leen del disco).
+        """
+        if offset is None:
+            if upload.status == UploadStatus.COMPLETED:
+                offset = upload.size
+            else:
+                part_path = UploadService.part_path(upload.id)
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        data: Dict[str, Any] = {
+            name: getattr(upload, name)
+            for name in UploadResponse.model_fields
+            if name not in ("offset", "chunk_size")
+        }
+        return UploadResponse(**data, offset=offset, chunk_size=settings.UPLOAD_CHUNK_SIZE)
+
+    @staticmethod
+    def delete_expired(db: Session, batch_size: int) -> int:
+        """
+        Elimina un lote de subidas sin completar que ya expiraron, con sus archivos parciales.
+
+        Args:
+            db: Sesión de base de datos.
+            batch_size: Máximo de subidas a eliminar en esta transacción.
+
+        Returns:
+            Número de subidas eliminadas.
+        """
+        upload_ids = db.execute(text(_DELETE_EXPIRED_SQL), {"batch_size": batch_size}).scalars().all()
+        db.commit()
+        for upload_id in upload_ids:
+            UploadService._discard_part(upload_id)
+        return len(upload_ids)
+
+    @staticmethod
+    def delete_orphans(db: Session, orphan_ttl: int, batch_size: int) -> int:
+        """
+        Elimina un lote de subidas completas sin pedido más antiguas que ``orphan_ttl``.
+
+        Cada subida libera su referencia al blob; el archivo se borra cuando
+        el recolector de basura elimina el blob. Los archivos guardados antes
+        del almacenamiento por contenido se borran de inmediato.
+
+        Args:
+            db: Sesión de base de datos.
+            orphan_ttl: Segundos que se conserva una subida sin pedido.
+            batch_size: Máximo de subidas a eliminar en esta transacción.
+
+        Returns:
+            Número de subidas eliminadas.
+        """
+        rows = db.execute(text(_DELETE_ORPHANS_SQL), {
+            "orphan_ttl": orphan_ttl,
+            "batch_size": batch_size,
+        }).all()
+        BlobService.release_references(db, [row.sha256 for row in rows])
+        db.commit()
+
+        for row in rows:
+            if row.storage_path != blob_store.relative_blob_path(row.sha256):
+                blob_store.discard(os.path.join(settings.UPLOAD_DIR, row.storage_path))
+        return len(rows)
+
+    @staticmethod
+    def part_path(upload_id: uuid.UUID) -> str:
+        """Ruta del archivo parcial de una subida en curso."""
+        return os.path.join(settings.UPLOAD_DIR, INCOMING_DIR, f"{upload_id.hex}.part")
+
+    @staticmethod
+    def _lock_part(part_file: BinaryIO) -> None:
+        """
+        Bloquea el archivo parcial para que solo una petición lo modifique a la vez.
+
+        El bloqueo se libera al cerrar el archivo.
+
+        Raises:
+            HTTPException 409 si otra petición lo tiene bloqueado.
+        """
+        try:
+            fcntl.flock(part_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Hay otra operación sobre esta subida en curso"
+            ) from e
+
+    @staticmethod
+    def _open_part_at(upload_id: uuid.UUID, offset: int) -> BinaryIO:
+        """
+        Abre y bloquea el archivo parcial para continuar escribiendo en ``offset``.
+
+        Raises:
+            HTTPException 404 si la subida no tiene archivo parcial; 409 si
+            otra petición lo tiene bloqueado o el offset no coincide.
+        """
+        try:
+            target = open(UploadService.part_path(upload_id), "r+b")  # pylint: disable=consider-using-with
+        except FileNotFoundError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Subida no encontrada"
+            ) from e
+
+        try:
+            UploadService._lock_part(target)
+            current = target.seek(0, os.SEEK_END)
+            if offset != current:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={"message": "El offset no coincide con los bytes recibidos", "offset": current}
+                )
+        except BaseException:
+            target.close()
+            raise
+        return target
+
+    @staticmethod
+    def _write_piece(target: BinaryIO, hasher: Any, piece: bytes) -> None:
+        """Escribe un fragmento de la parte y lo agrega al hash."""
+        target.write(piece)
+        hasher.update(piece)
+
+    @staticmethod
+    def _hasher_at(upload_id: uuid.UUID, source: BinaryIO, offset: int) -> Any:
+        """
+        Obtiene el SHA-256 de los primeros ``offset`` bytes de una subida.
+
+        Usa el estado guardado por este proceso si corresponde al offset; si
+        no (otra instancia recibió la parte anterior o hubo un reinicio), lo
+        reconstruye leyendo el archivo parcial por bloques.
+        """
+        cached = upload_hash_cache.get(upload_id)
+        if cached is not MISSING and cached[0] == offset:
+            return cached[1]
+
+        hasher = hashlib.sha256()
+        source.seek(0)
+        remaining = offset
+        while remaining > 0:
+            block = source.read(min(_READ_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+        source.seek(offset)
+        return hasher
+
+    @staticmethod
+    def _get_order_for_user(db: Session, order_id: uuid.UUID, user: Principal) -> Order:
+        """
+        Obtiene un pedido del usuario (o cualquiera si es ADMIN o STAFF).
+
+        Raises:
+            HTTPException 404 si no existe o pertenece a otro usuario.
+        """
+        order = db.get(Order, order_id)
+        if order is None or (
+            order.user_id != user.id and user.role not in [UserRole.ADMIN, UserRole.STAFF]
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pedido no encontrado"
+            )
+        return order
+
+    @staticmethod
+    def _discard_part(upload_id: uuid.UUID) -> None:
+        """Elimina el archivo parcial de una subida y su estado de hash."""
+        upload_hash_cache.delete(upload_id)
+        blob_store.discard(UploadService.part_path(upload_id))
+
+
+class UploadSweeper:
+    """
+    Limpia periódicamente los archivos subidos en un hilo de fondo del worker
+
+    En cada barrido elimina las subidas abandonadas, las subidas e imágenes
+    que ningún pedido o producto referencia, y los blobs sin referencias.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        orphan_ttl: int,
+        gc_grace_period: int,
+        batch_size: int = 500
+    ):
+        self.interval = interval
+        self.orphan_ttl = orphan_ttl
+        self.gc_grace_period = gc_grace_period
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de barrido si no está corriendo."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="upload-sweeper",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de barrido."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Ejecuta todas las limpiezas, cada una en lotes de ``batch_size``.
+
+        Returns:
+            Número de elementos eliminados por limpieza.
+        """
+        steps = {
+            "expired_uploads": lambda db: UploadService.delete_expired(db, self.batch_size),
+            "orphan_uploads": lambda db: UploadService.delete_orphans(db, self.orphan_ttl, self.batch_size),
+            "orphan_images": lambda db: ImageService.delete_orphans(db, self.orphan_ttl, self.batch_size),
+            "blobs": lambda db: BlobService.collect_garbage(db, self.gc_grace_period, self.batch_size),
+        }
+        totals = {}
+        db = SessionLocal()
+        try:
+            for name, step in steps.items():
+                totals[name] = 0
+                while not self._stop_event.is_set():
+                    deleted = step(db)
+                    totals[name] += deleted
+                    if deleted < self.batch_size:
+                        break
+        finally:
+            db.close()
+        if any(totals.values()):
+            logger.info(
+                "Subidas expiradas: %s, subidas huérfanas: %s, imágenes huérfanas: %s, blobs eliminados: %s",
+                totals["expired_uploads"], totals["orphan_uploads"], totals["orphan_images"], totals["blobs"]
+            )
+        return totals
+
+    def _run(self) -> None:
+        """Ejecuta un barrido cada ``interval`` segundos hasta que se detenga."""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except SQLAlchemyError as e:
+                logger.warning("Error limpiando archivos subidos ⚠️: %s", e)
+
+
+# Barrido global del worker (se inicia en el lifespan de la aplicación)
+upload_sweeper = UploadSweeper(
+    interval=settings.UPLOAD_SWEEP_INTERVAL,
+    orphan_ttl=settings.BLOB_ORPHAN_TTL,
+    gc_grace_period=settings.BLOB_GC_GRACE_PERIOD
+)
@@ -0,0 +1,91 @@
+"""
+Benchmark de verificación de tokens de acceso
+
+Mide el costo por petición de obtener los claims del token en
+``get_current_user``: verificación completa con python-jose (camino
+anterior), verificación con PyJWT (JWT_BACKEND=pyjwt) y acierto en la caché
+de tokens verificados (``decode_access_token``). No necesita base de datos.
+
+Uso:
+    python benchmark_auth_tokens.py
+    python benchmark_auth_tokens.py --iterations 20000 --tokens 500
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.core import security
+from app.core.config import settings
+
+
+def build_tokens(count: int) -> list:
+    """Crea tokens de acceso con los mismos claims que ``AuthService.create_user_token``."""
+    return [
+        security.create_access_token(
+            data={
+                "sub": str(index),
+                "email": f"cliente{index}@example.com",
+                "full_name": f"Cliente de prueba {index}",
+                "role": "customer",
+                "is_active": True,
+            },
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def measure(label: str, func, tokens: list, iterations: int) -> float:
+    """Decodifica los tokens en ronda ``iterations`` veces e imprime el costo por petición."""
+    for token in tokens:  # calentamiento
+        func(token)
+    start = time.perf_counter()
+    for index in range(iterations):
+        func(tokens[index % len(tokens)])
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"   {label:<42} {rate:>10,.0f} req/s  {elapsed / iterations * 1e6:>9,.1f} µs/req")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de verificación de tokens de acceso")
+    parser.add_argument("--iterations", type=int, default=10000, help="Decodificaciones por caso")
+    parser.add_argument("--tokens", type=int, default=100, help="Tokens distintos (usuarios concurrentes)")
+    args = parser.parse_args()
+
+    tokens = build_tokens(args.tokens)
+
+    settings.JWT_BACKEND = "jose"
+    jose_claims = security.verify_access_token(tokens[0])
+    settings.JWT_BACKEND = "pyjwt"
+    if security.verify_access_token(tokens[0]) != jose_claims:
+        raise SystemExit("❌ Los dos backends producen claims distintos")
+
+    print(f"📊 {args.tokens} tokens {settings.ALGORITHM}, {args.iterations} iteraciones")
+
+    print("\n🔹 Verificación de firma en cada petición (sin caché)")
+
+    def verify_jose(token):
+        settings.JWT_BACKEND = "jose"
+        security.verify_access_token(token)
+
+    def verify_pyjwt(token):
+        settings.JWT_BACKEND = "pyjwt"
+        security.verify_access_token(token)
+
+    jose_rate = measure("python-jose (antes)", verify_jose, tokens, args.iterations)
+    pyjwt_rate = measure("PyJWT (JWT_BACKEND=pyjwt)", verify_pyjwt, tokens, args.iterations)
+    print(f"   ⚡ {pyjwt_rate / jose_rate:.1f}x")
+
+    print("\n🔹 Token ya verificado (decode_access_token con caché)")
+    security.access_token_cache.clear()
+    cached_rate = measure("acierto en caché (digest SHA-256)", security.decode_access_token, tokens, args.iterations)
+    print(f"   ⚡ {cached_rate / jose_rate:.1f}x frente a python-jose")
+
+    stats = security.access_token_cache.stats()
+    print(f"\n   Caché: {stats['size']} entradas, hit ratio {stats['hit_ratio']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark de serialización de listados de productos
+
+Compara el camino estándar (validación de ProductListResponse desde ORM +
+model_dump_json, y JSONResponse para respuestas genéricas) con el modo rápido
+(FAST_JSON_ENABLED: filas ORM sin revalidar escritas con orjson, y FastJSONResponse).
+No necesita base de datos: usa entidades Product en memoria.
+
+Uso:
+    python benchmark_serialization.py
+    python benchmark_serialization.py --page-size 100 --iterations 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import serialization
+from app.core.config import settings
+from app.models.products import Product
+from app.schemas.product_schemas import ProductListResponse
+
+
+def build_products(count: int) -> list:
+    """Crea entidades Product en memoria con datos realistas."""
+    now = datetime.now(timezone.utc)
+    return [
+        Product(
+            id=index,
+            name=f"Producto de prueba {index}",
+            description="Resma de papel tamaño carta de 500 hojas, 75 g/m²",
+            sku=f"BENCH-{index:06d}",
+            price=Decimal("15000.00") + index,
+            stock_quantity=index % 50,
+            image_url=f"https://example.com/images/{index}.jpg",
+            category="stationery",
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def measure(label: str, func, iterations: int) -> float:
+    """Ejecuta ``func`` varias veces e imprime el throughput."""
+    func()  # calentamiento
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"   {label:<42} {rate:>10,.0f} resp/s  {elapsed / iterations * 1e6:>9,.1f} µs/resp")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--page-size", type=int, default=100, help="Productos por página")
+    parser.add_argument("--iterations", type=int, default=1000, help="Repeticiones por caso")
+    args = parser.parse_args()
+
+    products = build_products(args.page_size)
+    fields = {"total": 20000, "total_mode": "exact", "page": 1, "page_size": args.page_size}
+
+    settings.FAST_JSON_ENABLED = False
+    standard_body = serialization.serialize_product_list(products, **fields)
+    settings.FAST_JSON_ENABLED = True
+    fast_body = serialization.serialize_product_list(products, **fields)
+    if json.loads(standard_body) != json.loads(fast_body):
+        raise SystemExit("❌ Los dos modos producen JSON distinto")
+
+    print(f"📊 Página de {args.page_size} productos, {args.iterations} iteraciones")
+
+    print("\n🔹 Cuerpo del listado (GET /products)")
+
+    def standard_list():
+        settings.FAST_JSON_ENABLED = False
+        serialization.serialize_product_list(products, **fields)
+
+    def fast_list():
+        settings.FAST_JSON_ENABLED = True
+        serialization.serialize_product_list(products, **fields)
+
+    standard_rate = measure("estándar (validación + model_dump_json)", standard_list, args.iterations)
+    fast_rate = measure("rápido (filas confiables, sin revalidar)", fast_list, args.iterations)
+    print(f"   ⚡ {fast_rate / standard_rate:.1f}x")
+
+    print("\n🔹 Respuesta genérica con response_model (jsonable_encoder + render)")
+    page = ProductListResponse.model_validate({"products": products, **fields})
+    content = jsonable_encoder(page)
+
+    standard_rate = measure("JSONResponse", lambda: JSONResponse(content), args.iterations)
+    fast_rate = measure("FastJSONResponse", lambda: serialization.FastJSONResponse(content), args.iterations)
+    print(f"   ⚡ {fast_rate / standard_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
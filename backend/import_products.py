@@ -0,0 +1,51 @@
+"""
+Script para importar productos masivamente desde un archivo CSV o NDJSON
+Hace upsert por SKU usando COPY; útil para cargar el inventario real.
+
+Uso:
+    python import_products.py inventario.csv
+    python import_products.py inventario.ndjson --batch-size 10000
+"""
+import argparse
+import sys
+
+from app.database.session import SessionLocal
+from app.services.product_import_service import ProductImportService, SUPPORTED_FORMATS
+
+
+def main() -> int:
+    """Importa el archivo indicado e imprime el reporte."""
+    parser = argparse.ArgumentParser(description="Importación masiva de productos")
+    parser.add_argument("path", help="Ruta del archivo CSV o NDJSON")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, dest="file_format")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    file_format = args.file_format or ProductImportService.detect_format(args.path)
+    if file_format is None:
+        print("❌ No se pudo determinar el formato; use --format csv|ndjson")
+        return 1
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = ProductImportService.import_products(
+                db, stream, file_format, batch_size=args.batch_size
+            )
+    finally:
+        db.close()
+
+    print(f"📦 Filas leídas:    {report.total_rows}")
+    print(f"✅ Creados:         {report.created}")
+    print(f"🔄 Actualizados:    {report.updated}")
+    print(f"♻️  SKU repetidos:   {report.duplicates}")
+    print(f"⚠️  Con errores:     {report.failed}")
+    for error in report.errors:
+        print(f"   Fila {error.row} ({error.sku or 'sin SKU'}): {'; '.join(error.errors)}")
+    if report.errors_truncated:
+        print("   ... (más errores no mostrados)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Script para procesar las imágenes subidas pendientes
+Genera las variantes WebP en un pool de procesos, igual que el procesador en
+segundo plano de la API; útil después de una caída o con el worker deshabilitado.
+
+Uso:
+    python process_images.py
+    python process_images.py --retry-failed --workers 4
+"""
+import argparse
+import sys
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.services.image_service import ImageProcessor, ImageService
+
+
+def main() -> int:
+    """Procesa todas las imágenes pendientes e imprime el total."""
+    parser = argparse.ArgumentParser(description="Procesamiento de imágenes pendientes")
+    parser.add_argument("--retry-failed", action="store_true", help="Reencolar las imágenes fallidas")
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_PROCESS_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=settings.IMAGE_PROCESS_BATCH)
+    args = parser.parse_args()
+
+    if args.retry_failed:
+        db = SessionLocal()
+        try:
+            print(f"🔄 Imágenes fallidas reencoladas: {ImageService.retry_failed(db)}")
+        finally:
+            db.close()
+
+    processor = ImageProcessor(
+        interval=settings.IMAGE_PROCESS_INTERVAL,
+        batch_size=args.batch_size,
+        workers=args.workers
+    )
+    try:
+        total = processor.process_pending()
+    finally:
+        processor.stop()
+
+    print(f"✅ Imágenes procesadas: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())